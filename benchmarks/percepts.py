@@ -0,0 +1,77 @@
+"""
+Benchmark de WumpusEnvironment.get_percepts.
+Compara a versão antiga (vizinhos + set + sorted a cada chamada)
+com a tabela de percepções pré-calculada.
+
+Uso: python -m benchmarks.percepts
+"""
+import random
+import timeit
+
+from src.core.environment import WumpusEnvironment
+
+SIZES = (4, 16, 64, 256)
+
+
+def legacy_get_percepts(world, pos):
+    """Implementação original, mantida como referência."""
+    r, c = pos
+    percepts = set()
+    if world.grid[r][c] == 'G':
+        percepts.add("Brilho")
+    adj = []
+    if r > 0: adj.append((r - 1, c))
+    if r < world.rows - 1: adj.append((r + 1, c))
+    if c > 0: adj.append((r, c - 1))
+    if c < world.cols - 1: adj.append((r, c + 1))
+    for (nr, nc) in adj:
+        vizinho = world.grid[nr][nc]
+        if vizinho == 'P':
+            percepts.add("Brisa")
+        elif vizinho == 'W':
+            percepts.add("Fedor")
+    return sorted(list(percepts))
+
+
+def random_layout(size, pit_prob=0.2, seed=0):
+    rng = random.Random(seed)
+    grid = [['P' if rng.random() < pit_prob else '.' for _ in range(size)] for _ in range(size)]
+    grid[rng.randrange(size)][rng.randrange(size)] = 'W'
+    grid[rng.randrange(size)][rng.randrange(size)] = 'G'
+    grid[size - 1][0] = 'A'
+    return grid
+
+
+def bench(size, queries=20000, repeat=5):
+    world = WumpusEnvironment(random_layout(size))
+    rng = random.Random(size)
+    cells = [(rng.randrange(size), rng.randrange(size)) for _ in range(queries)]
+
+    for pos in cells[:200]:
+        assert tuple(legacy_get_percepts(world, pos)) == world.get_percepts(pos)
+
+    get = world.get_percepts
+    get_mask = world.get_percept_mask
+    old = min(timeit.repeat(lambda: [legacy_get_percepts(world, p) for p in cells], number=1, repeat=repeat))
+    new = min(timeit.repeat(lambda: [get(p) for p in cells], number=1, repeat=repeat))
+    mask = min(timeit.repeat(lambda: [get_mask(p) for p in cells], number=1, repeat=repeat))
+    build = min(timeit.repeat(world.build_percept_masks, number=1, repeat=repeat))
+    return {
+        "size": size,
+        "legacy_ns": old / queries * 1e9,
+        "cached_ns": new / queries * 1e9,
+        "mask_ns": mask / queries * 1e9,
+        "build_ms": build * 1e3,
+    }
+
+
+def main():
+    print(f"{'mapa':>9} | {'antigo (ns)':>11} | {'tupla (ns)':>10} | {'máscara (ns)':>12} | {'ganho':>6} | {'pré-cálculo (ms)':>16}")
+    for size in SIZES:
+        r = bench(size)
+        print(f"{size:>4}x{size:<4} | {r['legacy_ns']:>11.0f} | {r['cached_ns']:>10.0f} | {r['mask_ns']:>12.0f} | "
+              f"{r['legacy_ns'] / r['cached_ns']:>5.1f}x | {r['build_ms']:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Benchmark do núcleo de busca com índices planos (FlatSearch).
+Compara, na mesma KB, a implementação original (tuplas, random.shuffle e
+ruído no heap), a versão de referência com tuplas de SearchAlgorithms e a
+versão com índices planos e arrays reaproveitados.
+
+Cenários: uma busca de canto a canto e várias buscas curtas (como as do
+agente), em que a arena pré-alocada evita limpar arrays a cada chamada.
+As três versões são medidas em rodadas intercaladas (fica o menor tempo de
+cada uma), para uma mudança de velocidade da máquina no meio da medição não
+favorecer nenhuma delas.
+
+A meta é ganho de 10x sobre a original a 512x512; o fim da saída diz, por
+algoritmo e cenário, se ela foi atingida. A BFS fica em 6-10x (~0,4 us por
+nó, o piso de um laço por nó em Python). O A* fica em 2-3,5x: o heap é só
+~1/6 do tempo, e o resto é o laço por nó, já em ~2 us por expansão; 10x
+pediria ~0,4 us por expansão mantendo o mesmo resultado.
+
+Uso: python -m benchmarks.search
+"""
+import heapq
+import random
+import timeit
+from collections import deque
+
+from src.agent.algorithms import SearchAlgorithms
+from src.agent.flat_search import flat_search
+from src.agent.knowledge_base import KnowledgeBase
+
+SIZES = (64, 128, 256, 512)
+SHORT_QUERIES = 200
+SHORT_RADIUS = 16
+TARGET_SIZE = 512
+TARGET_GAIN = 10.0
+
+
+def legacy_neighbors(pos, rows, cols):
+    r, c = pos
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    random.shuffle(directions)
+    result = []
+    for dr, dc in directions:
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < rows and 0 <= nc < cols:
+            result.append((nr, nc))
+    return result
+
+
+def legacy_path(came_from, start, goal):
+    path = []
+    current = goal
+    while current != start:
+        if current not in came_from:
+            return []
+        path.append(current)
+        current = came_from[current]
+    path.reverse()
+    return path
+
+
+def legacy_bfs(start, goal, kb, rows, cols, safe_only=False):
+    """Implementação original, mantida como referência."""
+    queue = deque([start])
+    visited = {start}
+    came_from = {}
+    nodes_expanded = 0
+    while queue:
+        current = queue.popleft()
+        nodes_expanded += 1
+        if current == goal:
+            return legacy_path(came_from, start, goal), nodes_expanded
+        for neighbor in legacy_neighbors(current, rows, cols):
+            if neighbor not in visited:
+                if kb.is_walkable(neighbor[0], neighbor[1], safe_only):
+                    visited.add(neighbor)
+                    came_from[neighbor] = current
+                    queue.append(neighbor)
+    return [], nodes_expanded
+
+
+def legacy_a_star(start, goal, kb, rows, cols, safe_only=False):
+    """Implementação original, mantida como referência."""
+    pq = []
+    heapq.heappush(pq, (0 + random.random(), start))
+    came_from = {}
+    g_score = {start: 0}
+    nodes_expanded = 0
+    visited = set()
+    while pq:
+        _, current = heapq.heappop(pq)
+        if current in visited: continue
+        visited.add(current)
+        nodes_expanded += 1
+        if current == goal:
+            return legacy_path(came_from, start, goal), nodes_expanded
+        for neighbor in legacy_neighbors(current, rows, cols):
+            if not kb.is_walkable(neighbor[0], neighbor[1], safe_only):
+                continue
+            move_cost = 20 if kb.is_caution(neighbor[0], neighbor[1]) else 1
+            tentative_g = g_score[current] + move_cost
+            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                f = tentative_g + abs(neighbor[0] - goal[0]) + abs(neighbor[1] - goal[1])
+                heapq.heappush(pq, (f + random.uniform(0, 0.5), neighbor))
+    return [], nodes_expanded
+
+
+def random_kb(size, seed=0, caution=0.10, unsafe=0.15):
+    """KB sintética: maioria SAFE, com células CAUTION/UNSAFE espalhadas."""
+    rng = random.Random(seed)
+    kb = KnowledgeBase(size, size)
+    for idx in range(size * size):
+        x = rng.random()
+        kb.set(divmod(idx, size), 'UNSAFE' if x < unsafe else 'CAUTION' if x < unsafe + caution else 'SAFE')
+    return kb
+
+
+def short_queries(kb, size, count, radius, seed=0):
+    """Pares (início, objetivo) próximos e transitáveis, como os do agente."""
+    rng = random.Random(seed)
+    pairs = []
+    while len(pairs) < count:
+        a = (rng.randrange(size), rng.randrange(size))
+        b = (min(size - 1, max(0, a[0] + rng.randint(-radius, radius))),
+             min(size - 1, max(0, a[1] + rng.randint(-radius, radius))))
+        if a != b and not kb.is_unsafe(*a) and not kb.is_unsafe(*b):
+            pairs.append((a, b))
+    return pairs
+
+
+def timed(fns, pairs, kb, size, repeat):
+    """Para cada função: (menor tempo (s), total de nós) para resolver todos os pares."""
+    def runner(fn):
+        def run():
+            return sum(fn(a, b, kb, size, size, False)[1] for a, b in pairs)
+        return run
+
+    runs = [runner(fn) for fn in fns]
+    nodes = []
+    for run in runs:
+        random.seed(0)
+        SearchAlgorithms.configure(0, deterministic=True)
+        nodes.append(run())
+    best = [float("inf")] * len(runs)
+    for _ in range(repeat):
+        for i, run in enumerate(runs):
+            best[i] = min(best[i], timeit.timeit(run, number=1))
+    return list(zip(best, nodes))
+
+
+def bench(size, repeat=3):
+    kb = random_kb(size)
+    corner = [((0, 0), (size - 1, size - 1))]
+    for pos in corner[0]:
+        kb.set(pos, 'SAFE')
+    short = short_queries(kb, size, SHORT_QUERIES, SHORT_RADIUS)
+
+    # A versão plana tem de devolver exatamente o mesmo que a de referência
+    for a, b in corner + short[:20]:
+        for ref, flat in ((SearchAlgorithms.bfs, SearchAlgorithms.bfs_flat),
+                          (SearchAlgorithms.a_star, SearchAlgorithms.a_star_flat)):
+            SearchAlgorithms.configure(0, deterministic=True)
+            expected = ref(a, b, kb, size, size, False)
+            SearchAlgorithms.configure(0, deterministic=True)
+            assert flat(a, b, kb, size, size, False) == expected
+
+    rows = []
+    for name, legacy, ref, flat in (("bfs", legacy_bfs, SearchAlgorithms.bfs, SearchAlgorithms.bfs_flat),
+                                    ("a_star", legacy_a_star, SearchAlgorithms.a_star, SearchAlgorithms.a_star_flat)):
+        for scenario, pairs in (("canto", corner), ("curtas", short)):
+            old, tuples, flat_time = timed((legacy, ref, flat), pairs, kb, size, repeat)
+            rows.append({
+                "size": size, "algoritmo": name, "cenario": scenario,
+                "legacy": old, "tuplas": tuples, "plana": flat_time,
+            })
+    return rows
+
+
+def main():
+    print(f"{'mapa':>9} | {'algoritmo':>9} | {'cenário':>7} | {'original (ms)':>13} | {'tuplas (ms)':>11} | "
+          f"{'plana (ms)':>10} | {'nós orig.':>9} | {'nós plana':>9} | {'ganho':>6} | {'vs tuplas':>9}")
+    verdicts = []
+    for size in SIZES:
+        for r in bench(size):
+            (t_old, n_old), (t_ref, _), (t_new, n_new) = r["legacy"], r["tuplas"], r["plana"]
+            print(f"{size:>4}x{size:<4} | {r['algoritmo']:>9} | {r['cenario']:>7} | {t_old * 1e3:>13.1f} | "
+                  f"{t_ref * 1e3:>11.1f} | {t_new * 1e3:>10.1f} | {n_old:>9} | {n_new:>9} | "
+                  f"{t_old / t_new:>5.1f}x | {t_ref / t_new:>8.1f}x")
+            if size == TARGET_SIZE:
+                verdicts.append((r["algoritmo"], r["cenario"], t_old / t_new))
+        flat_search.cache_clear()
+
+    print(f"\nMeta: {TARGET_GAIN:.0f}x sobre a original a {TARGET_SIZE}x{TARGET_SIZE}")
+    for name, scenario, gain in verdicts:
+        print(f"  {name:>9} | {scenario:>7} | {gain:>5.1f}x | {'atingida' if gain >= TARGET_GAIN else 'NÃO atingida'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Suíte de benchmarks com baseline gravada.
+
+Mede, em mapas de 4x4 a 1024x1024 e várias densidades de perigo:
+  * busca:bfs, busca:dfs, busca:astar  - SearchAlgorithms (as versões que o
+    agente usa, via ALGORITHMS) sobre KBs sintéticas;
+  * vizinho_seguro - Agent.bfs_find_nearest com a fronteira já povoada;
+  * percepcao      - WumpusEnvironment.get_percepts;
+  * partida        - partidas completas (run_episode), só até 64x64: acima
+    disso uma única partida leva segundos e varia demais de mapa para mapa.
+
+Para cada caso: operações por segundo, nós expandidos e pico de memória
+(tracemalloc, numa rodada já aquecida). Tudo é determinístico (seeds fixas
+e desempate fixo nas buscas), então os nós só mudam se o algoritmo mudar.
+
+As operações por segundo são divididas pelas de um laço de calibração em
+Python puro rodado na mesma máquina, logo antes de cada repetição; é esse
+número relativo que vai para a baseline, para ela servir em máquinas
+diferentes e resistir a variações de velocidade durante a execução.
+
+Uso:
+  python -m benchmarks.suite              # compara com benchmarks/baseline.json
+  python -m benchmarks.suite --rapido     # só mapas até 64x64
+  python -m benchmarks.suite --gravar     # grava a baseline com o resultado atual
+Sai com código 1 se algum caso regrediu: tempo pior que a tolerância (mesmo
+depois de medir de novo), mais nós expandidos, ou pico de memória acima da
+tolerância.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+from benchmarks.percepts import random_layout
+from benchmarks.search import random_kb
+from src.agent.algorithms import ALGORITHMS, SearchAlgorithms
+from src.agent.flat_search import flat_search
+from src.agent.player import Agent
+from src.core.environment import WumpusEnvironment
+from src.core.map_generator import generate_maps
+from src.simulation.runner import run_episode
+
+SIZES = (4, 16, 64, 256, 1024)
+QUICK_SIZES = (4, 16, 64)
+DENSITIES = (0.1, 0.2, 0.3)
+EPISODE_MAX_SIZE = 64
+SEARCHES = ("bfs", "dfs", "astar")
+
+# Operações por lote, por tamanho (mapas grandes: poucas buscas, cada uma já longa)
+SEARCH_QUERIES = {4: 200, 16: 100, 64: 40, 256: 8, 1024: 2}
+EPISODES = {4: 40, 16: 10, 64: 3}
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+TIME_TOLERANCE = 0.30    # queda aceitável nas operações por segundo (relativas)
+MEMORY_TOLERANCE = 0.25  # aumento aceitável no pico de memória...
+MEMORY_SLACK = 64 * 1024  # ...desde que passe também desta folga absoluta (bytes)
+RETRIES = 2              # novas medições antes de acusar regressão de tempo (ruído da máquina)
+
+
+CALIBRATION_OPS = 200_000
+
+
+def _calibration_work():
+    total = 0
+    for i in range(CALIBRATION_OPS):
+        total += i * i % 7
+    return total
+
+
+def calibrate(repeat=1):
+    """Operações por segundo de um laço fixo em Python puro (referência da máquina)."""
+    return CALIBRATION_OPS / min(timeit.repeat(_calibration_work, number=1, repeat=repeat))
+
+
+def walkable_pairs(kb, size, count, seed):
+    """Pares (início, objetivo) distintos e sem perigo confirmado, sorteados no mapa todo."""
+    rng = random.Random(seed)
+    pairs = []
+    while len(pairs) < count:
+        a = (rng.randrange(size), rng.randrange(size))
+        b = (rng.randrange(size), rng.randrange(size))
+        if a != b and not kb.is_unsafe(*a) and not kb.is_unsafe(*b):
+            pairs.append((a, b))
+    return pairs
+
+
+def case_search(name, size, density):
+    kb = random_kb(size, seed=size, caution=density / 2, unsafe=density)
+    pairs = walkable_pairs(kb, size, SEARCH_QUERIES[size], seed=size)
+    algorithm = ALGORITHMS[name]
+
+    def run():
+        SearchAlgorithms.configure(0, deterministic=True)
+        return sum(algorithm(a, b, kb, size, size, False)[1] for a, b in pairs)
+    return run, len(pairs)
+
+
+def case_nearest(size, density, queries=200):
+    """Fronteira com uma fração 'density' das células SAFE e não visitadas."""
+    world = WumpusEnvironment(random_layout(size, pit_prob=0.0, seed=size))
+    agent = Agent(world)
+    rng = random.Random(size)
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    for pos in rng.sample(cells, max(1, int(len(cells) * density))):
+        agent.set_status(pos, 'SAFE')
+    starts = [rng.choice(cells) for _ in range(queries)]
+
+    def run():
+        for pos in starts:
+            agent.pos = pos
+            agent.bfs_find_nearest('SAFE')
+        return 0
+    return run, len(starts)
+
+
+def case_percepts(size, density, queries=20_000):
+    world = WumpusEnvironment(random_layout(size, pit_prob=density, seed=size))
+    rng = random.Random(size)
+    cells = [(rng.randrange(size), rng.randrange(size)) for _ in range(queries)]
+    get = world.get_percepts
+
+    def run():
+        for pos in cells:
+            get(pos)
+        return 0
+    return run, len(cells)
+
+
+def case_episodes(size, density):
+    """Partidas completas com A* em mapas solucionáveis."""
+    items = generate_maps(EPISODES[size], size, size, density, seed=size, only_solvable=True)
+    maps = [item["mapa"] for item in items]
+
+    def run():
+        return sum(run_episode("astar", layout, i, deterministic=True)["nos"] for i, layout in enumerate(maps))
+    return run, len(maps)
+
+
+def cases(sizes, densities, only=None):
+    """Gera (grupo, tamanho, densidade, preparo) de cada caso."""
+    for size in sizes:
+        for density in densities:
+            groups = [(f"busca:{name}", lambda s, d, n=name: case_search(n, s, d)) for name in SEARCHES]
+            groups += [("vizinho_seguro", case_nearest), ("percepcao", case_percepts)]
+            if size <= EPISODE_MAX_SIZE:
+                groups.append(("partida", case_episodes))
+            for group, setup in groups:
+                if only and not group.startswith(only):
+                    continue
+                yield group, size, density, setup
+
+
+def measure(run, ops, repeat):
+    """
+    (operações/s, relativo à calibração, nós, pico de memória em bytes) do lote 'run'.
+    A calibração é refeita junto de cada repetição, pois a velocidade da
+    máquina varia ao longo da execução; fica a melhor razão entre as duas.
+    """
+    nodes = run()  # aquece arenas e caches; os nós são determinísticos
+    # Lotes curtos demais medem mais ruído que código: repete o lote até passar de 0,2 s
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    best_ops = best_relative = 0.0
+    for _ in range(repeat):
+        machine = calibrate()
+        ops_per_sec = ops * number / timer.timeit(number)
+        best_ops = max(best_ops, ops_per_sec)
+        best_relative = max(best_relative, ops_per_sec / machine)
+
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best_ops, best_relative, nodes, peak
+
+
+def case_key(group, size, density):
+    return f"{group}|{size}|{density}"
+
+
+def compare(result, base, tolerance):
+    """Lista de regressões (texto) de um caso em relação à baseline."""
+    problems = []
+    if result["relativo"] < base["relativo"] * (1 - tolerance):
+        problems.append(f"tempo {result['relativo'] / base['relativo'] - 1:+.0%}")
+    if result["nos"] > base["nos"]:
+        problems.append(f"nós {base['nos']} -> {result['nos']}")
+    if (result["pico_bytes"] > base["pico_bytes"] * (1 + MEMORY_TOLERANCE)
+            and result["pico_bytes"] - base["pico_bytes"] > MEMORY_SLACK):
+        problems.append(f"memória {base['pico_bytes'] // 1024} -> {result['pico_bytes'] // 1024} KB")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do Mundo de Wumpus com comparação contra baseline.")
+    parser.add_argument("--rapido", action="store_true", help="Só mapas até 64x64")
+    parser.add_argument("--gravar", action="store_true", help="Grava o resultado como nova baseline")
+    parser.add_argument("--baseline", default=BASELINE, help="Arquivo da baseline (JSON)")
+    parser.add_argument("--casos", help="Só os grupos com este prefixo (ex.: busca, partida)")
+    parser.add_argument("--tolerancia", type=float, default=TIME_TOLERANCE,
+                        help="Queda aceitável nas operações por segundo (fração, padrão 0.30)")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("-o", "--saida", help="Grava os resultados (JSON)")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if not args.gravar and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["casos"]
+
+    calibration = calibrate(repeat=5)
+    print(f"calibração: {calibration:,.0f} op/s")
+    print(f"{'caso':<15} | {'mapa':>9} | {'dens.':>5} | {'op/s':>11} | {'nós':>9} | {'pico (KB)':>9} | baseline")
+
+    results, regressions = {}, []
+    sizes = QUICK_SIZES if args.rapido else SIZES
+    for group, size, density, setup in cases(sizes, DENSITIES, args.casos):
+        run, ops = setup(size, density)
+        ops_per_sec, relative, nodes, peak = measure(run, ops, args.repeticoes)
+        key = case_key(group, size, density)
+        result = results[key] = {
+            "ops_s": ops_per_sec,
+            "relativo": relative,
+            "nos": nodes,
+            "pico_bytes": peak,
+        }
+
+        base = baseline.get(key)
+        if base is None:
+            verdict = "sem baseline"
+        else:
+            problems = compare(result, base, args.tolerancia)
+            # Regressão real se repete; um pico de carga na máquina, não
+            for _ in range(RETRIES):
+                if not any(p.startswith("tempo") for p in problems):
+                    break
+                again_ops, again_relative = measure(run, ops, args.repeticoes)[:2]
+                result["ops_s"] = max(result["ops_s"], again_ops)
+                result["relativo"] = max(result["relativo"], again_relative)
+                problems = compare(result, base, args.tolerancia)
+            verdict = f"{result['relativo'] / base['relativo']:.2f}x"
+            if problems:
+                verdict += "  REGRESSÃO: " + ", ".join(problems)
+                regressions.append(key)
+        print(f"{group:<15} | {size:>4}x{size:<4} | {density:>5} | {ops_per_sec:>11,.1f} | {nodes:>9} | "
+              f"{peak / 1024:>9.0f} | {verdict}")
+        # Arenas de busca do tamanho já medido não servem ao próximo caso
+        flat_search.cache_clear()
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump({"calibracao": calibration, "casos": results}, f, indent=1)
+
+    if args.gravar:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"calibracao": calibration, "casos": results}, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline gravada em {args.baseline} ({len(results)} casos).")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} caso(s) regrediram: {', '.join(regressions)}")
+        return 1
+    print("Nenhuma regressão.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
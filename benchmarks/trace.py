@@ -0,0 +1,91 @@
+"""
+Benchmark da gravação de rastros (TraceWriter).
+Roda partidas (o mesmo ciclo think -> move do runner) medindo à parte o
+tempo do agente e o do gravador, para o custo da gravação não se perder no
+ruído de partidas inteiras: por partida (begin/finish: mapa e snapshot
+inicial comprimidos, escrita no arquivo), por ciclo (record) e em
+porcentagem do tempo do agente. Mostra também os bytes gravados por ciclo
+e o tempo para retomar o arquivo em modo de acréscimo (complete_size).
+
+Uso: python -m benchmarks.trace
+"""
+import os
+import tempfile
+import timeit
+from time import perf_counter
+
+from src.agent.player import Agent
+from src.core.environment import WumpusEnvironment
+from src.core.map_generator import generate_maps
+from src.simulation.trace import TraceWriter, complete_size
+
+SIZES = (4, 8, 16, 32, 64)
+EPISODES = {4: 400, 8: 200, 16: 60, 32: 15, 64: 4}
+
+
+def play(layouts, trace):
+    """Joga as partidas gravando no rastro; retorna (tempo do agente, da partida no rastro, do record, ciclos)."""
+    agent_time = episode_time = record_time = 0.0
+    ticks = 0
+    for seed, layout in enumerate(layouts):
+        world = WumpusEnvironment(layout)
+        agent = Agent(world, seed)
+        t0 = perf_counter()
+        trace.begin(agent, "astar", seed)
+        episode_time += perf_counter() - t0
+        while not agent.game_over:
+            t0 = perf_counter()
+            agent.think("astar")
+            move_action = agent.move()
+            t1 = perf_counter()
+            trace.record()
+            record_time += perf_counter() - t1
+            agent_time += t1 - t0
+            ticks += 1
+            if move_action == (0, 0) and not agent.game_over:
+                break
+        t0 = perf_counter()
+        trace.finish()
+        episode_time += perf_counter() - t0
+    return agent_time, episode_time, record_time, ticks
+
+
+def bench(size, path, repeat=5):
+    layouts = [item["mapa"] for item in generate_maps(EPISODES[size], size, size, pit_prob=0.15, seed=size,
+                                                      only_solvable=True)]
+    best = None
+    for _ in range(repeat):
+        with TraceWriter(path) as trace:
+            result = play(layouts, trace)
+        if best is None or sum(result[:3]) < sum(best[:3]):
+            best = result
+    agent_time, episode_time, record_time, ticks = best
+    resume = min(timeit.repeat(lambda: complete_size(path), number=1, repeat=repeat))
+
+    return {
+        "size": size,
+        "partida_ms": agent_time / len(layouts) * 1e3,
+        "extra_us": episode_time / len(layouts) * 1e6,
+        "ciclo_us": record_time / ticks * 1e6,
+        "extra_pct": (episode_time + record_time) / agent_time * 100,
+        "bytes_ciclo": os.path.getsize(path) / ticks,
+        "retomada_ms": resume * 1e3,
+    }
+
+
+def main():
+    fd, path = tempfile.mkstemp(suffix=".wtr")
+    os.close(fd)
+    try:
+        print(f"{'mapa':>9} | {'agente (ms)':>11} | {'begin+finish (us)':>17} | {'record (us)':>11} | "
+              f"{'extra':>6} | {'bytes/ciclo':>11} | {'retomada (ms)':>13}")
+        for size in SIZES:
+            r = bench(size, path)
+            print(f"{size:>4}x{size:<4} | {r['partida_ms']:>11.3f} | {r['extra_us']:>17.1f} | {r['ciclo_us']:>11.2f} | "
+                  f"{r['extra_pct']:>5.1f}% | {r['bytes_ciclo']:>11.1f} | {r['retomada_ms']:>13.3f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
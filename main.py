@@ -1,40 +1,60 @@
+import time
+
+STARTED = time.perf_counter()  # antes dos imports, para o relatório de tempos contar o pygame
+
+import argparse
 import pygame
 import sys
-import os
+from src.gui.app import App
 from src.gui.start_menu import StartMenu
 from src.gui.interface import MundoWumpusGUI
-from src.gui.asset_loader import ASSET_PATHS
-
-
-def main():
-    pygame.init()
-    pygame.mixer.init(frequency=44100, size=-16, channels=8, buffer=2048)
-
-    music_path = ASSET_PATHS.get("BG_MUSIC")
-
-    if music_path and os.path.exists(music_path):
-        try:
-            pygame.mixer.music.load(music_path)
-            pygame.mixer.music.play(-1)
-        except Exception as e:
-            print(f"Erro ao carregar música: {e}")
-    else:
-        print(f"AVISO: Música não encontrada em: {music_path}")
-
-    menu = StartMenu()
-    search_method = menu.run()
-
-    if not search_method:
-        print("Usuário fechou o jogo no menu.")
-        pygame.quit()
+from src.gui.asset_loader import play_music, SoundBank
+from src.simulation.trace import TraceWriter
+from src.utils.profiler import write_profiles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mundo de Wumpus com interface gráfica.")
+    parser.add_argument("--mudo", action="store_true", help="Sem som (o mixer nem é iniciado)")
+    parser.add_argument("--tempos", action="store_true", help="Mostra os tempos de abertura ao sair")
+    parser.add_argument("--perfil", help="Mede o tempo por fase e grava ao sair (.json ou .csv); F3 mostra na tela")
+    parser.add_argument("--rastro", help="Grava a partida, ciclo a ciclo, neste arquivo (.wtr) para o replay")
+    args = parser.parse_args(argv)
+
+    app = App(muted=args.mudo, started=STARTED)
+    game = None
+    trace = None
+    try:
+        sounds = None
+        if app.audio():
+            play_music("BG_MUSIC")
+            # Os efeitos sonoros decodificam em segundo plano enquanto o menu está aberto
+            sounds = SoundBank().start()
+
+        menu = StartMenu(app)
+        search_method = menu.run()
+
+        if not search_method:
+            print("Usuário fechou o jogo no menu.")
+            app.close()
+            sys.exit()
+
+        if args.rastro:
+            trace = TraceWriter(args.rastro)
+        game = MundoWumpusGUI(search_method, sounds=sounds, app=app, profile=bool(args.perfil), trace=trace)
+        game.run()
+
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+        app.close()
         sys.exit()
-
-    app = MundoWumpusGUI(search_method)
-    app.run()
-
-    pygame.mixer.music.stop()
-    pygame.quit()
-    sys.exit()
+    finally:
+        if trace:
+            trace.close()
+        if args.tempos:
+            print(app.report())
+        if args.perfil and game is not None:
+            write_profiles([(None, game.profiler.to_dict())], args.perfil)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
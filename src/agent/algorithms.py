@@ -1,13 +1,55 @@
 import heapq
 import random
 from collections import deque
+from functools import partial
+from itertools import permutations
+
+from src.agent.dstar import DStarLite
+from src.agent.flat_search import TIE_BITS, flat_search
+from src.agent.jps import jump_point_search
+from src.core.environment import adjacency_table
+
+# Ordens possíveis de visita dos vizinhos, indexadas pela quantidade de vizinhos (0 a 4).
+# Pré-calculadas: sortear uma ordem não aloca nada por expansão.
+NEIGHBOR_ORDERS = tuple(tuple(permutations(range(n))) for n in range(5))
+IDENTITY_ORDER = tuple(tuple(range(n)) for n in range(5))
+
 
 class SearchAlgorithms:
     """
-    Algoritmos de busca puros (BFS, DFS, A*).
-    Operam sobre o 'mapa mental' (Knowledge Base) do agente.
+    Algoritmos de busca puros (BFS, DFS, A*, D* Lite, JPS e bidirecionais).
+    Operam sobre o 'mapa mental' (KnowledgeBase) do agente.
+
+    Modos de desempate (ver configure):
+    - sorteado (padrão): ordem dos vizinhos e empates do A* sorteados por um
+      random.Random próprio; com seed, reprodutível bit a bit.
+    - determinístico: ordem fixa (Cima, Baixo, Esq, Dir) e chaves (f, h, contador).
     """
 
+    rng = random.Random()
+    deterministic = False
+
+    @staticmethod
+    def configure(seed=None, deterministic=False):
+        """Define o modo de desempate; a mesma seed reproduz as mesmas buscas."""
+        SearchAlgorithms.rng = random.Random(seed)
+        SearchAlgorithms.deterministic = deterministic
+
+    @staticmethod
+    def tie_breaker():
+        """Desempate do A* entre chaves (f, h) iguais: None (contador) ou sorteio inteiro."""
+        if SearchAlgorithms.deterministic:
+            return None
+        return partial(SearchAlgorithms.rng.getrandbits, TIE_BITS)
+
+    @staticmethod
+    def neighbor_order(n):
+        """Ordem de visita (índices) para uma célula com n vizinhos."""
+        if SearchAlgorithms.deterministic:
+            return IDENTITY_ORDER[n]
+        orders = NEIGHBOR_ORDERS[n]
+        return orders[int(SearchAlgorithms.rng.random() * len(orders))]
+
     @staticmethod
     def reconstruct_path(came_from, start, goal):
         path = []
@@ -22,17 +64,9 @@ class SearchAlgorithms:
 
     @staticmethod
     def get_neighbors(pos, rows, cols):
-        """Retorna vizinhos válidos embaralhados para garantir variedade."""
-        r, c = pos
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        random.shuffle(directions)
-
-        result = []
-        for dr, dc in directions:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < rows and 0 <= nc < cols:
-                result.append((nr, nc))
-        return result
+        """Retorna vizinhos válidos na ordem do modo atual (fixa ou sorteada)."""
+        neighbors = adjacency_table(rows, cols)[pos[0]][pos[1]]
+        return [neighbors[k] for k in SearchAlgorithms.neighbor_order(len(neighbors))]
 
     @staticmethod
     def is_walkable(pos, knowledge_base, safe_only):
@@ -41,22 +75,15 @@ class SearchAlgorithms:
         safe_only=True: Apenas SAFE.
         safe_only=False: SAFE e CAUTION (Arriscar).
         """
-        r, c = pos
-        status = knowledge_base[r][c]
-
-        if status == 'UNSAFE':
-            return False
-
-        if safe_only:
-            return status == 'SAFE'
-        else:
-            return True
+        return knowledge_base.is_walkable(pos[0], pos[1], safe_only)
 
     # ------------------------------------------------------------
     #                   B F S
     # ------------------------------------------------------------
     @staticmethod
     def bfs(start, goal, kb, rows, cols, safe_only=False):
+        adjacent = adjacency_table(rows, cols)
+        order = SearchAlgorithms.neighbor_order
         queue = deque([start])
         visited = {start}
         came_from = {}
@@ -69,9 +96,11 @@ class SearchAlgorithms:
             if current == goal:
                 return SearchAlgorithms.reconstruct_path(came_from, start, goal), nodes_expanded
 
-            for neighbor in SearchAlgorithms.get_neighbors(current, rows, cols):
+            neighbors = adjacent[current[0]][current[1]]
+            for k in order(len(neighbors)):
+                neighbor = neighbors[k]
                 if neighbor not in visited:
-                    if SearchAlgorithms.is_walkable(neighbor, kb, safe_only):
+                    if kb.is_walkable(neighbor[0], neighbor[1], safe_only):
                         visited.add(neighbor)
                         came_from[neighbor] = current
                         queue.append(neighbor)
@@ -82,6 +111,8 @@ class SearchAlgorithms:
     # ------------------------------------------------------------
     @staticmethod
     def dfs(start, goal, kb, rows, cols, safe_only=False):
+        adjacent = adjacency_table(rows, cols)
+        order = SearchAlgorithms.neighbor_order
         stack = [start]
         visited = {start}
         came_from = {}
@@ -94,9 +125,11 @@ class SearchAlgorithms:
             if current == goal:
                 return SearchAlgorithms.reconstruct_path(came_from, start, goal), nodes_expanded
 
-            for neighbor in SearchAlgorithms.get_neighbors(current, rows, cols):
+            neighbors = adjacent[current[0]][current[1]]
+            for k in order(len(neighbors)):
+                neighbor = neighbors[k]
                 if neighbor not in visited:
-                    if SearchAlgorithms.is_walkable(neighbor, kb, safe_only):
+                    if kb.is_walkable(neighbor[0], neighbor[1], safe_only):
                         visited.add(neighbor)
                         came_from[neighbor] = current
                         stack.append(neighbor)
@@ -111,9 +144,15 @@ class SearchAlgorithms:
 
     @staticmethod
     def a_star(start, goal, kb, rows, cols, safe_only=False):
-        pq = []
-        # Random no custo inicial para desempatar
-        heapq.heappush(pq, (0 + random.random(), start))
+        adjacent = adjacency_table(rows, cols)
+        order = SearchAlgorithms.neighbor_order
+        # Desempate: menor h primeiro, depois contador (determinístico) ou sorteio semeado
+        tie = SearchAlgorithms.tie_breaker()
+        counter = 0
+        gr, gc = goal
+
+        h = abs(start[0] - gr) + abs(start[1] - gc)
+        pq = [(h, h, 0, start)]
 
         came_from = {}
         g_score = {start: 0}
@@ -121,7 +160,7 @@ class SearchAlgorithms:
         visited = set()
 
         while pq:
-            _, current = heapq.heappop(pq)
+            current = heapq.heappop(pq)[3]
 
             if current in visited: continue
             visited.add(current)
@@ -130,13 +169,15 @@ class SearchAlgorithms:
             if current == goal:
                 return SearchAlgorithms.reconstruct_path(came_from, start, goal), nodes_expanded
 
-            for neighbor in SearchAlgorithms.get_neighbors(current, rows, cols):
-                if not SearchAlgorithms.is_walkable(neighbor, kb, safe_only):
+            neighbors = adjacent[current[0]][current[1]]
+            for k in order(len(neighbors)):
+                neighbor = neighbors[k]
+                nr, nc = neighbor
+                if not kb.is_walkable(nr, nc, safe_only):
                     continue
 
-                status = kb[neighbor[0]][neighbor[1]]
                 move_cost = 1
-                if status == 'CAUTION':
+                if kb.is_caution(nr, nc):
                     move_cost = 20  # Custo alto para risco
 
                 tentative_g = g_score[current] + move_cost
@@ -144,8 +185,113 @@ class SearchAlgorithms:
                 if neighbor not in g_score or tentative_g < g_score[neighbor]:
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f = tentative_g + SearchAlgorithms.heuristic(neighbor, goal)
-                    # Adiciona ruído
-                    heapq.heappush(pq, (f + random.uniform(0, 0.5), neighbor))
+                    h = abs(nr - gr) + abs(nc - gc)
+                    counter += 1
+                    heapq.heappush(pq, (tentative_g + h, h, counter if tie is None else tie(), neighbor))
+
+        return [], nodes_expanded
+
+    # ------------------------------------------------------------
+    #   Versões com índices planos (mesmo resultado, arrays reaproveitados)
+    # ------------------------------------------------------------
+    @staticmethod
+    def bfs_flat(start, goal, kb, rows, cols, safe_only=False):
+        order = None if SearchAlgorithms.deterministic else SearchAlgorithms.neighbor_order
+        return flat_search(rows, cols).bfs(start, goal, kb, safe_only, order)
+
+    @staticmethod
+    def dfs_flat(start, goal, kb, rows, cols, safe_only=False):
+        order = None if SearchAlgorithms.deterministic else SearchAlgorithms.neighbor_order
+        return flat_search(rows, cols).bfs(start, goal, kb, safe_only, order, lifo=True)
+
+    @staticmethod
+    def a_star_flat(start, goal, kb, rows, cols, safe_only=False):
+        order = None if SearchAlgorithms.deterministic else SearchAlgorithms.neighbor_order
+        return flat_search(rows, cols).a_star(start, goal, kb, safe_only, order, SearchAlgorithms.tie_breaker())
+
+    # ------------------------------------------------------------
+    #           Jump Point Search e buscas bidirecionais
+    # ------------------------------------------------------------
+    @staticmethod
+    def jps(start, goal, kb, rows, cols, safe_only=False):
+        return jump_point_search(flat_search(rows, cols), start, goal, kb, safe_only, SearchAlgorithms.tie_breaker())
+
+    @staticmethod
+    def bidirectional_bfs(start, goal, kb, rows, cols, safe_only=False):
+        order = None if SearchAlgorithms.deterministic else SearchAlgorithms.neighbor_order
+        return flat_search(rows, cols).bidirectional_bfs(start, goal, kb, safe_only, order)
+
+    @staticmethod
+    def bidirectional_a_star(start, goal, kb, rows, cols, safe_only=False):
+        order = None if SearchAlgorithms.deterministic else SearchAlgorithms.neighbor_order
+        return flat_search(rows, cols).bidirectional_a_star(
+            start, goal, kb, safe_only, order, SearchAlgorithms.tie_breaker()
+        )
+
+    # ------------------------------------------------------------
+    #            Vários objetivos numa única busca
+    # ------------------------------------------------------------
+    @staticmethod
+    def multi_goal(start, goals, kb, rows, cols, safe_only=False, algorithm_name="astar"):
+        """
+        Uma só busca a partir de 'start' até o objetivo mais próximo de 'goals'
+        (posições). Retorna (objetivo, caminho, nós), com objetivo None se
+        nenhum for alcançável. bfs/bibfs usam BFS e os demais usam custo
+        uniforme com os custos do A*. Empates de distância ficam com o
+        objetivo de menor índice. A DFS não passa por aqui: sem noção de
+        "mais próximo", o Agent escolhe o alvo dela pelo campo de distâncias.
+
+        Só para os métodos de SINGLE_PASS esta busca é a do próprio algoritmo
+        (caminho e nós valem como os dele); para os demais ela serve apenas
+        para escolher o alvo, e o caminho sai do algoritmo escolhido.
+        """
+        arena = flat_search(rows, cols)
+        s = start[0] * cols + start[1]
+        targets = {r * cols + c for r, c in goals}
+        order = None if SearchAlgorithms.deterministic else SearchAlgorithms.neighbor_order
+
+        if algorithm_name in ("bfs", "bibfs"):
+            found, nodes = arena.sweep(s, targets, kb, safe_only, order, settle=True)
+        else:
+            found, nodes = arena.dijkstra(s, targets, kb, safe_only, order, SearchAlgorithms.tie_breaker())
+
+        if found is None:
+            return None, [], nodes
+        return divmod(found, cols), arena.path(s, found), nodes
+
+    # ------------------------------------------------------------
+    #                   D * Lite
+    # ------------------------------------------------------------
+    @staticmethod
+    def d_star_lite(start, goal, kb, rows, cols, safe_only=False):
+        """
+        Versão sem estado: planeja do zero. O Agent mantém um DStarLite
+        persistente para reaproveitar a árvore entre replanejamentos.
+        """
+        return DStarLite(rows, cols, safe_only).plan(start, goal, kb)
+
+    # ------------------------------------------------------------
+    #                   Registro por nome
+    # ------------------------------------------------------------
+    @staticmethod
+    def search(algorithm_name, start, goal, kb, rows, cols, safe_only=False):
+        """Executa o algoritmo escolhido pelo nome (desconhecido -> A*)."""
+        algorithm = ALGORITHMS.get(algorithm_name, SearchAlgorithms.a_star_flat)
+        return algorithm(start, goal, kb, rows, cols, safe_only)
+
+
+# Métodos cuja própria busca já é a de vários objetivos (multi_goal): o
+# caminho até o alvo sai junto da escolha, sem uma segunda busca
+SINGLE_PASS = frozenset({"bfs"})
 
-        return [], nodes_expanded
\ No newline at end of file
+# O agente usa as versões com índices planos; bfs/dfs/a_star com tuplas
+# continuam como implementação de referência.
+ALGORITHMS = {
+    "bfs": SearchAlgorithms.bfs_flat,
+    "dfs": SearchAlgorithms.dfs_flat,
+    "astar": SearchAlgorithms.a_star_flat,
+    "dstar": SearchAlgorithms.d_star_lite,
+    "jps": SearchAlgorithms.jps,
+    "bibfs": SearchAlgorithms.bidirectional_bfs,
+    "biastar": SearchAlgorithms.bidirectional_a_star,
+}
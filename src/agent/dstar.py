@@ -0,0 +1,163 @@
+import heapq
+
+INF = float('inf')
+CAUTION_COST = 20
+
+
+class DStarLite:
+    """
+    Planejador D* Lite (Koenig & Likhachev) sobre a KB do agente.
+
+    A busca parte do objetivo em direção ao agente e a árvore (g/rhs) fica
+    guardada entre chamadas: enquanto o objetivo não muda, um novo plano só
+    reprocessa os vizinhos das células cuja situação mudou na KB
+    (SAFE -> CAUTION -> UNSAFE) e o deslocamento do agente entra no termo km.
+    Trocar de objetivo reinicia a árvore, assim como ficar tanto tempo sem
+    planejar que as mudanças da KB desde então já foram descartadas do log.
+
+    Custo para entrar numa célula: o mesmo do A* (UNSAFE infinito, CAUTION 20,
+    demais 1); com safe_only, tudo que não é SAFE é infinito.
+    """
+
+    def __init__(self, rows, cols, safe_only=False):
+        self.rows = rows
+        self.cols = cols
+        self.safe_only = safe_only
+
+        self.adj = []
+        for i in range(rows * cols):
+            r, c = divmod(i, cols)
+            adj = []
+            if r > 0: adj.append(i - cols)
+            if r < rows - 1: adj.append(i + cols)
+            if c > 0: adj.append(i - 1)
+            if c < cols - 1: adj.append(i + 1)
+            self.adj.append(tuple(adj))
+
+        self.kb = None
+        self.goal = None
+        self.synced = 0  # versão da KB já processada
+        self.total_nodes = 0
+
+    def cost(self, idx):
+        """Custo para entrar na célula idx, lido direto dos planos de bits da KB."""
+        kb = self.kb
+        byte, bit = idx >> 3, 1 << (idx & 7)
+        if self.safe_only:
+            return 1 if kb.safe[byte] & bit else INF
+        if kb.unsafe[byte] & bit:
+            return INF
+        return CAUTION_COST if kb.caution[byte] & bit else 1
+
+    def h(self, idx):
+        r, c = divmod(idx, self.cols)
+        sr, sc = divmod(self.start, self.cols)
+        return abs(r - sr) + abs(c - sc)
+
+    def key(self, idx):
+        m = min(self.g.get(idx, INF), self.rhs.get(idx, INF))
+        return (m + self.h(idx) + self.km, m)
+
+    def reset(self, goal):
+        self.goal = goal
+        self.g = {}
+        self.rhs = {goal: 0}
+        self.heap = []
+        self.queued = {}  # célula -> chave atual (entradas antigas no heap são ignoradas)
+        self.km = 0
+        self.last = self.start
+        self.push(goal)
+
+    def push(self, idx):
+        k = self.key(idx)
+        self.queued[idx] = k
+        heapq.heappush(self.heap, (k, idx))
+
+    def update_vertex(self, u):
+        if u != self.goal:
+            g = self.g
+            best = INF
+            for s in self.adj[u]:
+                v = self.cost(s) + g.get(s, INF)
+                if v < best:
+                    best = v
+            self.rhs[u] = best
+        if self.g.get(u, INF) != self.rhs.get(u, INF):
+            self.push(u)
+        else:
+            self.queued.pop(u, None)
+
+    def compute_shortest_path(self):
+        heap, queued, g, rhs = self.heap, self.queued, self.g, self.rhs
+        start = self.start
+        nodes = 0
+        while heap:
+            k, u = heap[0]
+            if queued.get(u) != k:
+                heapq.heappop(heap)
+                continue
+            if k >= self.key(start) and rhs.get(start, INF) == g.get(start, INF):
+                break
+            heapq.heappop(heap)
+            del queued[u]
+            nodes += 1
+
+            k_new = self.key(u)
+            if k < k_new:
+                self.push(u)
+            elif g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+                for p in self.adj[u]:
+                    self.update_vertex(p)
+            else:
+                g[u] = INF
+                self.update_vertex(u)
+                for p in self.adj[u]:
+                    self.update_vertex(p)
+        return nodes
+
+    def plan(self, start, goal, kb):
+        """Retorna (caminho, nós expandidos nesta chamada), como os demais algoritmos."""
+        cols = self.cols
+        start_idx = start[0] * cols + start[1]
+        goal_idx = goal[0] * cols + goal[1]
+
+        if kb is not self.kb or self.synced < kb.base:
+            # Árvore de outra KB, ou as mudanças desde o último plano já saíram do
+            # log (o planejador não segura o log): recomeça do zero
+            self.goal = None
+        self.kb = kb
+
+        if goal_idx != self.goal:
+            self.start = start_idx
+            self.reset(goal_idx)
+        else:
+            self.start = start_idx
+            self.km += self.h(self.last)
+            self.last = start_idx
+            for v in set(kb.changes_since(self.synced)):
+                for p in self.adj[v]:
+                    self.update_vertex(p)
+        self.synced = kb.version
+
+        nodes = self.compute_shortest_path()
+        self.total_nodes += nodes
+
+        if self.rhs.get(start_idx, INF) == INF:
+            return [], nodes
+
+        # Desce a árvore: sempre o sucessor de menor custo + g
+        path = []
+        u = start_idx
+        g = self.g
+        while u != goal_idx:
+            best, best_v = None, INF
+            for s in self.adj[u]:
+                v = self.cost(s) + g.get(s, INF)
+                if v < best_v:
+                    best, best_v = s, v
+            if best is None or len(path) >= len(self.adj):
+                return [], nodes
+            path.append(divmod(best, cols))
+            u = best
+        return path, nodes
@@ -0,0 +1,482 @@
+import heapq
+import weakref
+from functools import lru_cache
+
+TIE_BITS = 32  # largura do desempate dentro da chave empacotada do A*
+CAUTION_COST = 20
+# Código por célula (CAUTION + 2 * UNSAFE) -> custo para entrar; UNSAFE não é transitável
+COST_BY_CODE = bytes((1, CAUTION_COST, 0)) + bytes(253)
+
+
+def unpack_bits(plane, size):
+    """Plano de bits -> um byte (0 ou 1) por célula, com o trabalho todo em C."""
+    bits = format(int.from_bytes(plane, 'little'), f'0{len(plane) * 8}b')[:-size - 1:-1]
+    return bits.encode().translate(bytes.maketrans(b'01', b'\x00\x01'))
+
+
+def cell_cost(kb, idx, safe_only):
+    """Custo para entrar na célula idx (0 = não transitável)."""
+    byte, bit = idx >> 3, 1 << (idx & 7)
+    if safe_only:
+        return 1 if kb.safe[byte] & bit else 0
+    if kb.unsafe[byte] & bit:
+        return 0
+    return CAUTION_COST if kb.caution[byte] & bit else 1
+
+
+class FlatSearch:
+    """
+    Núcleo de busca sobre índices planos (r * cols + c).
+
+    g-scores, pais e marcas de visita ficam em listas pré-alocadas e
+    reaproveitadas entre chamadas: em vez de limpar, cada busca usa uma nova
+    geração e uma célula só vale se sua marca for a geração atual.
+    A KB vira um mapa de custos com um byte por célula (ver costs), então
+    testar um vizinho é uma leitura só. Mesmo contrato (caminho, nós) e,
+    com a mesma ordem de vizinhos/desempate, o mesmo resultado da versão com tuplas.
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.size = size = rows * cols
+
+        self.adj = []
+        for i in range(size):
+            r, c = divmod(i, cols)
+            adj = []
+            if r > 0: adj.append(i - cols)
+            if r < rows - 1: adj.append(i + cols)
+            if c > 0: adj.append(i - 1)
+            if c < cols - 1: adj.append(i + 1)
+            self.adj.append(tuple(adj))
+        self.row_of = [i // cols for i in range(size)]
+        self.col_of = [i % cols for i in range(size)]
+
+        self.generation = 0
+        self.seen = [0] * size    # geração em que a célula foi alcançada
+        self.closed = [0] * size  # geração em que a célula foi expandida (A*)
+        self.g = [0] * size
+        self.parent = [0] * size
+        self.cost_maps = {}       # safe_only -> [KB (weakref), versão, custos]
+        self.backward = None      # arrays da busca a partir do objetivo (bidirecional), sob demanda
+
+    def costs(self, kb, safe_only):
+        """
+        Custo para entrar em cada célula (0 = não transitável, 1, ou 20 numa
+        CAUTION fora do safe_only), um byte por célula. Fica guardado por modo
+        e é atualizado só nas células do log de mudanças da KB desde o último
+        uso (a KB só muda por set); é refeito do zero para outra KB ou se o log
+        já foi compactado.
+        """
+        entry = self.cost_maps.get(safe_only)
+        if entry is not None and entry[0]() is kb and entry[1] >= kb.base:
+            table = entry[2]
+            if entry[1] != kb.version:
+                for idx in kb.changes_since(entry[1]):
+                    table[idx] = cell_cost(kb, idx, safe_only)
+                entry[1] = kb.version
+            return table
+
+        size = self.size
+        if safe_only:
+            table = bytearray(unpack_bits(kb.safe, size))
+        else:
+            code = (int.from_bytes(unpack_bits(kb.caution, size), 'big')
+                    + 2 * int.from_bytes(unpack_bits(kb.unsafe, size), 'big'))
+            table = bytearray(code.to_bytes(size, 'big').translate(COST_BY_CODE))
+        self.cost_maps[safe_only] = [weakref.ref(kb), kb.version, table]
+        return table
+
+    def path(self, start, goal):
+        """Refaz o caminho pelos pais, sem incluir o início."""
+        cols = self.cols
+        parent = self.parent
+        path = []
+        current = goal
+        while current != start:
+            path.append(divmod(current, cols))
+            current = parent[current]
+        path.reverse()
+        return path
+
+    def bfs(self, start, goal, kb, safe_only, order=None, lifo=False):
+        """
+        BFS (ou DFS, com lifo=True) do mesmo jeito que SearchAlgorithms.bfs/dfs.
+        order(n) dá a ordem de visita dos vizinhos; None = ordem fixa.
+        """
+        s = start[0] * self.cols + start[1]
+        found, nodes = self.sweep(s, {goal[0] * self.cols + goal[1]}, kb, safe_only, order, lifo)
+        if found is None:
+            return [], nodes
+        return self.path(s, found), nodes
+
+    def sweep(self, s, goals, kb, safe_only, order=None, lifo=False, settle=False):
+        """
+        Núcleo da BFS/DFS a partir do índice s até expandir qualquer célula do
+        conjunto 'goals'. Retorna (célula encontrada ou None, nós expandidos);
+        os pais ficam na arena para self.path. Com settle (só BFS), entre
+        objetivos à mesma distância fica o de menor índice, uma escolha estável
+        mesmo com a ordem dos vizinhos sorteada.
+
+        As marcas de visita são uma cópia do mapa de custos (uma cópia de
+        memória por busca): zerar a célula ao alcançá-la faz o teste "livre e
+        ainda não visitada" numa leitura só. A BFS anda camada por camada:
+        percorrer a camada em ordem é o mesmo que tirar da fila, e os
+        objetivos são procurados uma vez por camada, não a cada nó.
+        """
+        adj, parent = self.adj, self.parent
+        free = bytearray(self.costs(kb, safe_only))
+        free[s] = 0
+        if lifo:
+            return self._depth_first(s, goals, free, order)
+
+        layer = [s]
+        nodes = 0
+        while layer:
+            if not goals.isdisjoint(layer):
+                for i, current in enumerate(layer):
+                    if current in goals:
+                        break
+                    if order is not None:
+                        order(len(adj[current]))  # a fila expandiria este nó: mesmo consumo do sorteio
+                if settle:
+                    # Os empatados (mesma distância) são os objetivos da camada
+                    return min(goals.intersection(layer)), nodes + len(layer)
+                return current, nodes + i + 1
+
+            next_layer = []
+            push = next_layer.append
+            for current in layer:
+                neighbors = adj[current]
+                if order is not None:
+                    neighbors = [neighbors[k] for k in order(len(neighbors))]
+                for n in neighbors:
+                    if free[n]:
+                        free[n] = 0
+                        parent[n] = current
+                        push(n)
+            nodes += len(layer)
+            layer = next_layer
+        return None, nodes
+
+    def _depth_first(self, s, goals, free, order=None):
+        """DFS com pilha sobre as marcas de sweep: o primeiro objetivo expandido encerra a busca."""
+        adj, parent = self.adj, self.parent
+        stack = [s]
+        take, push = stack.pop, stack.append
+        nodes = 0
+        while stack:
+            current = take()
+            nodes += 1
+            if current in goals:
+                return current, nodes
+
+            neighbors = adj[current]
+            if order is not None:
+                neighbors = [neighbors[k] for k in order(len(neighbors))]
+            for n in neighbors:
+                if free[n]:
+                    free[n] = 0
+                    parent[n] = current
+                    push(n)
+        return None, nodes
+
+    def dijkstra(self, s, goals, kb, safe_only, order=None, tie=None):
+        """
+        Custo uniforme (mesmos custos do A*, sem heurística) a partir do índice s
+        até expandir a célula de 'goals' mais barata; entre objetivos de mesmo
+        custo fica o de menor índice. Retorna (célula ou None, nós).
+        """
+        adj = self.adj
+        self.generation += 1
+        gen = self.generation
+        seen, closed, g, parent = self.seen, self.closed, self.g, self.parent
+        cost = self.costs(kb, safe_only)
+        heappush, heappop = heapq.heappush, heapq.heappop
+        size = self.size
+        counter = 0
+
+        pq = [s]  # chave empacotada: (g, desempate, célula)
+        seen[s] = gen
+        g[s] = 0
+        nodes = 0
+
+        while pq:
+            current = heappop(pq) % size
+
+            if closed[current] == gen: continue
+            closed[current] = gen
+            nodes += 1
+
+            if current in goals:
+                g_goal = g[current]
+                while pq and (pq[0] // size) >> TIE_BITS == g_goal:
+                    other = heappop(pq) % size
+                    if closed[other] == gen: continue
+                    closed[other] = gen
+                    nodes += 1
+                    if other in goals and other < current:
+                        current = other
+                return current, nodes
+
+            g_current = g[current]
+            neighbors = adj[current]
+            if order is not None:
+                neighbors = [neighbors[k] for k in order(len(neighbors))]
+            for n in neighbors:
+                step = cost[n]
+                if not step:
+                    continue
+                tentative_g = g_current + step
+
+                if seen[n] != gen or tentative_g < g[n]:
+                    seen[n] = gen
+                    g[n] = tentative_g
+                    parent[n] = current
+                    counter += 1
+                    heappush(pq, ((tentative_g << TIE_BITS) | (counter if tie is None else tie())) * size + n)
+
+        return None, nodes
+
+    def a_star(self, start, goal, kb, safe_only, order=None, tie=None):
+        """
+        A* com chaves (f, h, desempate, célula); tie=None usa um contador.
+        A chave vai empacotada num único inteiro: o heap compara ints em vez de tuplas.
+        """
+        cols, size = self.cols, self.size
+        adj, row_of, col_of = self.adj, self.row_of, self.col_of
+        self.generation += 1
+        gen = self.generation
+        seen, closed, g, parent = self.seen, self.closed, self.g, self.parent
+        cost = self.costs(kb, safe_only)
+        heappush, heappop = heapq.heappush, heapq.heappop
+        h_span = self.rows + cols  # h < h_span
+
+        s = start[0] * cols + start[1]
+        t = goal[0] * cols + goal[1]
+        gr, gc = goal
+        counter = 0
+
+        h = abs(start[0] - gr) + abs(start[1] - gc)
+        pq = [((h * h_span + h) << TIE_BITS) * size + s]
+        seen[s] = gen
+        g[s] = 0
+        nodes = 0
+
+        while pq:
+            current = heappop(pq) % size
+
+            if closed[current] == gen: continue
+            closed[current] = gen
+            nodes += 1
+
+            if current == t:
+                return self.path(s, t), nodes
+
+            g_current = g[current]
+            neighbors = adj[current]
+            if order is not None:
+                neighbors = [neighbors[k] for k in order(len(neighbors))]
+            for n in neighbors:
+                step = cost[n]
+                if not step:
+                    continue
+                tentative_g = g_current + step
+
+                if seen[n] != gen or tentative_g < g[n]:
+                    seen[n] = gen
+                    g[n] = tentative_g
+                    parent[n] = current
+                    h = abs(row_of[n] - gr) + abs(col_of[n] - gc)
+                    counter += 1
+                    key = (tentative_g + h) * h_span + h
+                    heappush(pq, ((key << TIE_BITS) | (counter if tie is None else tie())) * size + n)
+
+        return [], nodes
+
+    # --------------------------------------------------------
+    #   Buscas bidirecionais (início -> objetivo e objetivo -> início)
+    # --------------------------------------------------------
+    def _backward_arrays(self):
+        """
+        (seen, closed, g, parent) da busca reversa, na mesma ordem dos arrays
+        diretos. Todas as buscas bidirecionais usam essa ordem: cada array só
+        guarda um tipo de valor (marcas de geração, custos ou pais), senão um
+        pai deixado por uma busca seria lido como marca pela seguinte.
+        """
+        if self.backward is None:
+            size = self.size
+            self.backward = ([0] * size, [0] * size, [0] * size, [0] * size)
+        return self.backward
+
+    def _join(self, meet_from, meet_to, start, goal, parent_b):
+        """Caminho início..meet_from pela árvore direta, depois meet_to..objetivo pela reversa."""
+        path = self.path(start, meet_from) if meet_from != start else []
+        cols = self.cols
+        current = meet_to
+        path.append(divmod(current, cols))
+        while current != goal:
+            current = parent_b[current]
+            path.append(divmod(current, cols))
+        return path
+
+    def bidirectional_bfs(self, start, goal, kb, safe_only, order=None):
+        """
+        BFS pelos dois lados, expandindo sempre a camada da fronteira menor.
+        Ao fim da camada em que as buscas se tocam, fica o encontro mais curto.
+        """
+        cols, adj = self.cols, self.adj
+        self.generation += 1
+        gen = self.generation
+        seen_f, parent_f, depth_f = self.seen, self.parent, self.g
+        seen_b, _, depth_b, parent_b = self._backward_arrays()
+        plane, wanted = (kb.safe, 1) if safe_only else (kb.unsafe, 0)
+        s = start[0] * cols + start[1]
+        t = goal[0] * cols + goal[1]
+        if s == t:
+            return [], 1
+        if plane[t >> 3] >> (t & 7) & 1 != wanted:
+            return [], 0
+
+        seen_f[s] = seen_b[t] = gen
+        depth_f[s] = depth_b[t] = 0
+        layer_f, layer_b = [s], [t]
+        nodes = 0
+        best, meet = None, None
+
+        while layer_f and layer_b:
+            forward = len(layer_f) <= len(layer_b)
+            if forward:
+                layer, seen, parent, depth, other_seen, other_depth = layer_f, seen_f, parent_f, depth_f, seen_b, depth_b
+            else:
+                layer, seen, parent, depth, other_seen, other_depth = layer_b, seen_b, parent_b, depth_b, seen_f, depth_f
+            next_layer = []
+            for current in layer:
+                nodes += 1
+                neighbors = adj[current]
+                if order is not None:
+                    neighbors = [neighbors[k] for k in order(len(neighbors))]
+                for n in neighbors:
+                    # Na volta, o vizinho é o passo anterior do caminho: o início não precisa ser transitável
+                    if not (plane[n >> 3] >> (n & 7) & 1 == wanted or (not forward and n == s)):
+                        continue
+                    if other_seen[n] == gen:
+                        total = depth[current] + 1 + other_depth[n]
+                        if best is None or total < best:
+                            best = total
+                            meet = (current, n) if forward else (n, current)
+                    if seen[n] != gen:
+                        seen[n] = gen
+                        parent[n] = current
+                        depth[n] = depth[current] + 1
+                        next_layer.append(n)
+            if best is not None:
+                return self._join(meet[0], meet[1], s, t, parent_b), nodes
+            if forward:
+                layer_f = next_layer
+            else:
+                layer_b = next_layer
+        return [], nodes
+
+    def bidirectional_a_star(self, start, goal, kb, safe_only, order=None, tie=None):
+        """
+        A* pelos dois lados (heurística de Manhattan até o objetivo / até o início).
+        Para quando o melhor caminho encontrado não passa de max(f mínimo dos dois lados).
+        Mesmos custos (o mapa de costs) e mesmas chaves empacotadas do a_star.
+        """
+        cols, size, adj, row_of, col_of = self.cols, self.size, self.adj, self.row_of, self.col_of
+        self.generation += 1
+        gen = self.generation
+        seen_f, closed_f, g_f, parent_f = self.seen, self.closed, self.g, self.parent
+        seen_b, closed_b, g_b, parent_b = self._backward_arrays()
+        cost = self.costs(kb, safe_only)
+        heappush, heappop = heapq.heappush, heapq.heappop
+        h_span = self.rows + cols  # h < h_span
+        f_unit = h_span << TIE_BITS  # chave // size // f_unit = f
+
+        s = start[0] * cols + start[1]
+        t = goal[0] * cols + goal[1]
+        if s == t:
+            return [], 1
+        if not cost[t]:
+            return [], 0
+        sr, sc = start
+        gr, gc = goal
+
+        counter = 0
+        h = abs(sr - gr) + abs(sc - gc)
+        pq_f, pq_b = [((h * h_span + h) << TIE_BITS) * size + s], [((h * h_span + h) << TIE_BITS) * size + t]
+        seen_f[s] = seen_b[t] = gen
+        g_f[s] = g_b[t] = 0
+        nodes = 0
+        best, meet = None, None
+
+        while pq_f and pq_b:
+            f_f, f_b = pq_f[0] // size // f_unit, pq_b[0] // size // f_unit
+            if best is not None and best <= max(f_f, f_b):
+                break
+            forward = f_f <= f_b
+            pq = pq_f if forward else pq_b
+            current = heappop(pq) % size
+            if forward:
+                if closed_f[current] == gen: continue
+                closed_f[current] = gen
+            else:
+                if closed_b[current] == gen: continue
+                closed_b[current] = gen
+            nodes += 1
+
+            neighbors = adj[current]
+            if order is not None:
+                neighbors = [neighbors[k] for k in order(len(neighbors))]
+            if forward:
+                g_current = g_f[current]
+                for n in neighbors:
+                    step = cost[n]
+                    if not step:
+                        continue
+                    new_g = g_current + step
+                    if seen_b[n] == gen and (best is None or new_g + g_b[n] < best):
+                        best, meet = new_g + g_b[n], (current, n)
+                    if seen_f[n] == gen and new_g >= g_f[n]:
+                        continue
+                    seen_f[n] = gen
+                    g_f[n] = new_g
+                    parent_f[n] = current
+                    nh = abs(row_of[n] - gr) + abs(col_of[n] - gc)
+                    counter += 1
+                    key = (new_g + nh) * h_span + nh
+                    heappush(pq_f, ((key << TIE_BITS) | (counter if tie is None else tie())) * size + n)
+            else:
+                # Aresta direta n -> current: custa entrar em current; n precisa ser transitável (ou o início)
+                new_g = g_b[current] + cost[current]
+                for n in neighbors:
+                    if n != s and not cost[n]:
+                        continue
+                    if seen_f[n] == gen and (best is None or g_f[n] + new_g < best):
+                        best, meet = g_f[n] + new_g, (n, current)
+                    if seen_b[n] == gen and new_g >= g_b[n]:
+                        continue
+                    seen_b[n] = gen
+                    g_b[n] = new_g
+                    parent_b[n] = current
+                    nh = abs(row_of[n] - sr) + abs(col_of[n] - sc)
+                    counter += 1
+                    key = (new_g + nh) * h_span + nh
+                    heappush(pq_b, ((key << TIE_BITS) | (counter if tie is None else tie())) * size + n)
+
+        if best is None:
+            return [], nodes
+        return self._join(meet[0], meet[1], s, t, parent_b), nodes
+
+
+@lru_cache(maxsize=1)
+def flat_search(rows, cols):
+    """
+    Arena compartilhada por dimensão do grid (reaproveitada entre buscas).
+    Cada arena guarda várias listas do tamanho do mapa (~300 MB a 1024x1024),
+    então só a da última dimensão usada fica em memória (uma partida usa uma
+    só); flat_search.cache_clear() libera também essa.
+    """
+    return FlatSearch(rows, cols)
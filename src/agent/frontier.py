@@ -0,0 +1,251 @@
+import heapq
+from collections import deque
+
+INF = 1 << 60
+PROBE_RADIUS = 2  # Alvos até essa distância são achados sem consultar o campo
+
+
+class DistanceField:
+    """
+    Distância (em passos) de cada célula conhecida até a fonte mais próxima.
+    As fontes são as células-objetivo (ex.: SAFE ainda não visitadas) e o campo
+    só cobre células abertas (SAFE/CAUTION), então cresce com a área explorada.
+
+    Toda alteração é incremental: abrir uma célula ou adicionar uma fonte só
+    propaga as distâncias que diminuem; remover uma fonte ou bloquear uma
+    célula só recalcula a região que dependia dela.
+    As alterações ficam pendentes até a próxima consulta que precise do campo e
+    são consolidadas por célula, então uma fonte que entra e sai nesse intervalo
+    não custa nada. Alvos próximos (o caso comum) são achados por uma busca
+    local limitada, sem tocar no campo.
+    Células são índices planos (linha * colunas + coluna).
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.dist = [INF] * self.size
+        self.open = bytearray(self.size)
+        self.sources = set()
+        self.targets = set()  # fontes já com as mudanças pendentes (mantido a cada mudança)
+        self.pending = {}  # célula -> estado desejado (aberta, fonte)
+        self.updates = 0  # Células recalculadas (custo real das atualizações)
+
+    def neighbors(self, i):
+        cols = self.cols
+        c = i % cols
+        result = []
+        if i >= cols: result.append(i - cols)
+        if i + cols < self.size: result.append(i + cols)
+        if c > 0: result.append(i - 1)
+        if c < cols - 1: result.append(i + 1)
+        return result
+
+    # --------------------------------------------------------
+    #   Interface: registra a mudança (aplicada na consulta)
+    # --------------------------------------------------------
+    def _state(self, i):
+        if i in self.pending:
+            return self.pending[i]
+        return bool(self.open[i]), i in self.sources
+
+    def open_cell(self, i):
+        """A célula passou a ser atravessável."""
+        self.pending[i] = (True, self._state(i)[1])
+
+    def block(self, i):
+        """A célula deixou de ser atravessável (ex.: UNSAFE)."""
+        self.pending[i] = (False, False)
+        self.targets.discard(i)
+
+    def add_source(self, i):
+        self.pending[i] = (self._state(i)[0], True)
+        self.targets.add(i)
+
+    def remove_source(self, i):
+        self.pending[i] = (self._state(i)[0], False)
+        self.targets.discard(i)
+
+    def members(self):
+        """Fontes atuais (com as mudanças pendentes aplicadas)."""
+        self.flush()
+        return self.sources
+
+    def goals(self):
+        """Fontes atuais, sem atualizar as distâncias (não alterar o conjunto devolvido)."""
+        return self.targets
+
+    def flush(self):
+        """
+        Aplica as mudanças pendentes em duas etapas: primeiro as que aumentam
+        distâncias (remoções e bloqueios, reparadas em conjunto), depois as que
+        diminuem (aberturas e novas fontes, propagadas a partir de cada célula).
+        """
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+
+        # Se nenhuma fonte antiga sobrevive, o campo inteiro vira INF: sai mais
+        # barato recomeçar do que reparar região por região
+        removed = sum(1 for i, (_, is_source) in pending.items() if not is_source and i in self.sources)
+        if self.sources and removed == len(self.sources):
+            self.sources.clear()
+            self.dist = [INF] * self.size
+
+        roots = []
+        grow = []
+        for i, (is_open, is_source) in pending.items():
+            was_open, was_source = bool(self.open[i]), i in self.sources
+            if was_source and not is_source:
+                self.sources.discard(i)
+            if was_open and not is_open:
+                self.open[i] = 0
+            if was_open and (not is_open or (was_source and not is_source)):
+                roots.append(i)
+            if (is_open and not was_open) or (is_source and not was_source):
+                grow.append((i, is_open, is_source))
+        if roots:
+            self._repair(roots)
+
+        for i, is_open, is_source in grow:
+            if is_source:
+                self.sources.add(i)
+            if is_open:
+                self.open[i] = 1
+        for i, is_open, _ in grow:
+            if is_open:
+                self._relax_cell(i)
+
+    # --------------------------------------------------------
+    #   Manutenção do campo
+    # --------------------------------------------------------
+    def _relax_cell(self, i):
+        """Calcula a distância de 'i' pelos vizinhos e propaga as que diminuírem."""
+        dist = self.dist
+        if i in self.sources:
+            best = 0
+        else:
+            best = dist[i]
+            for w in self.neighbors(i):
+                if self.open[w] and dist[w] + 1 < best:
+                    best = dist[w] + 1
+        if best >= INF:
+            return
+        if best < dist[i]:
+            dist[i] = best
+            self.updates += 1
+
+        is_open, cols, size = self.open, self.cols, self.size
+        queue = deque([i])
+        while queue:
+            u = queue.popleft()
+            d = dist[u] + 1
+            c = u % cols
+            v = u - cols
+            if v >= 0 and is_open[v] and dist[v] > d:
+                dist[v] = d; queue.append(v)
+            v = u + cols
+            if v < size and is_open[v] and dist[v] > d:
+                dist[v] = d; queue.append(v)
+            if c > 0 and is_open[u - 1] and dist[u - 1] > d:
+                dist[u - 1] = d; queue.append(u - 1)
+            if c < cols - 1 and is_open[u + 1] and dist[u + 1] > d:
+                dist[u + 1] = d; queue.append(u + 1)
+            self.updates += 1
+
+    def _repair(self, roots):
+        """
+        Recalcula as distâncias que dependiam das células 'roots' (todas de uma vez,
+        para que regiões compartilhadas sejam refeitas uma única vez).
+        1) Marca como afetadas as células cujos "pais" (vizinhos a distância d-1)
+           estão todos afetados. 2) Recalcula só essas a partir da borda não afetada.
+        """
+        dist, is_open, sources = self.dist, self.open, self.sources
+        affected = set(roots)
+        queue = deque(roots)
+        while queue:
+            u = queue.popleft()
+            child_d = dist[u] + 1
+            for v in self.neighbors(u):
+                if v in affected or not is_open[v] or dist[v] != child_d:
+                    continue
+                supported = False
+                for w in self.neighbors(v):
+                    if w not in affected and is_open[w] and dist[w] == child_d - 1:
+                        supported = True
+                        break
+                if not supported:
+                    affected.add(v)
+                    queue.append(v)
+
+        for u in affected:
+            dist[u] = INF
+        self.updates += len(affected)
+
+        heap = []
+        for u in affected:
+            if not is_open[u]:
+                continue
+            best = 0 if u in sources else INF
+            for w in self.neighbors(u):
+                if is_open[w] and dist[w] + 1 < best:
+                    best = dist[w] + 1
+            if best < INF:
+                dist[u] = best
+                heap.append((best, u))
+        heapq.heapify(heap)
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d != dist[u]:
+                continue
+            for v in self.neighbors(u):
+                if v in affected and is_open[v] and dist[v] > d + 1:
+                    dist[v] = d + 1
+                    heapq.heappush(heap, (d + 1, v))
+
+    def _probe(self, i, radius):
+        """BFS limitada a 'radius' passos, considerando as mudanças ainda pendentes."""
+        if self._state(i)[1]:
+            return i
+        frontier = [i]
+        seen = {i}
+        for _ in range(radius):
+            next_frontier = []
+            for u in frontier:
+                for v in self.neighbors(u):
+                    if v in seen:
+                        continue
+                    seen.add(v)
+                    is_open, is_source = self._state(v)
+                    if not is_open:
+                        continue
+                    if is_source:
+                        return v
+                    next_frontier.append(v)
+            frontier = next_frontier
+        return None
+
+    def nearest(self, i, radius=PROBE_RADIUS):
+        """
+        Fonte mais próxima de 'i' (ou None).
+        Tenta primeiro a vizinhança imediata; se não houver alvo ali, aplica as
+        mudanças pendentes e desce o gradiente do campo: custa O(distância).
+        """
+        found = self._probe(i, radius)
+        if found is not None:
+            return found
+
+        self.flush()
+        dist = self.dist
+        if not self.sources or dist[i] >= INF:
+            return None
+        current = i
+        while dist[current] > 0:
+            d = dist[current] - 1
+            for v in self.neighbors(current):
+                if self.open[v] and dist[v] == d:
+                    current = v
+                    break
+        return current
@@ -0,0 +1,328 @@
+import random
+from collections import deque
+
+MAX_EXACT_VARS = 12  # Componentes maiores que isso são estimadas por amostragem
+GIBBS_SAMPLES = 400
+GIBBS_BURN_IN = 50
+
+
+class HazardModel:
+    """
+    Conhecimento sobre um tipo de perigo (poço ou Wumpus).
+
+    Cada célula é uma variável: presente, ausente ou desconhecida.
+    Cada percepção positiva (ex.: Brisa) vira uma cláusula "pelo menos um dos
+    vizinhos desconhecidos tem o perigo"; percepções negativas marcam os
+    vizinhos como ausentes. A propagação de unidade resolve cláusulas com um
+    único candidato, e as probabilidades são calculadas por componente
+    (variáveis ligadas por cláusulas), com cache até a componente mudar.
+    Células são índices planos (linha * colunas + coluna).
+    """
+
+    def __init__(self, prior, rng):
+        self.prior = prior
+        self.rng = rng
+        self.known = {}         # célula -> True (presente) / False (ausente)
+        self.clauses = {}       # id da cláusula -> set de células candidatas
+        self.var_clauses = {}   # célula -> set de ids de cláusulas
+        self.cache = {}         # célula -> probabilidade (componentes já calculadas)
+        self.changed = set()    # células cujo estado ou probabilidade mudou
+        self.components_solved = 0
+
+    # --------------------------------------------------------
+    #   Fatos e cláusulas
+    # --------------------------------------------------------
+    def state(self, cell):
+        """True (presente), False (ausente) ou None (desconhecido)."""
+        return self.known.get(cell)
+
+    def set_known(self, cell, present):
+        queue = deque()
+        self._assign(cell, present, queue)
+        self._propagate(queue)
+
+    def add_clause(self, cid, cells):
+        """Pelo menos uma das células tem o perigo."""
+        if cid in self.clauses:
+            return
+        if any(self.known.get(c) for c in cells):
+            return
+        candidates = {c for c in cells if c not in self.known}
+        self.clauses[cid] = candidates
+        for c in candidates:
+            self.var_clauses.setdefault(c, set()).add(cid)
+        self._invalidate_component(candidates)
+        self.changed |= candidates
+        self._propagate(deque([cid]))
+
+    def _assign(self, cell, present, queue):
+        """Fixa o valor da célula e enfileira as cláusulas afetadas (sem recursão)."""
+        if cell in self.known:
+            return
+        self._invalidate_component([cell])
+        self.known[cell] = present
+        self.changed.add(cell)
+        for cid in self.var_clauses.pop(cell, ()):
+            if cid not in self.clauses:
+                continue
+            if present:
+                self._drop_clause(cid)  # Cláusula satisfeita
+            else:
+                self.clauses[cid].discard(cell)
+                queue.append(cid)
+
+    def _drop_clause(self, cid):
+        cells = self.clauses.pop(cid)
+        for c in cells:
+            owners = self.var_clauses.get(c)
+            if owners:
+                owners.discard(cid)
+                if not owners:
+                    del self.var_clauses[c]
+            self.changed.add(c)
+        self._invalidate_component(cells)
+
+    def _propagate(self, queue):
+        """Propagação de unidade: cláusula com um só candidato fixa esse candidato."""
+        while queue:
+            cid = queue.popleft()
+            cells = self.clauses.get(cid)
+            if cells is None:
+                continue
+            if len(cells) == 1:
+                self._assign(next(iter(cells)), True, queue)
+            elif not cells:
+                del self.clauses[cid]  # Observações inconsistentes: descarta
+            else:
+                self._invalidate_component(cells)
+
+    # --------------------------------------------------------
+    #   Cache de probabilidades
+    # --------------------------------------------------------
+    def component(self, start):
+        """Variáveis ligadas a 'start' por cláusulas, e as cláusulas envolvidas."""
+        cells, cids = {start}, set()
+        queue = deque([start])
+        while queue:
+            v = queue.popleft()
+            for cid in self.var_clauses.get(v, ()):
+                if cid in cids:
+                    continue
+                cids.add(cid)
+                for w in self.clauses[cid]:
+                    if w not in cells:
+                        cells.add(w)
+                        queue.append(w)
+        return cells, cids
+
+    def _invalidate_component(self, cells):
+        for c in cells:
+            if c in self.cache:
+                comp, _ = self.component(c)
+                for v in comp:
+                    if self.cache.pop(v, None) is not None:
+                        self.changed.add(v)
+
+    def probability(self, cell):
+        """Probabilidade de o perigo estar na célula, dadas todas as observações."""
+        if cell in self.known:
+            return 1.0 if self.known[cell] else 0.0
+        if cell not in self.var_clauses:
+            return self.prior
+        if cell not in self.cache:
+            cells, cids = self.component(cell)
+            self.cache.update(self._solve(list(cells), [self.clauses[c] for c in cids]))
+            self.components_solved += 1
+        return self.cache[cell]
+
+    def _solve(self, cells, clauses):
+        index = {c: i for i, c in enumerate(cells)}
+        masks = [sum(1 << index[c] for c in clause) for clause in clauses]
+        if len(cells) <= MAX_EXACT_VARS:
+            return self._enumerate(cells, masks)
+        return self._gibbs(cells, masks)
+
+    def _enumerate(self, cells, masks):
+        """Enumeração exata de todas as atribuições consistentes."""
+        n, p = len(cells), self.prior
+        weight_by_ones = [p ** k * (1 - p) ** (n - k) for k in range(n + 1)]
+        total = 0.0
+        marginals = [0.0] * n
+        for assignment in range(1 << n):
+            if not all(assignment & m for m in masks):
+                continue
+            w = weight_by_ones[bin(assignment).count('1')]
+            total += w
+            bits = assignment
+            while bits:
+                low = bits & -bits
+                marginals[low.bit_length() - 1] += w
+                bits ^= low
+        return {c: marginals[i] / total if total else self.prior for i, c in enumerate(cells)}
+
+    def _gibbs(self, cells, masks):
+        """Amostragem de Gibbs: começa com tudo presente (sempre consistente)."""
+        n = len(cells)
+        var_masks = [[m for m in masks if m >> i & 1] for i in range(n)]
+        state = (1 << n) - 1
+        counts = [0] * n
+        rng = self.rng
+        for sweep in range(GIBBS_BURN_IN + GIBBS_SAMPLES):
+            for i in range(n):
+                without = state & ~(1 << i)
+                # Se tirar o perigo daqui deixa alguma cláusula vazia, ele é obrigatório
+                if all(without & m for m in var_masks[i]) and rng.random() >= self.prior:
+                    state = without
+                else:
+                    state |= 1 << i
+            if sweep >= GIBBS_BURN_IN:
+                for i in range(n):
+                    counts[i] += state >> i & 1
+        return {c: counts[i] / GIBBS_SAMPLES for i, c in enumerate(cells)}
+
+
+class UniqueHazardModel:
+    """
+    Perigo que existe em exatamente uma célula do mapa (o Wumpus do jogo clássico).
+
+    Mesma interface do HazardModel, mas a restrição de cardinalidade torna o
+    cálculo exato e barato: cada percepção positiva diz que o perigo está entre
+    os vizinhos dela, então os candidatos são a interseção dessas vizinhanças
+    (ou o mapa inteiro, antes da primeira), menos as células sabidamente livres.
+    Com prior uniforme, cada candidato tem probabilidade 1/len(candidatos) e
+    todas as demais células ficam livres; um único candidato é o perigo.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.absent = set()      # células sabidamente livres
+        self.candidates = None   # None = qualquer célula fora de 'absent'
+        self.location = None
+        self.touched = set()     # células já citadas: as únicas cujo estado interessa a quem consulta
+        self.changed = set()
+
+    def state(self, cell):
+        if self.location is not None:
+            return cell == self.location
+        if cell in self.absent or (self.candidates is not None and cell not in self.candidates):
+            return False
+        return None
+
+    def set_known(self, cell, present):
+        self.touched.add(cell)
+        if present:
+            self._restrict({cell})
+            return
+        if cell in self.absent or cell == self.location:
+            return
+        self.absent.add(cell)
+        self.changed.add(cell)
+        if self.candidates is not None and cell in self.candidates:
+            self._restrict(self.candidates - {cell})
+
+    def add_clause(self, cid, cells):
+        """O perigo está numa das células (percepção positiva em 'cid')."""
+        self.touched.update(cells)
+        self._restrict({c for c in cells if c not in self.absent})
+
+    def _restrict(self, cells):
+        """Intersecta os candidatos com 'cells'; observações inconsistentes são descartadas."""
+        if self.location is not None:
+            return
+        new = cells if self.candidates is None else self.candidates & cells
+        if not new or new == self.candidates:
+            return
+        if self.candidates is None:
+            self.changed |= self.touched - new
+        else:
+            self.changed |= (self.candidates - new) & self.touched
+        self.changed |= new & self.touched  # a probabilidade dos que ficam também muda
+        self.candidates = new
+        if len(new) == 1:
+            self.location = next(iter(new))
+
+    def probability(self, cell):
+        state = self.state(cell)
+        if state is not None:
+            return 1.0 if state else 0.0
+        if self.candidates is not None:
+            return 1 / len(self.candidates)
+        return 1 / max(1, self.size - len(self.absent))
+
+
+class InferenceEngine:
+    """
+    Inferência do agente sobre poços e Wumpus.
+    Recebe as percepções de cada célula visitada e deduz, para cada célula,
+    se é SAFE (sem poço e sem Wumpus), UNSAFE (algum dos dois é certo) ou
+    CAUTION (incerta), além do risco estimado de pisar nela.
+
+    A quantidade de Wumpus é regra do mapa, como no jogo clássico: com um
+    único Wumpus vale a restrição "exatamente um" (UniqueHazardModel); com
+    outra quantidade (ou None, desconhecida) cada célula é modelada como os
+    poços, com prior wumpus_count / (células - 1).
+    A seed alimenta a amostragem de Gibbs das componentes grandes de poços.
+    """
+
+    def __init__(self, rows, cols, pit_prior=0.2, wumpus_count=1, seed=0):
+        self.rows = rows
+        self.cols = cols
+        rng = random.Random(seed)
+        self.pits = HazardModel(pit_prior, rng)
+        if wumpus_count == 1:
+            self.wumpus = UniqueHazardModel(rows * cols)
+        else:
+            prior = (wumpus_count if wumpus_count is not None else 1) / max(1, rows * cols - 1)
+            self.wumpus = HazardModel(prior, rng)
+        self.observed_neighbors = set()  # Células vizinhas de alguma célula visitada
+
+    def neighbors(self, idx):
+        cols = self.cols
+        r, c = divmod(idx, cols)
+        result = []
+        if r > 0: result.append(idx - cols)
+        if r < self.rows - 1: result.append(idx + cols)
+        if c > 0: result.append(idx - 1)
+        if c < cols - 1: result.append(idx + 1)
+        return result
+
+    def observe(self, pos, breeze, stench):
+        """
+        Registra as percepções sentidas em 'pos' (que está livre de perigo).
+        Retorna as coordenadas cujo estado ou risco pode ter mudado.
+        """
+        idx = pos[0] * self.cols + pos[1]
+        neighbors = self.neighbors(idx)
+        self.observed_neighbors.update(neighbors)
+        for model, sensed in ((self.pits, breeze), (self.wumpus, stench)):
+            model.set_known(idx, False)
+            if sensed:
+                model.add_clause(idx, neighbors)
+            else:
+                for n in neighbors:
+                    model.set_known(n, False)
+
+        changed = self.pits.changed | self.wumpus.changed
+        self.pits.changed = set()
+        self.wumpus.changed = set()
+        return [divmod(i, self.cols) for i in changed]
+
+    def status(self, pos):
+        idx = pos[0] * self.cols + pos[1]
+        pit = self.pits.state(idx)
+        wumpus = self.wumpus.state(idx)
+        if pit or wumpus:
+            return 'UNSAFE'
+        if pit is False and wumpus is False:
+            return 'SAFE'
+        # Vizinha de célula visitada sem prova de segurança: incerta
+        if idx in self.observed_neighbors:
+            return 'CAUTION'
+        return 'UNKNOWN'
+
+    def risk(self, pos):
+        """Probabilidade de morrer ao entrar na célula."""
+        idx = pos[0] * self.cols + pos[1]
+        p = self.pits.probability(idx)
+        w = self.wumpus.probability(idx)
+        return 1 - (1 - p) * (1 - w)
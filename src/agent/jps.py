@@ -0,0 +1,157 @@
+import heapq
+
+CAUTION_COST = 20
+
+
+def jump_point_search(arena, start, goal, kb, safe_only=False, tie=None):
+    """
+    Jump Point Search para grid 4-conectado, sobre a arena de FlatSearch.
+
+    Só células de custo 1 (SAFE, ou SAFE/UNKNOWN fora do safe_only) são
+    atravessadas por saltos; o A* roda só sobre os pontos de salto.
+    CAUTION (custo 20) funciona como região com peso: a célula é expandida
+    como sucessor direto e toda célula vizinha a uma CAUTION vira ponto de
+    salto, então o caminho continua ótimo com os mesmos custos do A*.
+
+    Retorna (caminho, nós expandidos) — nós = pontos de salto expandidos.
+    """
+    rows, cols = arena.rows, arena.cols
+    arena.generation += 1
+    gen = arena.generation
+    seen, closed, g, parent = arena.seen, arena.closed, arena.g, arena.parent
+    safe, caution, unsafe = kb.safe, kb.caution, kb.unsafe
+    weighted = not safe_only
+
+    def free(r, c):
+        """Célula dentro do grid e de custo 1 (atravessável por salto)."""
+        if r < 0 or r >= rows or c < 0 or c >= cols:
+            return False
+        i = r * cols + c
+        byte, bit = i >> 3, 1 << (i & 7)
+        if safe_only:
+            return bool(safe[byte] & bit)
+        return not (unsafe[byte] & bit or caution[byte] & bit)
+
+    def is_caution(r, c):
+        if not weighted or r < 0 or r >= rows or c < 0 or c >= cols:
+            return False
+        i = r * cols + c
+        return bool(caution[i >> 3] & (1 << (i & 7)))
+
+    def near_caution(r, c):
+        return weighted and (is_caution(r - 1, c) or is_caution(r + 1, c)
+                             or is_caution(r, c - 1) or is_caution(r, c + 1))
+
+    gr, gc = goal
+
+    def jump_h(r, c, dc):
+        """Salta na horizontal a partir de (r, c) (já incluso). Retorna a coluna do ponto de salto."""
+        while free(r, c):
+            if (r == gr and c == gc) or near_caution(r, c):
+                return c
+            # Vizinho forçado: acima/abaixo livre, mas bloqueado atrás
+            if (free(r - 1, c) and not free(r - 1, c - dc)) or (free(r + 1, c) and not free(r + 1, c - dc)):
+                return c
+            c += dc
+        return None
+
+    def jump_v(r, c, dr):
+        """Salta na vertical; a cada passo procura pontos de salto na horizontal."""
+        while free(r, c):
+            if (r == gr and c == gc) or near_caution(r, c):
+                return r
+            if (free(r, c - 1) and not free(r - dr, c - 1)) or (free(r, c + 1) and not free(r - dr, c + 1)):
+                return r
+            if jump_h(r, c - 1, -1) is not None or jump_h(r, c + 1, 1) is not None:
+                return r
+            r += dr
+        return None
+
+    s = start[0] * cols + start[1]
+    t = gr * cols + gc
+    counter = 0
+    h = abs(start[0] - gr) + abs(start[1] - gc)
+    pq = [(h, h, 0, s)]
+    seen[s] = gen
+    g[s] = 0
+    parent[s] = s
+    nodes = 0
+
+    def push(n, new_g, current):
+        nonlocal counter
+        if seen[n] != gen or new_g < g[n]:
+            seen[n] = gen
+            g[n] = new_g
+            parent[n] = current
+            nr, nc = divmod(n, cols)
+            nh = abs(nr - gr) + abs(nc - gc)
+            counter += 1
+            heapq.heappush(pq, (new_g + nh, nh, counter if tie is None else tie(), n))
+
+    while pq:
+        current = heapq.heappop(pq)[3]
+
+        if closed[current] == gen: continue
+        closed[current] = gen
+        nodes += 1
+
+        if current == t:
+            return _expand_path(parent, s, t, cols), nodes
+
+        r, c = divmod(current, cols)
+        g_current = g[current]
+
+        # Direções a explorar: todas no início e ao sair de uma CAUTION; senão, poda do JPS
+        pr, pc = divmod(parent[current], cols)
+        if current == s or is_caution(r, c):
+            directions = ((-1, 0), (1, 0), (0, -1), (0, 1))
+        elif pr == r:
+            dc = 1 if c > pc else -1
+            directions = [(0, dc)]
+            if free(r - 1, c) and not free(r - 1, c - dc): directions.append((-1, 0))
+            if free(r + 1, c) and not free(r + 1, c - dc): directions.append((1, 0))
+        else:
+            dr = 1 if r > pr else -1
+            directions = ((dr, 0), (0, -1), (0, 1))
+
+        for dr, dc in directions:
+            nr, nc = r + dr, c + dc
+            if dc:
+                jc = jump_h(nr, nc, dc)
+                if jc is not None:
+                    push(nr * cols + jc, g_current + abs(jc - c), current)
+            else:
+                jr = jump_v(nr, nc, dr)
+                if jr is not None:
+                    push(jr * cols + nc, g_current + abs(jr - r), current)
+
+        # CAUTION vizinhas entram como sucessores diretos (custo 20)
+        if weighted:
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if is_caution(nr, nc):
+                    push(nr * cols + nc, g_current + CAUTION_COST, current)
+
+    return [], nodes
+
+
+def _expand_path(parent, start, goal, cols):
+    """Liga os pontos de salto em linha reta e devolve o caminho célula a célula."""
+    jumps = []
+    current = goal
+    while current != start:
+        jumps.append(current)
+        current = parent[current]
+    jumps.append(start)
+    jumps.reverse()
+
+    path = []
+    for a, b in zip(jumps, jumps[1:]):
+        ar, ac = divmod(a, cols)
+        br, bc = divmod(b, cols)
+        dr = (br > ar) - (br < ar)
+        dc = (bc > ac) - (bc < ac)
+        while (ar, ac) != (br, bc):
+            ar += dr
+            ac += dc
+            path.append((ar, ac))
+    return path
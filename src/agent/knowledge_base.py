@@ -0,0 +1,213 @@
+import weakref
+
+STATUSES = ('UNKNOWN', 'SAFE', 'CAUTION', 'UNSAFE')
+COMPACT_MIN = 1024  # entradas mínimas no log antes de tentar compactá-lo
+
+
+class _RowView:
+    """Adaptador para o acesso antigo kb[r][c] (leitura e escrita em texto)."""
+
+    def __init__(self, kb, r):
+        self.kb = kb
+        self.r = r
+
+    def __getitem__(self, c):
+        return self.kb.get((self.r, c))
+
+    def __setitem__(self, c, status):
+        self.kb.set((self.r, c), status)
+
+    def __len__(self):
+        return self.kb.cols
+
+    def __iter__(self):
+        return (self.kb.get((self.r, c)) for c in range(self.kb.cols))
+
+
+class KnowledgeBase:
+    """
+    Base de Conhecimento em planos de bits.
+    Cada estado (SAFE, CAUTION, UNSAFE) é um bytearray com 1 bit por célula;
+    UNKNOWN é a ausência dos três. Um mapa 1000x1000 ocupa ~375 KB.
+
+    Consultas por célula são operações de bit; consultas em massa (vizinhança,
+    contagem) usam o plano inteiro como int e deslocamentos.
+    O acesso kb[r][c] continua disponível, em texto, para a GUI e código antigo.
+
+    Cada mudança incrementa a versão e entra num log (changes). Quem lê o log
+    (cache de caminhos, gravador de rastro) se registra com track() e guarda
+    em 'synced' a versão até onde já leu; o começo do log que nenhum leitor
+    vivo precisa mais é descartado de tempos em tempos, então o log fica do
+    tamanho do atraso do leitor mais lento, não da partida inteira. Quem não
+    se registra (D* Lite) confere 'base' e recomeça se ficou para trás.
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        nbytes = (self.size + 7) // 8
+        self.planes = {
+            'SAFE': bytearray(nbytes),
+            'CAUTION': bytearray(nbytes),
+            'UNSAFE': bytearray(nbytes),
+        }
+        self.safe = self.planes['SAFE']
+        self.caution = self.planes['CAUTION']
+        self.unsafe = self.planes['UNSAFE']
+        self.full = (1 << self.size) - 1
+        self._col_masks = None
+
+        # Versão da KB: incrementa a cada mudança; changes[v - base] é a célula alterada na versão v+1
+        self.version = 0
+        self.changes = []
+        self.base = 0  # versões até esta já saíram do log
+        self.readers = weakref.WeakSet()
+        self._compact_at = COMPACT_MIN
+
+    @classmethod
+    def from_rows(cls, rows_of_status):
+        """Cria a KB a partir de uma matriz de strings ('SAFE', 'CAUTION', ...)."""
+        kb = cls(len(rows_of_status), len(rows_of_status[0]))
+        for r, row in enumerate(rows_of_status):
+            for c, status in enumerate(row):
+                if status != 'UNKNOWN':
+                    kb.set((r, c), status)
+        return kb
+
+    # --------------------------------------------------------
+    #   Consultas por célula
+    # --------------------------------------------------------
+    def status_at(self, idx):
+        byte, bit = idx >> 3, 1 << (idx & 7)
+        if self.safe[byte] & bit:
+            return 'SAFE'
+        if self.caution[byte] & bit:
+            return 'CAUTION'
+        if self.unsafe[byte] & bit:
+            return 'UNSAFE'
+        return 'UNKNOWN'
+
+    def get(self, pos):
+        return self.status_at(pos[0] * self.cols + pos[1])
+
+    def is_safe(self, r, c):
+        idx = r * self.cols + c
+        return self.safe[idx >> 3] >> (idx & 7) & 1
+
+    def is_caution(self, r, c):
+        idx = r * self.cols + c
+        return self.caution[idx >> 3] >> (idx & 7) & 1
+
+    def is_unsafe(self, r, c):
+        idx = r * self.cols + c
+        return self.unsafe[idx >> 3] >> (idx & 7) & 1
+
+    def is_walkable(self, r, c, safe_only):
+        """safe_only=True: apenas SAFE. safe_only=False: tudo que não é UNSAFE."""
+        idx = r * self.cols + c
+        if safe_only:
+            return self.safe[idx >> 3] >> (idx & 7) & 1
+        return not self.unsafe[idx >> 3] >> (idx & 7) & 1
+
+    def set(self, pos, status):
+        """Define o estado da célula e retorna o estado anterior."""
+        idx = pos[0] * self.cols + pos[1]
+        old = self.status_at(idx)
+        if old == status:
+            return old
+        byte, bit = idx >> 3, 1 << (idx & 7)
+        if old != 'UNKNOWN':
+            self.planes[old][byte] &= ~bit & 0xFF
+        if status != 'UNKNOWN':
+            self.planes[status][byte] |= bit
+        self.version += 1
+        self.changes.append(idx)
+        if len(self.changes) >= self._compact_at:
+            self._compact()
+        return old
+
+    # --------------------------------------------------------
+    #   Log de mudanças
+    # --------------------------------------------------------
+    def track(self, reader):
+        """
+        Registra um leitor do log: um objeto com o atributo 'synced' (versão
+        até onde já leu). O log guarda tudo a partir do menor 'synced' entre
+        os leitores vivos.
+        """
+        self.readers.add(reader)
+
+    def changes_since(self, version):
+        """Células alteradas nas versões seguintes a 'version' (com repetições)."""
+        if version < self.base:
+            raise ValueError(f"Versão {version} já saiu do log (leitor não registrado com track?).")
+        return self.changes[version - self.base:]
+
+    def _compact(self):
+        """Descarta o começo do log já lido por todos; custo amortizado O(1) por mudança."""
+        oldest = min((reader.synced for reader in self.readers), default=self.version)
+        oldest = max(self.base, min(oldest, self.version))
+        del self.changes[:oldest - self.base]
+        self.base = oldest
+        self._compact_at = max(COMPACT_MIN, 2 * len(self.changes))
+
+    # --------------------------------------------------------
+    #   Consultas em massa (plano como int)
+    # --------------------------------------------------------
+    def mask(self, status):
+        """Plano de um estado como int (bit idx = célula idx)."""
+        if status == 'UNKNOWN':
+            known = self.mask('SAFE') | self.mask('CAUTION') | self.mask('UNSAFE')
+            return self.full & ~known
+        return int.from_bytes(self.planes[status], 'little')
+
+    def column_masks(self):
+        """
+        Máscaras que impedem os deslocamentos horizontais de "vazar" para a linha
+        vizinha. Calculadas só no primeiro uso.
+        """
+        if self._col_masks is None:
+            plane = bytearray(len(self.safe))
+            for idx in range(0, self.size, self.cols):
+                plane[idx >> 3] |= 1 << (idx & 7)
+            first_col = int.from_bytes(plane, 'little')
+            self._col_masks = (self.full & ~first_col, self.full & ~(first_col << (self.cols - 1)))
+        return self._col_masks
+
+    def neighbor_mask(self, mask):
+        """Células vizinhas (Cima, Baixo, Esq, Dir) de qualquer célula marcada em 'mask'."""
+        not_first_col, not_last_col = self.column_masks()
+        cols = self.cols
+        return ((mask << cols) | (mask >> cols)
+                | ((mask << 1) & not_first_col)
+                | ((mask >> 1) & not_last_col)) & self.full
+
+    def count(self, status):
+        return bin(self.mask(status)).count('1')
+
+    def cells(self, mask):
+        """Converte uma máscara em coordenadas (r, c)."""
+        cols = self.cols
+        while mask:
+            low = mask & -mask
+            yield divmod(low.bit_length() - 1, cols)
+            mask ^= low
+
+    def nbytes(self):
+        return sum(len(p) for p in self.planes.values())
+
+    # --------------------------------------------------------
+    #   Adaptador em texto
+    # --------------------------------------------------------
+    def __getitem__(self, r):
+        return _RowView(self, r)
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        return (_RowView(self, r) for r in range(self.rows))
+
+    def to_rows(self):
+        return [list(row) for row in self]
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+
+
+class PathCache:
+    """
+    Cache de caminhos planejados, chave (início, objetivo, safe_only, algoritmo).
+
+    Uma consulta também aceita o sufixo de um caminho guardado para o mesmo
+    objetivo que passe pela posição atual (um trecho de caminho mínimo também
+    é mínimo), o caso comum quando o agente replaneja no meio de uma rota.
+    O índice por célula guarda a posição de cada célula em cada caminho, então
+    achar esse sufixo só olha as entradas que passam pela posição atual.
+
+    Cada entrada guarda a versão da KB em que foi calculada. Ao sincronizar
+    com a KB, só as entradas cujo caminho passa por uma célula alterada desde
+    então são descartadas; buscas que falharam (sem caminho) são descartadas
+    em qualquer mudança, pois uma célula nova pode abrir uma rota.
+    Tamanho limitado com descarte LRU.
+    """
+
+    def __init__(self, kb, maxsize=256):
+        self.kb = kb
+        self.cols = kb.cols
+        self.maxsize = maxsize
+        self.entries = OrderedDict()  # chave -> (caminho, nós, versão)
+        self.by_cell = {}             # célula (índice plano) -> {chave: posição da célula no caminho + 1}
+        self.failures = set()
+        self.synced = kb.version      # versão da KB já processada
+        kb.track(self)
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.saved_nodes = 0
+
+    def sync(self):
+        """Invalida as entradas afetadas pelas mudanças da KB desde a última sincronização."""
+        kb = self.kb
+        if self.synced == kb.version:
+            return
+        changes = kb.changes_since(self.synced)
+        self.synced = kb.version
+        for key in list(self.failures):
+            self._discard(key)
+        for idx in changes:
+            for key in list(self.by_cell.get(idx, ())):
+                self._discard(key)
+
+    def get(self, key):
+        """Caminho (tupla) de key[0] até o objetivo, ou None se não houver no cache."""
+        self.sync()
+        if key in self.entries:
+            found = key
+            path = self.entries[key][0]
+        else:
+            found, path = self._suffix(key)
+            if found is None:
+                self.misses += 1
+                return None
+        self.entries.move_to_end(found)
+        self.hits += 1
+        self.saved_nodes += self.entries[found][1]
+        return path
+
+    def _suffix(self, key):
+        """Entrada mais antiga para o mesmo objetivo cujo caminho passa por key[0]."""
+        start, route = key[0], key[1:]
+        for other, offset in self.by_cell.get(start[0] * self.cols + start[1], {}).items():
+            if offset and other[1:] == route:
+                return other, self.entries[other][0][offset:]
+        return None, None
+
+    def put(self, key, path, nodes):
+        self.sync()
+        if key in self.entries:
+            self._discard(key)
+        path = tuple(path)
+        self.entries[key] = (path, nodes, self.kb.version)
+        if path:
+            cols = self.cols
+            by_cell = self.by_cell
+            by_cell.setdefault(key[0][0] * cols + key[0][1], {}).setdefault(key, 0)
+            for offset, (r, c) in enumerate(path, 1):
+                by_cell.setdefault(r * cols + c, {}).setdefault(key, offset)
+        else:
+            self.failures.add(key)
+        while len(self.entries) > self.maxsize:
+            self._discard(next(iter(self.entries)), evicted=True)
+
+    def _discard(self, key, evicted=False):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        if not evicted:
+            self.invalidations += 1
+        self.failures.discard(key)
+        cols = self.cols
+        for r, c in (key[0],) + entry[0]:
+            idx = r * cols + c
+            keys = self.by_cell.get(idx)
+            if keys:
+                keys.pop(key, None)
+                if not keys:
+                    del self.by_cell[idx]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "taxa_acerto": self.hits / total if total else 0.0,
+            "invalidacoes": self.invalidations,
+            "nos_economizados": self.saved_nodes,
+            "entradas": len(self.entries),
+        }
@@ -0,0 +1,71 @@
+from itertools import islice
+
+
+class Plan:
+    """
+    Caminho planejado pelo agente, consumido por um cursor.
+
+    Avançar e espiar o próximo passo custam O(1) (nada é removido do início
+    da lista); truncar corta só o fim. splice troca o trecho a partir de um
+    passo por um sufixo reparado (como o de um replanejador), mantendo os
+    passos anteriores. Índices e tamanho se referem sempre aos passos que faltam.
+    """
+
+    __slots__ = ('steps', 'cursor')
+
+    def __init__(self, steps=()):
+        self.steps = list(steps)
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.steps) - self.cursor
+
+    def __bool__(self):
+        return self.cursor < len(self.steps)
+
+    def __iter__(self):
+        return islice(self.steps, self.cursor, None)
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError("passo fora do plano")
+        return self.steps[self.cursor + i]
+
+    def __repr__(self):
+        return f"Plan({list(self)})"
+
+    def peek(self):
+        """Próximo passo, ou None se o plano acabou."""
+        if self.cursor < len(self.steps):
+            return self.steps[self.cursor]
+        return None
+
+    def advance(self):
+        """Consome e retorna o próximo passo."""
+        if self.cursor >= len(self.steps):
+            raise IndexError("plano vazio")
+        step = self.steps[self.cursor]
+        self.cursor += 1
+        return step
+
+    def replace(self, steps):
+        """Troca o plano inteiro."""
+        self.steps = list(steps)
+        self.cursor = 0
+
+    def truncate(self, keep=0):
+        """Mantém só os 'keep' próximos passos (padrão: descarta o resto do plano)."""
+        del self.steps[self.cursor + keep:]
+
+    def splice(self, at, suffix):
+        """
+        Mantém os 'at' próximos passos e troca o resto pelo sufixo reparado
+        (splice(0, ...) equivale a replace). Custa O(passos trocados).
+        """
+        if not 0 <= at <= len(self):
+            raise IndexError("passo fora do plano")
+        self.steps[self.cursor + at:] = suffix
+
+    def remaining(self):
+        """Cópia dos passos que faltam."""
+        return self.steps[self.cursor:]
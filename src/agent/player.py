@@ -1,5 +1,10 @@
-from collections import deque
-from src.agent.algorithms import SearchAlgorithms
+from src.agent.algorithms import SINGLE_PASS, SearchAlgorithms
+from src.agent.dstar import DStarLite
+from src.agent.frontier import DistanceField
+from src.agent.inference import InferenceEngine
+from src.agent.knowledge_base import KnowledgeBase
+from src.agent.path_cache import PathCache
+from src.agent.plan import Plan
 
 class Agent:
     """
@@ -7,27 +12,41 @@ class Agent:
     Gerencia a Base de Conhecimento (KB), inferência lógica e tomada de decisão.
     """
 
-    def __init__(self, world):
+    def __init__(self, world, seed=None):
         """
         Inicializa o agente conectado a um ambiente.
+        seed: seed da partida, repassada à amostragem do motor de inferência
+        (sem seed a amostragem é fixa, como no modo determinístico).
         """
         self.world = world
         self.rows = world.rows
         self.cols = world.cols
-        self.pos = (3, 0)
-
-        self.kb = [['UNKNOWN' for _ in range(self.cols)] for _ in range(self.rows)]
-        self.kb[self.pos[0]][self.pos[1]] = 'SAFE'
-
+        self.start = world.start_pos
+        self.pos = self.start
+
+        # Fronteira: células SAFE/CAUTION ainda não visitadas (candidatas a objetivo),
+        # cada tipo com seu campo de distâncias mantido incrementalmente
+        self.frontier = {
+            'SAFE': DistanceField(self.rows, self.cols),
+            'CAUTION': DistanceField(self.rows, self.cols),
+        }
+
+        self.kb = KnowledgeBase(self.rows, self.cols)
+        self.path_cache = PathCache(self.kb)
+        self.planners = {}  # D* Lite persistente, um por modo (safe_only)
+        self.inference = InferenceEngine(self.rows, self.cols, wumpus_count=len(world.wumpus_list),
+                                         seed=0 if seed is None else seed)
         self.visited = set()
         self.visited.add(self.pos)
-        self.path_queue = []
+        self.set_status(self.pos, 'SAFE')
+        self.path_queue = Plan()
         self.has_gold = False
         self.game_over = False
         self.won = False
         self.message = "Explorando..."
 
-        self.total_nodes = 0
+        self.total_nodes = 0       # nós das buscas do algoritmo escolhido (métrica "nos")
+        self.selection_nodes = 0   # nós gastos só para escolher o alvo (fora da métrica)
         self.total_steps = 0
 
     def get_valid_neighbors(self, pos):
@@ -40,72 +59,126 @@ class Agent:
                 neighs.append((nr, nc))
         return neighs
 
+    def set_status(self, pos, status):
+        """Atualiza a KB numa célula, mantendo a fronteira e seus campos de distância em dia."""
+        old = self.kb.set(pos, status)
+        if old == status:
+            return
+
+        idx = pos[0] * self.cols + pos[1]
+        for kind, field in self.frontier.items():
+            if status == 'UNSAFE':
+                field.block(idx)
+                continue
+            if old == kind:
+                field.remove_source(idx)
+            if status == kind and pos not in self.visited:
+                field.add_source(idx)
+            field.open_cell(idx)
+
+    def mark_visited(self, pos):
+        self.visited.add(pos)
+        idx = pos[0] * self.cols + pos[1]
+        for field in self.frontier.values():
+            field.remove_source(idx)
+
     def infer_knowledge(self, percepts):
         """
         Atualiza a Base de Conhecimento (KB) baseado nas percepções atuais.
-        Regra: Se não há Brisa nem Fedor, vizinhos são SAFE.
-        Caso contrário, vizinhos desconhecidos tornam-se CAUTION.
+        O motor de inferência combina as percepções de todas as células visitadas:
+        sem Brisa/Fedor os vizinhos ficam livres daquele perigo; com Brisa/Fedor
+        pelo menos um vizinho tem o perigo. Assim uma célula pode ser provada
+        SAFE, provada UNSAFE, ou continuar CAUTION (com um risco estimado).
+        Só as células afetadas pela nova percepção são reavaliadas.
         """
-        is_safe_zone = "Brisa" not in percepts and "Fedor" not in percepts
-        neighbors = self.get_valid_neighbors(self.pos)
-
-        for nr, nc in neighbors:
-            current = self.kb[nr][nc]
+        changed = self.inference.observe(self.pos, "Brisa" in percepts, "Fedor" in percepts)
 
-            if current in ['SAFE', 'UNSAFE']:
+        for pos in changed:
+            if self.kb.get(pos) == 'UNSAFE':
                 continue
+            self.set_status(pos, self.inference.status(pos))
 
-            if is_safe_zone:
-                self.kb[nr][nc] = 'SAFE'
-            else:
-                if current == 'UNKNOWN':
-                    self.kb[nr][nc] = 'CAUTION'
-
-    def find_target(self):
+    def find_target(self, algorithm_name="astar"):
         """
-        Define o próximo objetivo estratégico.
+        Define o próximo objetivo estratégico e, quando possível, já o caminho.
+        Retorna (alvo, safe_only, caminho, nós); caminho None = ainda falta planejar.
+        A SAFE pendente mais próxima sai de uma busca com vários objetivos
+        (primeiro só por células SAFE, depois arriscando). Na BFS essa busca é
+        a do próprio algoritmo e já traz o caminho; nos demais ela só escolhe o
+        alvo (nós em selection_nodes) e o caminho é planejado depois com o
+        algoritmo escolhido, para que "nos" compare os algoritmos entre si.
+        A DFS não tem noção de "mais próximo": nela o alvo continua sendo a SAFE
+        mais próxima pelo campo de distâncias, planejada depois.
+        Sem células seguras pendentes, arrisca a célula CAUTION de menor risco
+        (empate: a mais próxima).
         """
         if self.has_gold:
-            return (3, 0), True
+            return self.start, True, None, 0
 
-        target = self.bfs_find_nearest('SAFE')
-        if target:
-            return target, True
+        nodes = 0
+        if algorithm_name == "dfs":
+            target = self.bfs_find_nearest('SAFE')
+            if target:
+                return target, True, None, nodes
+            goals = None
+        else:
+            goals = [divmod(idx, self.cols) for idx in self.frontier['SAFE'].goals()]
+        if goals:
+            single_pass = algorithm_name in SINGLE_PASS
+            for safe_only in (True, False):
+                target, path, n = self.multi_goal(goals, safe_only, algorithm_name)
+                if single_pass:
+                    nodes += n
+                else:
+                    self.selection_nodes += n
+                if target is not None:
+                    if not safe_only:
+                        self.message = "Sem rota segura. Tentando risco..."
+                    return target, safe_only, path if single_pass else None, nodes
 
-        target = self.bfs_find_nearest('CAUTION')
+        target = self.safest_caution()
         if target:
-            self.message = "Arriscando..."
-            return target, False
-
-        return None, True
+            self.message = f"Arriscando... (risco {self.inference.risk(target):.0%})"
+            return target, False, None, nodes
+
+        return None, True, None, nodes
+
+    def multi_goal(self, goals, safe_only, algorithm_name):
+        """Busca com vários objetivos a partir da posição atual: (alvo, caminho, nós)."""
+        return SearchAlgorithms.multi_goal(
+            self.pos, goals, self.kb, self.rows, self.cols, safe_only, algorithm_name
+        )
+
+    def safest_caution(self):
+        """Célula CAUTION não visitada com menor probabilidade de perigo."""
+        best, best_key = None, None
+        r0, c0 = self.pos
+        for idx in self.frontier['CAUTION'].members():
+            pos = divmod(idx, self.cols)
+            key = (self.inference.risk(pos), abs(pos[0] - r0) + abs(pos[1] - c0), pos)
+            if best_key is None or key < best_key:
+                best, best_key = pos, key
+        return best
 
     def bfs_find_nearest(self, type_target):
         """
-        Busca em Largura (BFS) interna para encontrar a célula mais próxima
-        de um determinado tipo (SAFE ou CAUTION) na KB.
+        Encontra a célula mais próxima de um determinado tipo (SAFE ou CAUTION)
+        ainda não visitada. Em vez de uma BFS a cada chamada, desce o campo de
+        distâncias da fronteira: custa O(distância até o alvo).
         """
-        queue = deque([self.pos])
-        seen = {self.pos}
-        while queue:
-            curr = queue.popleft()
-            # Se achou o tipo desejado e ainda não visitou
-            if self.kb[curr[0]][curr[1]] == type_target and curr not in self.visited:
-                return curr
-
-            for n in self.get_valid_neighbors(curr):
-                # O agente mentalmente só atravessa o que não é UNSAFE
-                if n not in seen and self.kb[n[0]][n[1]] != 'UNSAFE':
-                    seen.add(n)
-                    queue.append(n)
-        return None
-
-    def think(self, algorithm_name="A*"):
+        field = self.frontier[type_target]
+        idx = field.nearest(self.pos[0] * self.cols + self.pos[1])
+        if idx is None:
+            return None
+        return divmod(idx, self.cols)
+
+    def think(self, algorithm_name="astar"):
         """
         Ciclo de decisão do agente (Perceber -> Raciocinar -> Planejar).
         """
         if self.game_over: return
 
-        if self.has_gold and self.pos == (3, 0):
+        if self.has_gold and self.pos == self.start:
             self.message = "VITÓRIA! Ouro entregue em segurança."
             self.game_over = True
             self.won = True
@@ -115,47 +188,42 @@ class Agent:
         if "Brilho" in percepts:
             self.has_gold = True
             self.message = "OURO! Voltando..."
-            self.path_queue = []
+            self.path_queue.truncate()
 
         self.infer_knowledge(percepts)
+        # Acompanha o log da KB a cada ciclo, para ele não crescer entre dois planejamentos
+        self.path_cache.sync()
 
         if (("Brisa" in percepts or "Fedor" in percepts) and self.path_queue):
-            next_step = self.path_queue[0]
-            if self.kb[next_step[0]][next_step[1]] != 'SAFE':
-                self.path_queue = []
+            next_step = self.path_queue.peek()
+            if not self.kb.is_safe(*next_step):
+                self.path_queue.truncate()
                 self.message = "Perigo! Recalculando..."
 
         if not self.path_queue:
-            target, safe_only = self.find_target()
+            target, safe_only, path, nodes = self.find_target(algorithm_name)
 
             if self.has_gold and not target:
-                target = (3, 0)
+                target = self.start
                 safe_only = False
 
             if target == self.pos:
                 return
 
             if target:
-                args = (self.pos, target, self.kb, self.rows, self.cols, safe_only)
+                if path is None:
+                    path, plan_nodes = self.plan(target, safe_only, algorithm_name)
 
-                if algorithm_name == "bfs":
-                    path, nodes = SearchAlgorithms.bfs(*args)
-                elif algorithm_name == "dfs":
-                    path, nodes = SearchAlgorithms.dfs(*args)
-                else:
-                    path, nodes = SearchAlgorithms.a_star(*args)
-
-                if not path and safe_only:
-                    self.message = "Sem rota segura. Tentando risco..."
-                    args = (self.pos, target, self.kb, self.rows, self.cols, False)
-                    if algorithm_name == "bfs": path, nodes = SearchAlgorithms.bfs(*args)
-                    elif algorithm_name == "dfs": path, nodes = SearchAlgorithms.dfs(*args)
-                    else: path, nodes = SearchAlgorithms.a_star(*args)
+                    if not path and safe_only:
+                        self.message = "Sem rota segura. Tentando risco..."
+                        safe_only = False
+                        path, plan_nodes = self.plan(target, False, algorithm_name)
+                    nodes += plan_nodes
 
                 self.total_nodes += nodes
 
                 if path:
-                    self.path_queue = path
+                    self.path_queue.replace(path)
                     modo = "SEGURO" if safe_only else "ARRISCADO"
                     self.message = f"Indo p/ {target} ({modo}). Nós: {nodes}"
                 else:
@@ -163,10 +231,31 @@ class Agent:
             else:
                 self.message = "Exploração Finalizada."
 
+    def plan(self, target, safe_only, algorithm_name):
+        """
+        Busca um caminho até o alvo, reaproveitando o cache quando a KB
+        não mudou ao longo do caminho guardado. Acerto no cache não expande nós.
+        """
+        key = (self.pos, target, safe_only, algorithm_name)
+        cached = self.path_cache.get(key)
+        if cached is not None:
+            return list(cached), 0
+
+        if algorithm_name == "dstar":
+            if safe_only not in self.planners:
+                self.planners[safe_only] = DStarLite(self.rows, self.cols, safe_only)
+            path, nodes = self.planners[safe_only].plan(self.pos, target, self.kb)
+        else:
+            path, nodes = SearchAlgorithms.search(
+                algorithm_name, self.pos, target, self.kb, self.rows, self.cols, safe_only
+            )
+        self.path_cache.put(key, path, nodes)
+        return path, nodes
+
     def move(self):
         """Executa um passo físico no ambiente."""
         if self.path_queue and not self.game_over:
-            next_pos = self.path_queue.pop(0)
+            next_pos = self.path_queue.advance()
             dr = next_pos[0] - self.pos[0]
             dc = next_pos[1] - self.pos[1]
             move_action = (dr, dc)
@@ -174,15 +263,15 @@ class Agent:
             new_pos, percepts, dead = self.world.step(move_action)
 
             self.pos = new_pos
-            self.visited.add(self.pos)
+            self.mark_visited(self.pos)
             self.total_steps += 1
 
             if not dead:
-                self.kb[self.pos[0]][self.pos[1]] = 'SAFE'
+                self.set_status(self.pos, 'SAFE')
             else:
                 self.game_over = True
                 self.won = False
-                self.kb[self.pos[0]][self.pos[1]] = 'UNSAFE'
+                self.set_status(self.pos, 'UNSAFE')
                 self.message = "MORREU NO CAMINHO!"
 
             return move_action
@@ -0,0 +1,139 @@
+import numpy as np
+
+from src.core.environment import PERCEPT_TUPLES
+from src.utils.constants import PERCEPT_BRILHO, PERCEPT_BRISA, PERCEPT_FEDOR, PERCEPT_BATIDA
+
+
+# As mesmas tuplas de PERCEPT_TUPLES num array de objetos: indexar com um array
+# de máscaras devolve as tuplas de todos os mundos sem laço em Python
+PERCEPT_OBJECTS = np.empty(len(PERCEPT_TUPLES), dtype=object)
+PERCEPT_OBJECTS[:] = PERCEPT_TUPLES
+
+
+def decode_percepts(mask):
+    """Converte uma máscara de bits na tupla de percepções (mesma do WumpusEnvironment)."""
+    return PERCEPT_TUPLES[int(mask)]
+
+
+def neighbor_any(plane):
+    """
+    Para cada célula, indica se algum vizinho (Cima, Baixo, Esq, Dir) está marcado.
+    plane: array booleano (N, linhas, colunas).
+    """
+    out = np.zeros_like(plane)
+    out[:, 1:, :] |= plane[:, :-1, :]
+    out[:, :-1, :] |= plane[:, 1:, :]
+    out[:, :, 1:] |= plane[:, :, :-1]
+    out[:, :, :-1] |= plane[:, :, 1:]
+    return out
+
+
+class BatchedWumpusEnvironment:
+    """
+    N mundos de mesmo tamanho simulados em paralelo com NumPy.
+    Mesma interface do WumpusEnvironment (reset, get_percepts, step),
+    mas cada chamada atua em todos os mundos de uma vez: a entrada i de cada
+    retorno é o que o WumpusEnvironment do mundo i devolveria, inclusive as
+    tuplas de percepções (as mesmas de PERCEPT_TUPLES).
+    Para o caminho de alto volume, get_percept_masks/step_masks devolvem as
+    percepções como máscaras de bits (uint8) e não montam as tuplas.
+    """
+
+    def __init__(self, pits, wumpus, gold, start=None):
+        """
+        pits, wumpus, gold: arrays booleanos (N, linhas, colunas).
+        start: array (N, 2) com a posição inicial; padrão é o canto inferior esquerdo.
+        """
+        self.pits = np.asarray(pits, dtype=bool)
+        self.wumpus = np.asarray(wumpus, dtype=bool)
+        self.gold = np.asarray(gold, dtype=bool)
+        self.n, self.rows, self.cols = self.pits.shape
+
+        if start is None:
+            start = np.tile(np.array([self.rows - 1, 0], dtype=np.intp), (self.n, 1))
+        self.start = np.asarray(start, dtype=np.intp)
+
+        # Percepções pré-calculadas: uma máscara de bits por célula
+        self.percept_planes = (
+            self.gold * np.uint8(PERCEPT_BRILHO)
+            | neighbor_any(self.pits) * np.uint8(PERCEPT_BRISA)
+            | neighbor_any(self.wumpus) * np.uint8(PERCEPT_FEDOR)
+        ).astype(np.uint8)
+        self.deadly = self.pits | self.wumpus
+
+        self.index = np.arange(self.n)
+        self.agent_pos = self.start.copy()
+        self.game_over = np.zeros(self.n, dtype=bool)
+        self.dead = np.zeros(self.n, dtype=bool)
+        self.found_gold = np.zeros(self.n, dtype=bool)
+
+    @classmethod
+    def from_layouts(cls, layouts):
+        """Cria o lote a partir de mapas no formato do WumpusEnvironment ('.', 'P', 'W', 'G', 'A')."""
+        grid = np.array([[list(row) for row in layout] for layout in layouts])
+        start = None
+        agent = grid == 'A'
+        if agent.any():
+            n, rows, _ = grid.shape
+            start = np.tile(np.array([rows - 1, 0], dtype=np.intp), (n, 1))
+            w, r, c = np.nonzero(agent)
+            start[w] = np.stack([r, c], axis=1)
+        return cls(grid == 'P', grid == 'W', grid == 'G', start)
+
+    def reset(self, mask=None):
+        """
+        Reinicia os mundos (todos, ou só os marcados em mask).
+        Retorna as posições dos agentes.
+        """
+        if mask is None:
+            mask = slice(None)
+        self.agent_pos[mask] = self.start[mask]
+        self.game_over[mask] = False
+        self.dead[mask] = False
+        self.found_gold[mask] = False
+        return self.agent_pos.copy()
+
+    def get_percept_masks(self, positions=None):
+        """Retorna a máscara de percepções (uint8, N) na posição de cada agente."""
+        if positions is None:
+            positions = self.agent_pos
+        return self.percept_planes[self.index, positions[:, 0], positions[:, 1]]
+
+    def get_percepts(self, positions=None):
+        """Retorna as N tuplas de percepções, ex.: ('Brisa', 'Fedor'), como no WumpusEnvironment."""
+        return PERCEPT_OBJECTS[self.get_percept_masks(positions)]
+
+    def step(self, actions):
+        """
+        Executa um movimento em cada mundo.
+        actions: array (N, 2) com (dr, dc).
+        Retorna (posições, percepções, game_over), todos com N entradas; as
+        percepções são as tuplas do WumpusEnvironment.
+        """
+        positions, masks, game_over = self.step_masks(actions)
+        return positions, PERCEPT_OBJECTS[masks], game_over
+
+    def step_masks(self, actions):
+        """
+        Como step, mas com as percepções em máscaras de bits (uint8, N).
+        Mundos já encerrados não se movem e não percebem nada.
+        """
+        actions = np.asarray(actions, dtype=np.intp)
+        target = self.agent_pos + actions
+
+        inside = ((target[:, 0] >= 0) & (target[:, 0] < self.rows)
+                  & (target[:, 1] >= 0) & (target[:, 1] < self.cols))
+        active = ~self.game_over
+        moving = active & inside
+
+        self.agent_pos[moving] = target[moving]
+        percepts = np.where(moving, self.get_percept_masks(), np.uint8(0)).astype(np.uint8)
+        percepts[active & ~inside] = PERCEPT_BATIDA
+
+        r, c = self.agent_pos[:, 0], self.agent_pos[:, 1]
+        died = moving & self.deadly[self.index, r, c]
+        self.found_gold |= moving & self.gold[self.index, r, c]
+        self.dead |= died
+        self.game_over |= died
+
+        return self.agent_pos.copy(), percepts, self.game_over.copy()
@@ -1,4 +1,30 @@
-from src.utils.constants import ROWS, COLS
+from functools import lru_cache
+from src.utils.constants import (
+    ROWS, COLS, PERCEPT_BRILHO, PERCEPT_BRISA, PERCEPT_FEDOR, PERCEPT_BATIDA, PERCEPT_NAMES
+)
+
+# Tupla de percepções para cada máscara de bits (compartilhadas, nunca realocadas)
+PERCEPT_TUPLES = tuple(
+    tuple(name for bit, name in PERCEPT_NAMES if mask & bit)
+    for mask in range(PERCEPT_BATIDA * 2)
+)
+
+
+@lru_cache(maxsize=8)
+def adjacency_table(rows, cols):
+    """Tabela [r][c] -> tupla de vizinhos válidos (Cima, Baixo, Esq, Dir), compartilhada por dimensão."""
+    table = []
+    for r in range(rows):
+        line = []
+        for c in range(cols):
+            adj = []
+            if r > 0: adj.append((r - 1, c))
+            if r < rows - 1: adj.append((r + 1, c))
+            if c > 0: adj.append((r, c - 1))
+            if c < cols - 1: adj.append((r, c + 1))
+            line.append(tuple(adj))
+        table.append(tuple(line))
+    return tuple(table)
 
 
 class WumpusEnvironment:
@@ -10,9 +36,11 @@ class WumpusEnvironment:
         self.rows = ROWS
         self.cols = COLS
 
-        self.agent_pos = (3, 0)
+        self.start_pos = (ROWS - 1, 0)
+        self.agent_pos = self.start_pos
         self.gold_pos = None
         self.wumpus_pos = None
+        self.wumpus_list = []
         self.pits = []
 
         self.game_over = False
@@ -32,80 +60,104 @@ class WumpusEnvironment:
             ['.', '.', '.', '.'],
             ['.', '.', 'P', '.']
         ]
+        self.rows = len(self.grid)
+        self.cols = len(self.grid[0])
         self.scan_grid()
 
     def load_custom_map(self, layout):
-        # Mapa customizado, para implementações futuras
-        self.grid = layout
+        # Mapa customizado: lista de linhas (strings ou listas de caracteres).
+        # O grid é copiado, então o mesmo layout pode ser reaproveitado.
+        self.grid = [list(row) for row in layout]
         self.rows = len(layout)
         self.cols = len(layout[0])
         self.scan_grid()
 
     def scan_grid(self):
-        """Varre o grid para guardar as coordenadas de tudo."""
+        """
+        Varre o grid para guardar as coordenadas de tudo.
+        A entrada/saída é o 'A' do mapa ou, se não houver, o canto inferior esquerdo.
+        """
         self.pits = []
+        self.gold_pos = None
+        self.wumpus_pos = None
+        self.wumpus_list = []
+        self.start_pos = (self.rows - 1, 0)
         for r in range(self.rows):
             for c in range(self.cols):
                 item = self.grid[r][c]
                 if item == 'W':
-                    self.wumpus_pos = (r, c)
+                    self.wumpus_list.append((r, c))
+                    if self.wumpus_pos is None:
+                        self.wumpus_pos = (r, c)
                 elif item == 'G':
                     self.gold_pos = (r, c)
                 elif item == 'P':
                     self.pits.append((r, c))
                 elif item == 'A':
-                    self.agent_pos = (r, c)
+                    self.start_pos = (r, c)
                     self.grid[r][c] = '.'
+        self.agent_pos = self.start_pos
+        self.build_percept_masks()
+
+    def build_percept_masks(self):
+        """
+        Pré-calcula a máscara de percepções de cada célula (grid plano, 1 byte por célula).
+        Só percorre os perigos e o ouro, então custa O(itens), não O(células).
+        Deve ser chamado de novo se o grid for alterado.
+        """
+        rows, cols = self.rows, self.cols
+        masks = bytearray(rows * cols)
+
+        def mark_neighbors(pos, bit):
+            r, c = pos
+            if r > 0: masks[(r - 1) * cols + c] |= bit
+            if r < rows - 1: masks[(r + 1) * cols + c] |= bit
+            if c > 0: masks[r * cols + c - 1] |= bit
+            if c < cols - 1: masks[r * cols + c + 1] |= bit
+
+        for pit in self.pits:
+            mark_neighbors(pit, PERCEPT_BRISA)
+        for wumpus in self.wumpus_list:
+            mark_neighbors(wumpus, PERCEPT_FEDOR)
+        if self.gold_pos:
+            masks[self.gold_pos[0] * cols + self.gold_pos[1]] |= PERCEPT_BRILHO
+
+        self.percept_masks = masks
 
     def reset(self):
+        self.agent_pos = self.start_pos
         self.game_over = False
         self.won = False
         self.message = "Jogo Iniciado"
         return self.agent_pos
 
     def get_adjacents(self, r, c):
-        """Retorna lista de coordenadas vizinhas válidas (Cima, Baixo, Esq, Dir)."""
-        adj = []
-        if r > 0: adj.append((r - 1, c))
-        if r < self.rows - 1: adj.append((r + 1, c))
-        if c > 0: adj.append((r, c - 1))
-        if c < self.cols - 1: adj.append((r, c + 1))
-        return adj
+        """Retorna as coordenadas vizinhas válidas (Cima, Baixo, Esq, Dir)."""
+        return adjacency_table(self.rows, self.cols)[r][c]
+
+    def get_percept_mask(self, pos):
+        """Retorna as percepções da posição como bits (PERCEPT_*). O(1), sem alocação."""
+        return self.percept_masks[pos[0] * self.cols + pos[1]]
 
     def get_percepts(self, pos):
         """
         Retorna o que o agente sente na posição atual.
+        Tupla compartilhada e ordenada, ex.: ('Brisa', 'Fedor').
         """
-        r, c = pos
-        percepts = set()
-
-        # 1. Verifica Ouro
-        if self.grid[r][c] == 'G':
-            percepts.add("Brilho")
-
-        # 2. Verifica vizinhos (Brisa, Fedor)
-        adjacentes = self.get_adjacents(r, c)
-        for (nr, nc) in adjacentes:
-            vizinho = self.grid[nr][nc]
-            if vizinho == 'P':
-                percepts.add("Brisa")
-            elif vizinho == 'W':
-                percepts.add("Fedor")
-
-        return sorted(list(percepts))
+        return PERCEPT_TUPLES[self.percept_masks[pos[0] * self.cols + pos[1]]]
 
     def step(self, action):
         """
         Executa um movimento e retorna (nova_pos, percepts, game_over).
         """
         if self.game_over:
-            return self.agent_pos, [], True
+            return self.agent_pos, PERCEPT_TUPLES[0], True
 
         dr, dc = action
         nr, nc = self.agent_pos[0] + dr, self.agent_pos[1] + dc
 
         if not (0 <= nr < self.rows and 0 <= nc < self.cols):
-            return self.agent_pos, ["Batida"], False
+            return self.agent_pos, PERCEPT_TUPLES[PERCEPT_BATIDA], False
 
         self.agent_pos = (nr, nc)
         current_cell = self.grid[nr][nc]
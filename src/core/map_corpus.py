@@ -0,0 +1,224 @@
+"""
+Formato binário para coleções de mapas (.wmc).
+
+Cabeçalho fixo (28 bytes):  magic 'WMPC', versão, linhas, colunas, 2 bytes de
+preenchimento, quantidade e seed base.
+Cada mapa ocupa um registro de tamanho fixo, o que permite acesso O(1) por índice:
+    seed (u64), linha/coluna da entrada (u16, u16), flags (u8, bit 0 = solucionável),
+    3 bytes de preenchimento, e os planos de bits de poço, Wumpus e ouro
+    (1 bit por célula, em ordem de linha, bit menos significativo primeiro).
+"""
+import mmap
+import struct
+from collections import namedtuple
+
+MAGIC = b"WMPC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHxxQq")
+RECORD_HEADER = struct.Struct("<QHHBxxx")
+FLAG_SOLVABLE = 1
+
+MapRecord = namedtuple("MapRecord", "seed start solvable pits wumpus gold")
+
+
+def plane_size(rows, cols):
+    return (rows * cols + 7) // 8
+
+
+def record_size(rows, cols):
+    return RECORD_HEADER.size + 3 * plane_size(rows, cols)
+
+
+def pack_layout(layout):
+    """Converte um layout (lista de linhas) nos três planos de bits e na entrada."""
+    rows, cols = len(layout), len(layout[0])
+    size = plane_size(rows, cols)
+    planes = {'P': bytearray(size), 'W': bytearray(size), 'G': bytearray(size)}
+    start = (rows - 1, 0)
+    for r, row in enumerate(layout):
+        for c, item in enumerate(row):
+            if item in planes:
+                idx = r * cols + c
+                planes[item][idx >> 3] |= 1 << (idx & 7)
+            elif item == 'A':
+                start = (r, c)
+    return start, planes['P'], planes['W'], planes['G']
+
+
+class MapCorpusWriter:
+    """Grava mapas em sequência; a quantidade no cabeçalho é atualizada ao fechar."""
+
+    def __init__(self, path, rows, cols, seed=0):
+        self.rows = rows
+        self.cols = cols
+        self.seed = seed
+        self.count = 0
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, rows, cols, 0, seed))
+
+    def append(self, layout, seed=0, solvable=True):
+        if len(layout) != self.rows or len(layout[0]) != self.cols:
+            raise ValueError("Todos os mapas do arquivo devem ter as mesmas dimensões.")
+        start, pits, wumpus, gold = pack_layout(layout)
+        flags = FLAG_SOLVABLE if solvable else 0
+        self.file.write(RECORD_HEADER.pack(seed, start[0], start[1], flags))
+        self.file.write(pits)
+        self.file.write(wumpus)
+        self.file.write(gold)
+        self.count += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.rows, self.cols, self.count, self.seed))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_corpus(path, items, rows, cols, seed=0):
+    """Grava os itens do map_generator.generate_maps (consumidos sob demanda)."""
+    with MapCorpusWriter(path, rows, cols, seed) as writer:
+        for item in items:
+            writer.append(item["mapa"], item["seed"], item["solucionavel"])
+        return writer.count
+
+
+class MapCorpus:
+    """
+    Leitor de arquivos .wmc via memória mapeada.
+    Abrir é instantâneo e só as páginas dos mapas acessados são lidas do disco.
+    Também funciona como dicionário {str(índice): layout}, para uso no farm.
+
+    Só get() e records() dão acesso sem cópia; layout(), environment() e
+    batch() montam estruturas novas (texto ou arrays desempacotados) a partir
+    dos registros.
+
+    Registros de get() e arrays de records() apontam para o arquivo mapeado e
+    continuam válidos enquanto existirem, mesmo depois de close(): se ainda
+    houver algum vivo, o mapeamento só é desfeito quando o último for coletado.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._open()
+
+    def _open(self):
+        with open(self.path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.rows, self.cols, self.count, self.seed = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Arquivo de mapas inválido: {self.path}")
+        self.plane = plane_size(self.rows, self.cols)
+        self.record = record_size(self.rows, self.cols)
+        self.view = memoryview(self.mm)
+
+    # O mmap não é serializável: ao ir para outro processo, só o caminho é enviado
+    def __getstate__(self):
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.path = state["path"]
+        self._open()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return (str(i) for i in range(self.count))
+
+    def __getitem__(self, key):
+        return self.layout(int(key))
+
+    def _offset(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return HEADER.size + index * self.record
+
+    def get(self, index):
+        """Registro do mapa com os planos como memoryview (sem cópia)."""
+        off = self._offset(index)
+        seed, sr, sc, flags = RECORD_HEADER.unpack_from(self.mm, off)
+        off += RECORD_HEADER.size
+        p = self.plane
+        return MapRecord(seed, (sr, sc), bool(flags & FLAG_SOLVABLE),
+                         self.view[off:off + p],
+                         self.view[off + p:off + 2 * p],
+                         self.view[off + 2 * p:off + 3 * p])
+
+    def layout(self, index):
+        """Reconstrói o layout em texto (formato do WumpusEnvironment)."""
+        rec = self.get(index)
+        grid = [['.'] * self.cols for _ in range(self.rows)]
+        for plane, item in ((rec.pits, 'P'), (rec.wumpus, 'W'), (rec.gold, 'G')):
+            for byte_idx, byte in enumerate(plane):
+                while byte:
+                    low = byte & -byte
+                    idx = (byte_idx << 3) + low.bit_length() - 1
+                    grid[idx // self.cols][idx % self.cols] = item
+                    byte ^= low
+        grid[rec.start[0]][rec.start[1]] = 'A'
+        return [''.join(row) for row in grid]
+
+    def environment(self, index):
+        """WumpusEnvironment do mapa (carregado a partir do layout em texto, com cópia)."""
+        from src.core.environment import WumpusEnvironment
+        return WumpusEnvironment(self.layout(index))
+
+    def records(self, start=0, stop=None):
+        """
+        Registros [start, stop) como array estruturado do NumPy apontando
+        diretamente para o arquivo mapeado (sem cópia).
+        Os limites seguem as regras de fatia do Python: valores negativos
+        contam do fim, os que passam da quantidade são ajustados e start >= stop
+        devolve um array vazio.
+        """
+        import numpy as np  # Só o caminho em lote depende do NumPy
+
+        start, stop, _ = slice(start, stop).indices(self.count)
+        dtype = np.dtype([
+            ("seed", "<u8"), ("start_r", "<u2"), ("start_c", "<u2"), ("flags", "u1"), ("pad", "V3"),
+            ("pits", "u1", self.plane), ("wumpus", "u1", self.plane), ("gold", "u1", self.plane),
+        ])
+        return np.frombuffer(self.mm, dtype=dtype, count=max(stop - start, 0),
+                             offset=HEADER.size + start * self.record)
+
+    def batch(self, start=0, stop=None):
+        """
+        Cria um BatchedWumpusEnvironment com os mapas [start, stop) (limites
+        como em records()). Os planos de bits são desempacotados em arrays
+        booleanos novos, então o lote não depende mais do arquivo.
+        """
+        import numpy as np
+        from src.core.batched_environment import BatchedWumpusEnvironment
+
+        recs = self.records(start, stop)
+        cells = self.rows * self.cols
+
+        def unpack(field):
+            bits = np.unpackbits(recs[field], axis=1, count=cells, bitorder="little")
+            return bits.reshape(len(recs), self.rows, self.cols).astype(bool)
+
+        start_pos = np.stack([recs["start_r"], recs["start_c"]], axis=1).astype(np.intp)
+        return BatchedWumpusEnvironment(unpack("pits"), unpack("wumpus"), unpack("gold"), start_pos)
+
+    def close(self):
+        if self.mm is None:
+            return
+        self.view.release()  # fatias já entregues por get() continuam valendo
+        try:
+            self.mm.close()
+        except BufferError:
+            pass  # ainda há registros/arrays vivos: o mmap fecha quando forem coletados
+        self.view = self.mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,115 @@
+import argparse
+import json
+import random
+import sys
+from collections import deque
+
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def map_seed(seed, index):
+    """Seed individual do mapa: o mapa 'index' do lote 'seed' é sempre o mesmo."""
+    return (seed << 32) + index
+
+
+def is_solvable(grid, start, gold):
+    """
+    Verifica se existe caminho da entrada até o ouro sem passar por poço ou Wumpus
+    (ou seja, um agente que conhecesse o mapa conseguiria vencer).
+    """
+    if gold is None:
+        return False
+    rows, cols = len(grid), len(grid[0])
+    queue = deque([start])
+    seen = {start}
+    while queue:
+        r, c = queue.popleft()
+        if (r, c) == gold:
+            return True
+        for dr, dc in DIRECTIONS:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols and (nr, nc) not in seen and grid[nr][nc] not in 'PW':
+                seen.add((nr, nc))
+                queue.append((nr, nc))
+    return False
+
+
+def generate_map(rows=4, cols=4, pit_prob=0.2, wumpus_count=1, seed=0, start=None):
+    """
+    Gera um mapa aleatório reprodutível.
+    A entrada nunca tem perigo; poços são sorteados célula a célula com
+    probabilidade pit_prob, depois os Wumpus e o ouro em células livres.
+    Retorna (layout, solucionável), com o layout como lista de strings
+    no formato do WumpusEnvironment ('A' marca a entrada).
+    """
+    rng = random.Random(seed)
+    if start is None:
+        start = (rows - 1, 0)
+
+    grid = [['P' if rng.random() < pit_prob else '.' for _ in range(cols)] for _ in range(rows)]
+    grid[start[0]][start[1]] = 'A'
+
+    free = [(r, c) for r in range(rows) for c in range(cols) if grid[r][c] == '.']
+    picks = rng.sample(free, min(len(free), wumpus_count + 1))
+    gold = picks.pop() if picks else None
+    for r, c in picks:
+        grid[r][c] = 'W'
+    if gold:
+        grid[gold[0]][gold[1]] = 'G'
+
+    layout = [''.join(row) for row in grid]
+    return layout, is_solvable(grid, start, gold)
+
+
+def generate_maps(count, rows=4, cols=4, pit_prob=0.2, wumpus_count=1, seed=0,
+                  only_solvable=False, max_attempts=1000):
+    """
+    Gera mapas sob demanda (um de cada vez, nunca todos em memória).
+    Cada item é um dicionário {indice, seed, solucionavel, mapa}.
+    Com only_solvable=True, mapas sem solução são descartados e a seed
+    seguinte é tentada, mantendo a reprodutibilidade.
+    """
+    attempt = 0
+    for index in range(count):
+        for _ in range(max_attempts):
+            s = map_seed(seed, attempt)
+            attempt += 1
+            layout, solvable = generate_map(rows, cols, pit_prob, wumpus_count, s)
+            if solvable or not only_solvable:
+                break
+        else:
+            raise ValueError("Nenhum mapa solucionável encontrado; reduza a densidade de poços.")
+        yield {"indice": index, "seed": s, "solucionavel": solvable, "mapa": layout}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gerador de mapas do Mundo de Wumpus (JSON Lines).")
+    parser.add_argument("-n", "--quantidade", type=int, default=1)
+    parser.add_argument("-l", "--linhas", type=int, default=4)
+    parser.add_argument("-c", "--colunas", type=int, default=4)
+    parser.add_argument("-p", "--pocos", type=float, default=0.2, help="Probabilidade de poço por célula")
+    parser.add_argument("-w", "--wumpus", type=int, default=1, help="Quantidade de Wumpus")
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("--solucionaveis", action="store_true", help="Descarta mapas sem solução")
+    parser.add_argument("-o", "--saida", help="Arquivo de saída (padrão: stdout); .wmc grava em formato binário")
+    args = parser.parse_args(argv)
+
+    maps = generate_maps(args.quantidade, args.linhas, args.colunas, args.pocos,
+                         args.wumpus, args.seed, args.solucionaveis)
+
+    if args.saida and args.saida.endswith(".wmc"):
+        from src.core.map_corpus import write_corpus
+        write_corpus(args.saida, maps, args.linhas, args.colunas, args.seed)
+        return
+
+    out = open(args.saida, "w", encoding="utf-8") if args.saida else sys.stdout
+    try:
+        for item in maps:
+            out.write(json.dumps(item) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
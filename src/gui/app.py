@@ -0,0 +1,86 @@
+import os
+import time
+
+import pygame
+
+from src.gui.text_cache import TEXT_CACHE
+
+
+class App:
+    """
+    Contexto único da aplicação gráfica, compartilhado por menu, jogo e relatório.
+
+    Cada subsistema do pygame é iniciado uma vez só, e só quando alguém
+    precisa dele: vídeo e fontes ao abrir a primeira tela, o mixer só se o
+    som estiver ligado (nunca no modo mudo nem sem vídeo de verdade).
+    pygame.init() não é usado, pois ele abriria o áudio mesmo sem uso.
+    A janela é uma só: trocar de tela reaproveita a superfície quando o
+    tamanho é o mesmo.
+
+    Também mede a abertura: mark() registra etapas desde a criação do
+    contexto e report() devolve o relatório de tempos.
+    """
+
+    def __init__(self, muted=False, started=None):
+        # 'started' permite contar também a importação dos módulos (ex.: pygame)
+        self.started = time.perf_counter() if started is None else started
+        self.headless = os.environ.get("SDL_VIDEODRIVER") == "dummy"
+        self.muted = muted or self.headless
+        self.surface = None
+        self.marks = []  # (etapa, ms desde o início)
+        self.mark("contexto")
+
+    def ticks(self):
+        """Milissegundos desde o início (substitui pygame.time.get_ticks, que exige pygame.init)."""
+        return (time.perf_counter() - self.started) * 1000
+
+    def mark(self, label):
+        """Registra uma etapa da abertura (a primeira ocorrência de cada rótulo vale)."""
+        if not any(name == label for name, _ in self.marks):
+            self.marks.append((label, self.ticks()))
+
+    def video(self):
+        """Inicia vídeo e fontes, se ainda não estiverem ativos."""
+        if not pygame.display.get_init():
+            pygame.display.init()
+            self.mark("vídeo")
+        if not pygame.font.get_init():
+            pygame.font.init()
+            self.mark("fontes")
+
+    def audio(self):
+        """Inicia o mixer se o som estiver ligado. Retorna se há áudio disponível."""
+        if self.muted:
+            return False
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init(frequency=44100, size=-16, channels=8, buffer=2048)
+            except pygame.error as e:
+                print(f"AVISO: áudio indisponível: {e}")
+                self.muted = True
+                return False
+            self.mark("mixer")
+        return True
+
+    def screen(self, size, caption):
+        """Superfície da janela no tamanho pedido; só recria o modo de vídeo se o tamanho mudou."""
+        self.video()
+        if self.surface is None or self.surface.get_size() != tuple(size):
+            self.surface = pygame.display.set_mode(size)
+        pygame.display.set_caption(caption)
+        return self.surface
+
+    def close(self):
+        """Encerra o pygame; fontes e textos em cache deixam de valer."""
+        TEXT_CACHE.clear()
+        self.surface = None
+        pygame.quit()
+
+    def report(self):
+        """Relatório de tempos da abertura, uma etapa por linha."""
+        lines = ["Tempos de abertura (ms desde o início):"]
+        last = 0.0
+        for label, ms in self.marks:
+            lines.append(f"  {label:<18} {ms:8.1f}  (+{ms - last:.1f})")
+            last = ms
+        return "\n".join(lines)
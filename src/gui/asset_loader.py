@@ -1,4 +1,8 @@
+import json
 import os
+import threading
+from collections.abc import Mapping
+
 import pygame
 from src.utils.constants import CELL_SIZE
 
@@ -54,27 +58,189 @@ def load_image(key, width=CELL_SIZE, height=CELL_SIZE):
         print(f"ERRO ao carregar {key}: {e}")
         return pygame.Surface((width, height))
 
+# -------------------------------------------------------
+#  ATLAS DE SPRITES (pré-redimensionado, cacheado em disco)
+# -------------------------------------------------------
+SPRITE_KEYS = (
+    "GROUND", "PIT", "GOLD", "WUMPUS", "UNEXPLORED",
+    "AGENT_UP", "AGENT_DOWN", "AGENT_LEFT", "AGENT_RIGHT",
+)
+
+CACHE_DIR = os.path.join(ROOT_DIR, ".cache", "sprites")
+
+
+def source_stamps():
+    """mtime (ns) de cada imagem de origem; None se o arquivo não existe."""
+    stamps = {}
+    for key in SPRITE_KEYS:
+        path = ASSET_PATHS.get(key)
+        stamps[key] = os.stat(path).st_mtime_ns if path and os.path.exists(path) else None
+    return stamps
+
+
+def build_atlas(size):
+    """Carrega e redimensiona cada sprite numa faixa horizontal (um tile size x size por chave)."""
+    atlas = pygame.Surface((size * len(SPRITE_KEYS), size), pygame.SRCALPHA)
+    for i, key in enumerate(SPRITE_KEYS):
+        atlas.blit(load_image(key, size, size), (i * size, 0))
+    return atlas
+
+
+def load_atlas(size, cache_dir=CACHE_DIR):
+    """
+    Retorna o atlas para o tamanho de célula pedido.
+    O atlas fica em disco como pixels RGBA crus (sem PNG para decodificar),
+    com um manifesto que guarda o mtime de cada imagem de origem; se alguma
+    mudou, o atlas é refeito. Sem alguma imagem, o atlas não é gravado.
+    """
+    stamps = source_stamps()
+    pixels_path = os.path.join(cache_dir, f"atlas_{size}.rgba")
+    manifest_path = os.path.join(cache_dir, f"atlas_{size}.json")
+    shape = (size * len(SPRITE_KEYS), size)
+
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest == {"ordem": list(SPRITE_KEYS), "fontes": stamps}:
+            with open(pixels_path, "rb") as f:
+                return pygame.image.frombytes(f.read(), shape, "RGBA")
+    except (OSError, ValueError):
+        pass
+
+    atlas = build_atlas(size)
+    if None not in stamps.values():
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Grava em arquivos temporários e troca de uma vez: nunca fica um atlas pela metade
+            with open(pixels_path + ".tmp", "wb") as f:
+                f.write(pygame.image.tobytes(atlas, "RGBA"))
+            with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"ordem": list(SPRITE_KEYS), "fontes": stamps}, f)
+            os.replace(pixels_path + ".tmp", pixels_path)
+            os.replace(manifest_path + ".tmp", manifest_path)
+        except OSError as e:
+            print(f"AVISO: não foi possível gravar o cache de sprites: {e}")
+    return atlas
+
+
+class SpriteAtlas(Mapping):
+    """
+    Sprites do jogo como um dicionário somente leitura ("GROUND", "AGENT_UP", ...).
+    Nada é carregado até o primeiro acesso; aí o atlas inteiro vem do cache
+    em disco (ou é montado) e cada sprite é uma subsuperfície dele.
+    "AGENT" é um apelido de "AGENT_UP".
+    """
+
+    def __init__(self, size=CELL_SIZE, cache_dir=CACHE_DIR):
+        self.size = size
+        self.cache_dir = cache_dir
+        self.sprites = None
+
+    def load(self):
+        if self.sprites is None:
+            atlas = load_atlas(self.size, self.cache_dir)
+            if pygame.display.get_surface() is not None:
+                atlas = atlas.convert_alpha()
+            size = self.size
+            self.sprites = {key: atlas.subsurface((i * size, 0, size, size))
+                            for i, key in enumerate(SPRITE_KEYS)}
+            self.sprites["AGENT"] = self.sprites["AGENT_UP"]
+        return self.sprites
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+
 # -------------------------------------------------------
 #  CARREGAR TODOS OS ASSETS
 # -------------------------------------------------------
-def load_all_assets():
+def load_all_assets(size=CELL_SIZE):
     """
-    Retorna um dicionário com todas as imagens já carregadas.
+    Retorna um dicionário com todas as imagens,
+    redimensionadas para o tamanho de célula informado.
+    O carregamento só acontece no primeiro uso (ver SpriteAtlas).
     """
-    assets = {}
+    return SpriteAtlas(size)
 
-    assets["GROUND"] = load_image("GROUND")
-    assets["PIT"] = load_image("PIT")
-    assets["GOLD"] = load_image("GOLD")
-    assets["WUMPUS"] = load_image("WUMPUS")
 
-    if "UNEXPLORED" in ASSET_PATHS:
-        assets["UNEXPLORED"] = load_image("UNEXPLORED")
+# -------------------------------------------------------
+#  SONS (decodificados em segundo plano)
+# -------------------------------------------------------
+# nome -> (chave em ASSET_PATHS, volume)
+SOUNDS = {
+    "gold": ("SND_GOLD", 1.0),
+    "breeze": ("SND_BREEZE", 0.5),
+    "stench": ("SND_STENCH", 0.5),
+}
+
+
+class SoundBank:
+    """
+    Efeitos sonoros decodificados numa thread de fundo, para não travar a
+    abertura do jogo. Enquanto um som não terminou de carregar (ou se o
+    arquivo não existe), play() não toca nada e retorna False.
+    """
 
-    assets["AGENT_UP"] = load_image("AGENT_UP")
-    assets["AGENT_DOWN"] = load_image("AGENT_DOWN")
-    assets["AGENT_LEFT"] = load_image("AGENT_LEFT")
-    assets["AGENT_RIGHT"] = load_image("AGENT_RIGHT")
-    assets["AGENT"] = assets["AGENT_UP"]
+    def __init__(self, sounds=SOUNDS):
+        self.specs = sounds
+        self.sounds = {}
+        self.thread = None
 
-    return assets
\ No newline at end of file
+    def start(self):
+        """Começa a decodificar (só se o mixer estiver ativo). Retorna o próprio banco."""
+        if self.thread is None and pygame.mixer.get_init():
+            self.thread = threading.Thread(target=self._load, name="sons", daemon=True)
+            self.thread.start()
+        return self
+
+    def _load(self):
+        for name, (key, volume) in self.specs.items():
+            path = ASSET_PATHS.get(key)
+            if not path or not os.path.exists(path):
+                print(f"AVISO: Som não encontrado em: {path}")
+                continue
+            try:
+                sound = pygame.mixer.Sound(path)
+            except pygame.error as e:
+                print(f"Erro ao carregar som {name}: {e}")
+                continue
+            sound.set_volume(volume)
+            self.sounds[name] = sound
+
+    def wait(self, timeout=None):
+        """Espera a decodificação terminar."""
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def play(self, name, loops=0):
+        sound = self.sounds.get(name)
+        if sound is None:
+            return False
+        sound.play(loops=loops)
+        return True
+
+    def stop(self, name):
+        sound = self.sounds.get(name)
+        if sound is not None:
+            sound.stop()
+
+
+def play_music(key, loops=-1):
+    """Toca uma música em streaming (não decodifica o arquivo inteiro antes)."""
+    path = ASSET_PATHS.get(key)
+    if not path or not os.path.exists(path):
+        print(f"AVISO: Música não encontrada em: {path}")
+        return False
+    try:
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.play(loops)
+    except pygame.error as e:
+        print(f"Erro ao tocar música: {e}")
+        return False
+    return True
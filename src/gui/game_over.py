@@ -1,5 +1,7 @@
 import pygame
 import sys
+from src.gui.app import App
+from src.gui.text_cache import TEXT_CACHE
 from src.utils.constants import WHITE, BLACK, GREEN, RED, BLUE
 
 WIDTH, HEIGHT = 500, 450
@@ -11,18 +13,17 @@ class GameOverScreen:
     Exibe o resultado (Vitória/Derrota) e as métricas coletadas pelo agente.
     """
 
-    def __init__(self, metrics):
+    def __init__(self, metrics, app=None):
         self.metrics = metrics
-        pygame.init()
-        pygame.display.set_caption("Fim de Jogo")
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.app = app or App()
+        self.screen = self.app.screen((WIDTH, HEIGHT), "Fim de Jogo")
 
-        self.title_font = pygame.font.SysFont("arial", 40, bold=True)
-        self.text_font = pygame.font.SysFont("arial", 22)
-        self.btn_font = pygame.font.SysFont("arial", 20, bold=True)
+        self.title_font = TEXT_CACHE.font("arial", 40, bold=True)
+        self.text_font = TEXT_CACHE.font("arial", 22)
+        self.btn_font = TEXT_CACHE.font("arial", 20, bold=True)
 
     def draw_text(self, text, font, color, y_pos):
-        surf = font.render(text, True, color)
+        surf = TEXT_CACHE.render(font, text, color)
         rect = surf.get_rect(center=(WIDTH // 2, y_pos))
         self.screen.blit(surf, rect)
 
@@ -32,7 +33,7 @@ class GameOverScreen:
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
+                    self.app.close()
                     sys.exit()
 
                 # Se clicar em qualquer lugar ou apertar tecla, fecha o jogo
@@ -57,7 +58,7 @@ class GameOverScreen:
                 f"Pontuação Final: {self.metrics['score']}",
                 f"Nós Expandidos: {self.metrics['nos']}",
                 f"Custo do Caminho (Passos): {self.metrics['custo']}",
-                f"Tempo de Execução: {self.metrics['tempo']}"
+                f"Tempo de Execução: {self.metrics['tempo']:.2f}s"
             ]
 
             start_y = 120
@@ -71,4 +72,5 @@ class GameOverScreen:
             self.draw_text("Pressione qualquer tecla para sair...", self.btn_font, BLUE, 400)
 
             pygame.display.flip()
+            self.app.mark("relatório")
             clock.tick(30)
\ No newline at end of file
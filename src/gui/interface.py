@@ -1,162 +1,259 @@
 import pygame
 import sys
 import time
-from src.gui.asset_loader import load_all_assets, ASSET_PATHS
-from src.core.environment import WumpusEnvironment
+from src.gui.app import App
+from src.gui.asset_loader import load_all_assets, play_music, SoundBank
+from src.core.environment import WumpusEnvironment, PERCEPT_TUPLES
 from src.agent.player import Agent
 from src.gui.game_over import GameOverScreen
+from src.gui.scheduler import FixedStepScheduler, SPEEDS
+from src.gui.text_cache import TEXT_CACHE
+from src.simulation.runner import build_metrics
+from src.utils.profiler import Profiler
 from src.utils.constants import (
-    CELL_SIZE, ROWS, COLS, WIDTH, HEIGHT, HUD_HEIGHT,
+    CELL_SIZE, WIDTH, HUD_HEIGHT, MAX_BOARD_SIZE, MIN_LABEL_CELL,
     GRAY, BG_COLOR, TEXT_COLOR, PERCEPTION_COLOR,
-    MOVE_DELAY, BLACK
+    MOVE_DELAY, FPS, GAME_OVER_DELAY, BLACK, PERCEPT_BRILHO
 )
 
+# Teclas 1-4 escolhem a velocidade da simulação (1x, 10x, 1000x, máxima)
+SPEED_KEYS = dict(zip((pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4), SPEEDS))
+
 class MundoWumpusGUI:
-    def __init__(self, search_method):
+    def __init__(self, search_method, layout=None, speed=1, sounds=None, app=None, profile=False, trace=None):
         self.search_method = search_method
 
-        pygame.init()
-        pygame.font.init()
-        pygame.mixer.init(frequency=44100, size=-16, channels=8, buffer=2048)
-
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption(f"Wumpus World AI - {search_method.upper()}")
-
-        self.font_info = pygame.font.SysFont("arial", 16)
-        self.font_percept = pygame.font.SysFont("arial", 12, bold=True)
-
-        self.images = load_all_assets()
+        self.world = WumpusEnvironment(layout)
+        self.agent = Agent(self.world)
 
-        self.sfx = {}
-        try:
-            self.sfx['gold'] = pygame.mixer.Sound(ASSET_PATHS["SND_GOLD"])
-            self.sfx['breeze'] = pygame.mixer.Sound(ASSET_PATHS["SND_BREEZE"])
-            self.sfx['stench'] = pygame.mixer.Sound(ASSET_PATHS["SND_STENCH"])
-            self.sfx['breeze'].set_volume(0.5)
-            self.sfx['stench'].set_volume(0.5)
-        except Exception as e:
-            print(f"Erro ao carregar sons: {e}")
+        # Rastro da partida (TraceWriter), gravado a cada passo
+        self.trace = trace
+        if trace:
+            trace.begin(self.agent, search_method)
+        self.rows = self.world.rows
+        self.cols = self.world.cols
+
+        # Mapas grandes: as células encolhem para o tabuleiro caber na tela
+        self.cell_size = max(1, min(CELL_SIZE, MAX_BOARD_SIZE // max(self.rows, self.cols)))
+        self.board_height = self.rows * self.cell_size
+        self.width = max(WIDTH, self.cols * self.cell_size)
+
+        # Subsistemas do pygame e a janela vêm do contexto único da aplicação
+        self.app = app or App()
+        self.app.audio()
+        self.screen = self.app.screen((self.width, self.board_height + HUD_HEIGHT),
+                                      f"Wumpus World AI - {search_method.upper()}")
+
+        self.font_info = TEXT_CACHE.font("arial", 16)
+        self.font_percept = TEXT_CACHE.font("arial", 12, bold=True)
+
+        self.images = load_all_assets(self.cell_size)
+
+        # Renderização retida: fundo estático + uma superfície por célula,
+        # refeita só quando a chave da célula (cell_key) muda
+        self.background = self.build_background()
+        self.start_label = None
+        if self.cell_size >= MIN_LABEL_CELL:
+            self.start_label = TEXT_CACHE.render(TEXT_CACHE.font("arial", 20, bold=True), "START", BLACK)
+        self.cell_surfaces = [None] * (self.rows * self.cols)
+        self.drawn_pos = self.agent.pos
+        self.moved_cells = set()  # células por onde o agente passou desde o último quadro
+        self.invalidate()
+
+        # Sons decodificados em segundo plano (o main já começa a carregá-los no menu)
+        self.sfx = sounds if sounds is not None else SoundBank().start()
 
         self.is_playing_breeze = False
         self.is_playing_stench = False
         self.gold_sound_played = False
         self.victory_music_started = False
 
-        self.world = WumpusEnvironment()
-        self.agent = Agent(self.world)
-
         self.agent_direction = "UP"
 
-        self.last_move_time = pygame.time.get_ticks()
-        self.move_delay = MOVE_DELAY
+        # Um passo do agente a cada MOVE_DELAY (em 1x); o desenho é limitado a FPS à parte
+        self.scheduler = FixedStepScheduler(MOVE_DELAY, speed, 1000 / FPS)
 
         self.start_time = time.time()
         self.end_time = None
 
+        # Perfil por fase (F3 liga e mostra o overlay); desligado não custa nada
+        self.profiler = None
+        self.show_overlay = False
+        if profile:
+            self.enable_profiler()
+
     def process_audio(self):
-        """Gerencia os sons baseado nas percepções."""
+        """Gerencia os sons baseado nas percepções (sons ainda não carregados são ignorados)."""
         if self.agent.game_over:
-            if self.is_playing_breeze: self.sfx['breeze'].stop()
-            if self.is_playing_stench: self.sfx['stench'].stop()
+            if self.is_playing_breeze: self.sfx.stop('breeze')
+            if self.is_playing_stench: self.sfx.stop('stench')
             return
 
         percepts = self.world.get_percepts(self.agent.pos)
 
         if "Brisa" in percepts:
             if not self.is_playing_breeze:
-                self.sfx['breeze'].play(loops=-1)
-                self.is_playing_breeze = True
+                self.is_playing_breeze = self.sfx.play('breeze', loops=-1)
         else:
             if self.is_playing_breeze:
-                self.sfx['breeze'].stop()
+                self.sfx.stop('breeze')
                 self.is_playing_breeze = False
 
         if "Fedor" in percepts:
             if not self.is_playing_stench:
-                self.sfx['stench'].play(loops=-1)
-                self.is_playing_stench = True
+                self.is_playing_stench = self.sfx.play('stench', loops=-1)
         else:
             if self.is_playing_stench:
-                self.sfx['stench'].stop()
+                self.sfx.stop('stench')
                 self.is_playing_stench = False
 
         if self.agent.has_gold and not self.gold_sound_played:
-            self.sfx['gold'].play()
-            self.gold_sound_played = True
-
-    def draw_cell(self, r, c):
-        """"Desenha todas as células"""
-
-        x = c * CELL_SIZE
-        y = r * CELL_SIZE
-        rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-
-        self.screen.blit(self.images["GROUND"], (x, y))
-
-        is_visited = (r, c) in self.agent.visited
-        element = self.world.grid[r][c]
-
-        if element == 'P':
-            self.screen.blit(self.images["PIT"], (x, y))
-        elif element == 'G' and not self.agent.has_gold:
-            self.screen.blit(self.images["GOLD"], (x, y))
-        elif element == 'W':
-            self.screen.blit(self.images["WUMPUS"], (x, y))
-
-        if (r, c) == (3, 0):
-            start_font_size = 20
-            start_font = pygame.font.SysFont("arial", start_font_size, bold=True)
-            lbl_start = start_font.render("START", True, BLACK)
-            lbl_rect = lbl_start.get_rect(center=(x + CELL_SIZE // 2, y + CELL_SIZE - 10))
-            self.screen.blit(lbl_start, lbl_rect)
-
-        if not is_visited:
+            self.gold_sound_played = self.sfx.play('gold')
+
+    def build_background(self):
+        """Camada estática do tabuleiro: chão, poços e Wumpus, desenhada uma vez."""
+        size = self.cell_size
+        background = pygame.Surface((self.cols * size, self.board_height)).convert()
+        for r in range(self.rows):
+            for c in range(self.cols):
+                x, y = c * size, r * size
+                background.blit(self.images["GROUND"], (x, y))
+                element = self.world.grid[r][c]
+                if element == 'P':
+                    background.blit(self.images["PIT"], (x, y))
+                elif element == 'W':
+                    background.blit(self.images["WUMPUS"], (x, y))
+        return background
+
+    def cell_key(self, r, c):
+        """Tudo o que muda a aparência da célula; se a chave não mudou, a superfície vale."""
+        visited = (r, c) in self.agent.visited
+        gold = self.world.grid[r][c] == 'G' and not self.agent.has_gold
+        agent = self.agent_direction if (r, c) == self.agent.pos else None
+        mask = 0
+        if visited and self.cell_size >= MIN_LABEL_CELL:
+            mask = self.world.get_percept_mask((r, c))
+            if self.agent.has_gold:
+                mask &= ~PERCEPT_BRILHO
+        return visited, gold, agent, mask
+
+    def render_cell(self, r, c, key):
+        """Monta a superfície da célula sobre o fundo estático."""
+        visited, gold, agent, mask = key
+        size = self.cell_size
+        rect = pygame.Rect(c * size, r * size, size, size)
+        surf = self.cell_surfaces[r * self.cols + c]
+        if surf is None:
+            surf = self.cell_surfaces[r * self.cols + c] = pygame.Surface((size, size)).convert()
+
+        surf.blit(self.background, (0, 0), rect)
+
+        if gold:
+            surf.blit(self.images["GOLD"], (0, 0))
+
+        if (r, c) == self.agent.start and self.start_label:
+            surf.blit(self.start_label, self.start_label.get_rect(center=(size // 2, size - 10)))
+
+        if not visited:
             if "UNEXPLORED" in self.images:
-                self.screen.blit(self.images["UNEXPLORED"], (x, y))
+                surf.blit(self.images["UNEXPLORED"], (0, 0))
             else:
-                s = pygame.Surface((CELL_SIZE, CELL_SIZE))
-                s.set_alpha(150)
-                s.fill((0, 0, 0))
-                self.screen.blit(s, (x, y))
-
-        if (r, c) == self.agent.pos:
-            key = f"AGENT_{self.agent_direction}"
-            if key in self.images:
-                self.screen.blit(self.images[key], (x, y))
-            else:
-                self.screen.blit(self.images["AGENT"], (x, y))
-
-        if is_visited:
-            percepts = self.world.get_percepts((r, c))
-            if self.agent.has_gold and "Brilho" in percepts:
-                percepts.remove("Brilho")
+                shade = pygame.Surface((size, size))
+                shade.set_alpha(150)
+                shade.fill((0, 0, 0))
+                surf.blit(shade, (0, 0))
+
+        if agent:
+            surf.blit(self.images.get(f"AGENT_{agent}", self.images["AGENT"]), (0, 0))
+
+        percepts = PERCEPT_TUPLES[mask]
+        line_h = 14
+        y_start = size - 4 - (len(percepts) * line_h)
+        for idx, p in enumerate(percepts):
+            txt_shadow = TEXT_CACHE.render(self.font_percept, p, (0, 0, 0))
+            txt = TEXT_CACHE.render(self.font_percept, p, PERCEPTION_COLOR)
+            surf.blit(txt_shadow, (7, y_start + idx * line_h + 1))
+            surf.blit(txt, (6, y_start + idx * line_h))
+
+        pygame.draw.rect(surf, GRAY, surf.get_rect(), 1)
+        return rect
 
-            line_h = 14
-            y_start = y + CELL_SIZE - 4 - (len(percepts) * line_h)
-            for idx, p in enumerate(percepts):
-                txt_shadow = self.font_percept.render(p, True, (0, 0, 0))
-                txt = self.font_percept.render(p, True, PERCEPTION_COLOR)
-                self.screen.blit(txt_shadow, (x + 7, y_start + idx * line_h + 1))
-                self.screen.blit(txt, (x + 6, y_start + idx * line_h))
-
-        pygame.draw.rect(self.screen, GRAY, rect, 1)
+    def draw_cell(self, r, c):
+        """
+        Redesenha a célula só se a chave dela mudou.
+        Retorna o retângulo sujo, ou None se a tela já está certa.
+        """
+        idx = r * self.cols + c
+        key = self.cell_key(r, c)
+        if key == self.cell_keys[idx]:
+            return None
+        self.cell_keys[idx] = key
+        rect = self.render_cell(r, c, key)
+        self.screen.blit(self.cell_surfaces[idx], rect)
+        return rect
 
     def draw_hud(self):
-        base_y = ROWS * CELL_SIZE
-        pygame.draw.rect(self.screen, BG_COLOR, (0, base_y, WIDTH, HUD_HEIGHT))
-
-        status_txt = f"Algoritmo: {self.search_method.upper()} | Status: {self.agent.message}"
-        surf = self.font_info.render(status_txt, True, TEXT_COLOR)
-        self.screen.blit(surf, (10, base_y + 10))
-
+        """Redesenha o HUD só quando algum texto mudou. Retorna o retângulo sujo ou None."""
         gold_txt = "Sim" if self.agent.has_gold else "Não"
-        info_txt = f"Posição: {self.agent.pos} | Tem Ouro? {gold_txt}"
-        surf2 = self.font_info.render(info_txt, True, TEXT_COLOR)
-        self.screen.blit(surf2, (10, base_y + 35))
-
-        metrics_txt = f"Nós: {self.agent.total_nodes} | Passos: {self.agent.total_steps}"
-        surf3 = self.font_info.render(metrics_txt, True, (200, 200, 200))
-        self.screen.blit(surf3, (10, base_y + 65))
+        lines = (
+            f"Algoritmo: {self.search_method.upper()} | Status: {self.agent.message}",
+            f"Posição: {self.agent.pos} | Tem Ouro? {gold_txt}",
+            f"Nós: {self.agent.total_nodes} | Passos: {self.agent.total_steps} | "
+            f"Velocidade: {self.speed_label()} (teclas 1-4)",
+        )
+        if lines == self.hud_lines:
+            return None
+        self.hud_lines = lines
+
+        base_y = self.board_height
+        rect = pygame.Rect(0, base_y, self.width, HUD_HEIGHT)
+        pygame.draw.rect(self.screen, BG_COLOR, rect)
+
+        status_txt, info_txt, metrics_txt = lines
+        self.screen.blit(TEXT_CACHE.render(self.font_info, status_txt, TEXT_COLOR), (10, base_y + 10))
+        self.screen.blit(TEXT_CACHE.render(self.font_info, info_txt, TEXT_COLOR), (10, base_y + 35))
+        self.screen.blit(TEXT_CACHE.render(self.font_info, metrics_txt, (200, 200, 200)), (10, base_y + 65))
+        return rect
+
+    def invalidate(self):
+        """Esquece o que está na tela: o próximo render redesenha tudo."""
+        self.cell_keys = [None] * (self.rows * self.cols)
+        self.hud_lines = None
+        self.screen.fill(BG_COLOR)
+        self.full_redraw = True
+        self.frame_due = True
+
+    def render(self):
+        """
+        Desenha só o que mudou desde o último quadro e retorna os retângulos sujos.
+        Entre quadros só mudam a célula de onde o agente saiu, as que ele
+        visitou (várias, se a simulação estiver acelerada) e a do ouro (ao
+        pegá-lo); o resto só é revisto após invalidate().
+        """
+        if self.full_redraw:
+            cells = [(r, c) for r in range(self.rows) for c in range(self.cols)]
+        else:
+            cells = self.moved_cells
+            cells.add(self.drawn_pos)
+            cells.add(self.agent.pos)
+            if self.agent.has_gold and self.world.gold_pos:
+                cells.add(self.world.gold_pos)
+        self.moved_cells = set()
+        self.drawn_pos = self.agent.pos
+
+        dirty = []
+        for r, c in cells:
+            rect = self.draw_cell(r, c)
+            if rect:
+                dirty.append(rect)
+        hud = self.draw_hud()
+        if hud:
+            dirty.append(hud)
+
+        if self.full_redraw:
+            self.full_redraw = False
+            return [self.screen.get_rect()]
+        return dirty
 
     def update_direction(self, move_action):
         dr, dc = move_action
@@ -169,72 +266,145 @@ class MundoWumpusGUI:
         elif dc == 1:
             self.agent_direction = "RIGHT"
 
+    def enable_profiler(self):
+        if self.profiler is None:
+            self.profiler = Profiler()
+            self.profiler.instrument_gui(self)
+
+    def toggle_overlay(self):
+        self.enable_profiler()
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay:
+            self.frame_due = True
+        else:
+            self.invalidate()  # redesenha o que estava embaixo do overlay
+
+    def draw_overlay(self):
+        """Tabela de fases do profiler sobre o canto do tabuleiro. Retorna o retângulo sujo."""
+        lines = ["Perfil por fase (F3 fecha)"] + self.profiler.summary(limit=10)
+        lines.append(f"cache de textos {TEXT_CACHE.stats()['taxa_acerto']:.0%} | "
+                     f"cache de caminhos {self.agent.path_cache.stats()['taxa_acerto']:.0%}")
+
+        # Textos que mudam a cada quadro: renderizados direto, sem poluir o TEXT_CACHE
+        font = TEXT_CACHE.font("couriernew", 13)
+        line_h = font.get_linesize()
+        rect = pygame.Rect(0, 0, min(self.width, 460), min(self.board_height, line_h * len(lines) + 12))
+        panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 200))
+        for i, line in enumerate(lines):
+            panel.blit(font.render(line, True, TEXT_COLOR), (6, 6 + i * line_h))
+
+        # O painel é translúcido: o fundo vem das células, redesenhadas por baixo
+        self.screen.set_clip(rect)
+        for r in range(min(self.rows, rect.bottom // self.cell_size + 1)):
+            for c in range(min(self.cols, rect.right // self.cell_size + 1)):
+                idx = r * self.cols + c
+                if self.cell_surfaces[idx] is not None:
+                    self.screen.blit(self.cell_surfaces[idx], (c * self.cell_size, r * self.cell_size))
+        self.screen.blit(panel, rect)
+        self.screen.set_clip(None)
+        return rect
+
+    def speed_label(self):
+        speed = self.scheduler.speed
+        return "máx" if speed is None else f"{speed}x"
+
+    def step(self):
+        """Um passo da simulação: o agente pensa e se move."""
+        self.agent.think(self.search_method)
+        move_action = self.agent.move()
+        if self.trace:
+            self.trace.record()
+        if move_action != (0, 0):
+            self.update_direction(move_action)
+        self.moved_cells.add(self.agent.pos)
+        self.frame_due = True
+
+    def handle_key(self, key):
+        """Teclas além das de velocidade e do F3 (nenhuma no jogo; o replay usa para navegar)."""
+
+    def finished(self):
+        """Se a partida acabou: o laço mostra o tabuleiro final e depois a tela de fim de jogo."""
+        return self.agent.game_over
+
+    def game_over_delay(self):
+        """Tempo real (ms) com o tabuleiro final na tela; encolhe com a velocidade."""
+        speed = self.scheduler.speed
+        return 0 if speed is None else GAME_OVER_DELAY / speed
+
     def run(self):
-        clock = pygame.time.Clock()
         running = True
+        over_at = None     # instante (ms) em que o jogo acabou
+        next_frame = 0     # próximo instante em que um quadro pode ser desenhado
+
+        self.process_audio()
 
         while running:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
-
-            self.process_audio()
-
-            # Lógica da IA (Temporizada)
-            current_time = pygame.time.get_ticks()
-            if not self.agent.game_over:
-                if current_time - self.last_move_time > self.move_delay:
-                    self.agent.think(self.search_method)
-                    move_action = self.agent.move()
-                    if move_action != (0, 0):
-                        self.update_direction(move_action)
-                    self.last_move_time = current_time
-            else:
-                # Fim de Jogo
-                if self.agent.won and not self.victory_music_started:
-                    pygame.mixer.music.stop()
-                    try:
-                        victory_path = ASSET_PATHS["SND_VICTORY"]
-                        pygame.mixer.music.load(victory_path)
-                        pygame.mixer.music.play(-1)
-                    except Exception as e:
-                        print(f"Erro ao tocar vitória: {e}")
-                    self.victory_music_started = True
-
-                pygame.time.delay(1000)
-
-                if self.end_time is None:
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.invalidate()
+                elif event.type == pygame.KEYDOWN and event.key in SPEED_KEYS:
+                    self.scheduler.set_speed(SPEED_KEYS[event.key])
+                    self.frame_due = True
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.toggle_overlay()
+                elif event.type == pygame.KEYDOWN:
+                    self.handle_key(event.key)
+
+            # Lógica da IA (passo fixo; vários passos por quadro quando acelerada)
+            if not self.finished():
+                moved = False
+                for _ in self.scheduler.ticks():
+                    self.step()
+                    moved = True
+                    if self.finished():
+                        break
+                if moved:
+                    self.process_audio()
+
+            now = self.app.ticks()
+            if self.finished():
+                # Fim de Jogo: o tabuleiro final fica na tela sem travar os eventos
+                if over_at is None:
+                    over_at = now
                     self.end_time = time.time()
-
-                duration = self.end_time - self.start_time
-
-                final_score = -self.agent.total_steps
-                if self.agent.won:
-                    final_score += 1000
-                else:
-                    final_score -= 1000
-
-                metrics = {
-                    "resultado": "VITÓRIA" if self.agent.won else "DERROTA",
-                    "metodo": self.search_method.upper(),
-                    "nos": self.agent.total_nodes,
-                    "custo": self.agent.total_steps,
-                    "tempo": f"{duration:.2f}s",
-                    "score": final_score
-                }
-
-                screen_over = GameOverScreen(metrics)
-                screen_over.run()
-                return
-
-            self.screen.fill(BG_COLOR)
-            for r in range(ROWS):
-                for c in range(COLS):
-                    self.draw_cell(r, c)
-            self.draw_hud()
-
-            pygame.display.flip()
-            clock.tick(30)
-
-        pygame.quit()
-        sys.exit()
\ No newline at end of file
+                    if self.agent.won and not self.victory_music_started:
+                        if pygame.mixer.get_init():
+                            pygame.mixer.music.stop()
+                            play_music("SND_VICTORY")
+                        self.victory_music_started = True
+                elif now - over_at >= self.game_over_delay():
+                    duration = self.end_time - self.start_time
+                    metrics = build_metrics(self.agent, self.search_method, duration)
+
+                    screen_over = GameOverScreen(metrics, self.app)
+                    screen_over.run()
+                    return
+
+            # Desenho limitado a FPS, só quando algo mudou
+            if self.frame_due and now >= next_frame:
+                self.frame_due = False
+                dirty = self.render()
+                if self.show_overlay:
+                    dirty.append(self.draw_overlay())
+                if dirty:
+                    pygame.display.update(dirty)
+                    next_frame = now + 1000 / FPS
+                    self.app.mark("jogo")
+
+            # Modo ocioso: dorme até o próximo passo, quadro ou evento (que volta para a fila)
+            if self.finished():
+                wait = over_at + self.game_over_delay() - now
+            else:
+                wait = self.scheduler.next_tick_in()
+            if self.frame_due:
+                wait = min(wait, next_frame - now)
+            if wait > 0:
+                event = pygame.event.wait(int(wait) + 1)
+                if event.type != pygame.NOEVENT:
+                    pygame.event.post(event)
+
+        self.app.close()
+        sys.exit()
@@ -0,0 +1,77 @@
+import pygame
+
+from src.gui.interface import MundoWumpusGUI
+
+# Teclas de navegação: deslocamento em passos (None = início/fim da partida)
+SEEK_KEYS = {
+    pygame.K_LEFT: -1,
+    pygame.K_RIGHT: 1,
+    pygame.K_PAGEDOWN: -100,
+    pygame.K_PAGEUP: 100,
+}
+
+
+class ReplayGUI(MundoWumpusGUI):
+    """
+    Reprodução de uma partida gravada (Episode do rastro) com o desenho do jogo.
+    O agente não pensa: a cada passo o estado vem do rastro. As teclas 1-4
+    mudam a velocidade como no jogo; espaço pausa; setas voltam/avançam um
+    passo, PageDown/PageUp cem, Home/End vão ao início/fim (o fim não
+    encerra o replay).
+    """
+
+    def __init__(self, episode, step=0, speed=1, app=None):
+        super().__init__(episode.method, episode.layout(), speed, app=app)
+        self.episode = episode
+        self.paused = False
+        self.seek(step)
+
+    def show(self, state):
+        """Copia o estado do rastro para o agente que a interface desenha."""
+        agent = self.agent
+        agent.pos = state.pos
+        agent.visited = state.visited
+        agent.kb = state.kb
+        agent.has_gold = state.has_gold
+        agent.game_over = state.game_over
+        agent.won = state.won
+        agent.total_nodes = state.total_nodes
+        agent.total_steps = state.total_steps
+        agent.message = f"[{state.step}/{len(self.episode)}] {state.message}"
+
+    def seek(self, step):
+        """Vai direto ao passo (snapshot + poucos ciclos) e redesenha tudo."""
+        self.state = self.episode.state_at(max(0, min(len(self.episode), step)))
+        self.show(self.state)
+        # Direção do agente: a do último movimento, que vem no estado (no início, para cima)
+        self.agent_direction = "UP"
+        self.update_direction(self.state.heading)
+        self.invalidate()
+
+    def finished(self):
+        """
+        O replay nunca acaba: no último passo (mesmo com game_over gravado)
+        o tabuleiro final fica na tela, sem tela de fim de jogo nem música,
+        e Home/setas continuam navegando até a janela ser fechada.
+        """
+        return False
+
+    def step(self):
+        if self.paused or self.episode.advance(self.state) is None:
+            return
+        self.show(self.state)
+        if self.state.last_move != (0, 0):
+            self.update_direction(self.state.last_move)
+        self.moved_cells.add(self.agent.pos)
+        self.frame_due = True
+
+    def handle_key(self, key):
+        if key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif key == pygame.K_HOME:
+            self.seek(0)
+        elif key == pygame.K_END:
+            self.seek(len(self.episode))
+        elif key in SEEK_KEYS:
+            self.paused = True
+            self.seek(self.state.step + SEEK_KEYS[key])
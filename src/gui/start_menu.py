@@ -1,8 +1,22 @@
 import pygame
 import sys
+from src.gui.app import App
+from src.gui.text_cache import TEXT_CACHE
 from src.utils.constants import WHITE, BLACK, GRAY
 
-WIDTH, HEIGHT = 500, 400
+# (método, rótulo do botão) na ordem do menu; os métodos são as chaves de ALGORITHMS
+OPTIONS = (
+    ("bfs", "Busca BFS"),
+    ("dfs", "Busca DFS"),
+    ("astar", "Busca A*"),
+    ("dstar", "Busca D* Lite"),
+    ("jps", "Jump Point Search"),
+    ("bibfs", "BFS Bidirecional"),
+    ("biastar", "A* Bidirecional"),
+)
+
+BUTTON_W, BUTTON_H, BUTTON_GAP = 260, 45, 60
+WIDTH, HEIGHT = 500, 120 + len(OPTIONS) * BUTTON_GAP
 DARK_GRAY = (100, 100, 100)
 
 class Button:
@@ -18,7 +32,7 @@ class Button:
         color = self.hover_color if self.rect.collidepoint(mouse_pos) else self.color
 
         pygame.draw.rect(screen, color, self.rect, border_radius=10)
-        label = font.render(self.text, True, self.text_color)
+        label = TEXT_CACHE.render(font, self.text, self.text_color)
         screen.blit(label, (self.rect.x + (self.rect.width - label.get_width()) // 2,
                             self.rect.y + (self.rect.height - label.get_height()) // 2))
 
@@ -27,45 +41,40 @@ class Button:
 
 
 class StartMenu:
-    def __init__(self):
-        pygame.init()
-        pygame.display.set_caption("Escolha o método de busca")
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        self.font = pygame.font.SysFont("arial", 26, bold=True)
+    def __init__(self, app=None):
+        self.app = app or App()
+        self.screen = self.app.screen((WIDTH, HEIGHT), "Escolha o método de busca")
+        self.font = TEXT_CACHE.font("arial", 24, bold=True)
 
-        # Botões centralizados
+        # Botões centralizados, um por método
+        x = (WIDTH - BUTTON_W) // 2
         self.buttons = [
-            Button(150, 120, 200, 50, "Busca BFS"),
-            Button(150, 190, 200, 50, "Busca DFS"),
-            Button(150, 260, 200, 50, "Busca A*"),
+            Button(x, 100 + i * BUTTON_GAP, BUTTON_W, BUTTON_H, label)
+            for i, (_, label) in enumerate(OPTIONS)
         ]
 
     def run(self):
-        """Exibe o menu e retorna o método escolhido como 'bfs', 'dfs' ou 'astar'."""
+        """Exibe o menu e retorna o método escolhido (chave de OPTIONS, ex.: 'astar')."""
         clock = pygame.time.Clock()
 
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
+                    self.app.close()
                     sys.exit()
 
-                for i, button in enumerate(self.buttons):
+                for button, (method, _) in zip(self.buttons, OPTIONS):
                     if button.clicked(event):
-                        if i == 0:
-                            return "bfs"
-                        elif i == 1:
-                            return "dfs"
-                        elif i == 2:
-                            return "astar"
+                        return method
 
             self.screen.fill(WHITE)
 
-            title = self.font.render("Selecione o método de busca", True, BLACK)
+            title = TEXT_CACHE.render(self.font, "Selecione o método de busca", BLACK)
             self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 40))
 
             for btn in self.buttons:
                 btn.draw(self.screen, self.font)
 
             pygame.display.flip()
+            self.app.mark("menu")
             clock.tick(30)
\ No newline at end of file
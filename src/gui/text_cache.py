@@ -0,0 +1,75 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """
+    Cache de textos já renderizados, chave (fonte, texto, cor), com descarte LRU.
+
+    Renderizar texto é uma das operações mais caras do pygame e as telas
+    desenham quase sempre as mesmas strings (percepções, botões, HUD).
+    As fontes também ficam guardadas, pois SysFont procura o arquivo da
+    fonte no sistema a cada chamada. As superfícies devolvidas são
+    compartilhadas: quem as recebe só deve usá-las em blit, nunca alterá-las.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()  # (fonte, texto, cor) -> Surface
+        self.fonts = {}                # (nome, tamanho, negrito) -> Font
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.font_hits = 0
+        self.font_misses = 0
+
+    def font(self, name, size, bold=False):
+        """Fonte do sistema, criada só na primeira vez."""
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            self.font_misses += 1
+            font = self.fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+        else:
+            self.font_hits += 1
+        return font
+
+    def render(self, font, text, color):
+        """Superfície do texto (com antialiasing), renderizada só se não estiver no cache."""
+        key = (font, text, color)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = self.surfaces[key] = font.render(text, True, color)
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def clear(self):
+        """Descarta tudo (ex.: após pygame.quit(), quando as fontes deixam de valer)."""
+        self.surfaces.clear()
+        self.fonts.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        font_total = self.font_hits + self.font_misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "taxa_acerto": self.hits / total if total else 0.0,
+            "descartes": self.evictions,
+            "entradas": len(self.surfaces),
+            "fontes": len(self.fonts),
+            "taxa_acerto_fontes": self.font_hits / font_total if font_total else 0.0,
+        }
+
+
+# Cache compartilhado por todas as telas (menu, jogo e relatório final)
+TEXT_CACHE = TextCache()
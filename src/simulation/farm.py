@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+from itertools import product
+from multiprocessing import Pool
+
+from src.core.map_corpus import MapCorpus
+from src.simulation.runner import METHODS, run_episode
+from src.simulation.trace import TraceWriter
+
+DEFAULT_MAPS = {"padrao": None}
+
+# Mapas do processo trabalhador (enviados uma única vez, no initializer)
+_worker_maps = {}
+_worker_traces = None
+
+
+def _init_worker(maps, trace_dir=None):
+    """
+    Com trace_dir, cada processo grava as suas partidas num rastro próprio
+    (<trace_dir>/<pid>.wtr): um arquivo só por processo, sem disputa entre eles.
+    Cada partida vai para o disco ao terminar, então nada se perde quando o
+    pool encerra o processo.
+    """
+    global _worker_maps, _worker_traces
+    _worker_maps = maps
+    if trace_dir:
+        _worker_traces = TraceWriter(os.path.join(trace_dir, f"{os.getpid()}.wtr"), append=True)
+
+
+def _run_job(job):
+    """Executa um job (mapa, método, seed) dentro do processo trabalhador."""
+    map_name, method, seed = job
+    record = run_episode(method, _worker_maps[map_name], seed, trace=_worker_traces)
+    record["mapa"] = map_name
+    return record
+
+
+def job_key(record):
+    return record["mapa"], record["metodo"].lower(), record["seed"]
+
+
+def build_jobs(maps, methods, seeds):
+    """Produto cartesiano (mapa, método, seed)."""
+    return [(m, a, s) for m, a, s in product(maps, methods, seeds)]
+
+
+def load_records(path):
+    """
+    Lê os resultados já gravados.
+    Linhas incompletas (execução interrompida no meio da escrita) são ignoradas.
+    """
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def truncate_partial_line(path, block=65536):
+    """Remove a última linha se ela ficou incompleta (sem quebra de linha no fim)."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        pos = size
+        while pos > 0:
+            start = max(0, pos - block)
+            f.seek(start)
+            idx = f.read(pos - start).rfind(b"\n")
+            if idx != -1:
+                end = start + idx + 1
+                break
+            pos = start
+        else:
+            end = 0
+        if end != size:
+            f.truncate(end)
+
+
+def run_farm(jobs, maps, output_path, processes=None, chunksize=None, trace_dir=None):
+    """
+    Distribui os jobs entre processos e grava cada resultado assim que chega.
+    Jobs já presentes no arquivo de saída são pulados, o que permite retomar
+    uma execução interrompida. Gera os relatórios novos conforme terminam.
+    Com trace_dir, as partidas são gravadas também em rastros (.wtr), um por processo.
+    """
+    truncate_partial_line(output_path)
+    done = {job_key(r) for r in load_records(output_path)}
+    pending = [job for job in jobs if tuple(job) not in done]
+    if not pending:
+        return
+
+    processes = processes or os.cpu_count() or 1
+    if trace_dir:
+        os.makedirs(trace_dir, exist_ok=True)
+    if chunksize is None:
+        chunksize = max(1, min(64, len(pending) // (processes * 8)))
+
+    with open(output_path, "a", encoding="utf-8") as out, \
+            Pool(processes, initializer=_init_worker, initargs=(maps, trace_dir)) as pool:
+        for record in pool.imap_unordered(_run_job, pending, chunksize):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            yield record
+
+
+def percentile(sorted_values, p):
+    """Percentil pelo método do posto mais próximo."""
+    if not sorted_values:
+        return 0
+    idx = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+def summarize(values):
+    values = sorted(values)
+    n = len(values)
+    return {
+        "media": sum(values) / n if n else 0,
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+    }
+
+
+def aggregate(records, by=("metodo",)):
+    """
+    Agrupa os resultados e calcula taxa de vitória e estatísticas de
+    nós expandidos, passos (custo) e pontuação.
+    """
+    groups = {}
+    for r in records:
+        key = " / ".join(str(r[k]) for k in by)
+        g = groups.setdefault(key, {"vitorias": 0, "nos": [], "custo": [], "score": []})
+        g["vitorias"] += r["resultado"] == "VITÓRIA"
+        g["nos"].append(r["nos"])
+        g["custo"].append(r["custo"])
+        g["score"].append(r["score"])
+
+    stats = {}
+    for key, g in sorted(groups.items()):
+        n = len(g["nos"])
+        stats[key] = {
+            "episodios": n,
+            "taxa_vitoria": g["vitorias"] / n,
+            "nos": summarize(g["nos"]),
+            "custo": summarize(g["custo"]),
+            "score": summarize(g["score"]),
+        }
+    return stats
+
+
+def load_maps(path):
+    """
+    Lê um JSON com {nome: [linhas]} ou uma lista de mapas,
+    o JSON Lines produzido pelo map_generator ou um arquivo binário .wmc.
+    O .wmc é memória mapeada: cada processo abre o arquivo e só lê os mapas dos seus jobs.
+    """
+    if path.endswith(".wmc"):
+        return MapCorpus(path)
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return {str(item["indice"]): item["mapa"] for item in map(json.loads, f)}
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {str(i): layout for i, layout in enumerate(data)}
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comparação de algoritmos em vários processos.")
+    parser.add_argument("-m", "--metodos", nargs="+", choices=METHODS, default=list(METHODS))
+    parser.add_argument("-n", "--seeds", type=int, default=100, help="Seeds por (mapa, método)")
+    parser.add_argument("--mapas", help="JSON/JSONL/.wmc com os mapas (padrão: mapa embutido)")
+    parser.add_argument("-p", "--processos", type=int, help="Processos (padrão: todos os núcleos)")
+    parser.add_argument("-o", "--saida", default="farm.jsonl", help="Arquivo JSONL (retomável)")
+    parser.add_argument("--por-mapa", action="store_true", help="Agrupa também por mapa")
+    parser.add_argument("--rastros", help="Diretório dos rastros (.wtr) das partidas, um arquivo por processo")
+    args = parser.parse_args(argv)
+
+    maps = load_maps(args.mapas) if args.mapas else DEFAULT_MAPS
+    jobs = build_jobs(maps, args.metodos, range(args.seeds))
+
+    for _ in run_farm(jobs, maps, args.saida, args.processos, trace_dir=args.rastros):
+        pass
+
+    by = ("mapa", "metodo") if args.por_mapa else ("metodo",)
+    stats = aggregate(load_records(args.saida), by)
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
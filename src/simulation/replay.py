@@ -0,0 +1,142 @@
+"""
+Replay de rastros (.wtr) gravados pelo runner, pelo farm ou pelo jogo.
+
+Uso:
+  python -m src.simulation.replay rastro.wtr --lista              # partidas do arquivo
+  python -m src.simulation.replay rastro.wtr -p 3                  # ciclos da partida 3, um por linha
+  python -m src.simulation.replay rastro.wtr -p 3 --passo 120      # estado no passo 120, com a KB
+  python -m src.simulation.replay rastro.wtr --seed 7 --gui -v 10  # na interface gráfica, a 10x
+Sem --gui a velocidade padrão é a máxima; na interface, 1x.
+"""
+import argparse
+import sys
+import time
+
+from src.core.environment import PERCEPT_TUPLES
+from src.gui.scheduler import FixedStepScheduler, SPEEDS
+from src.simulation.trace import Trace
+from src.utils.constants import MOVE_DELAY
+
+SPEED_NAMES = {str(speed): speed for speed in SPEEDS if speed is not None}
+SPEED_NAMES["max"] = None
+
+# Legenda do mapa da KB em texto
+KB_CHARS = {'UNKNOWN': '.', 'SAFE': 'S', 'CAUTION': '?', 'UNSAFE': 'X'}
+MAX_TEXT_COLS = 120
+
+
+def describe(index, episode):
+    seed = "-" if episode.seed is None else episode.seed
+    return (f"{index:>4} | {episode.method.upper():<7} | seed {seed:>6} | {episode.rows}x{episode.cols} | "
+            f"{len(episode):>7} ciclos | {episode.result()}")
+
+
+def find_episode(trace, index=None, seed=None, method=None):
+    """Partida pelo índice, ou a primeira com a seed/o método pedidos."""
+    if index is not None:
+        if not 0 <= index < len(trace):
+            raise IndexError(f"O rastro tem {len(trace)} partida(s); índice {index} não existe.")
+        return index, trace[index]
+    for i, episode in enumerate(trace):
+        if (seed is None or episode.seed == seed) and (method is None or episode.method == method):
+            return i, episode
+    raise LookupError("Nenhuma partida do rastro combina com o filtro.")
+
+
+def format_tick(rec):
+    percepts = ",".join(PERCEPT_TUPLES[rec.percepts]) or "-"
+    line = f"{rec.step + 1:>6} | {rec.pos} -> {rec.new_pos} | {percepts:<18} | nós {rec.nodes:>5} | KB +{len(rec.changes)}"
+    if rec.path:
+        line += f" | alvo {rec.target} ({len(rec.path)} passos)"
+    if rec.message is not None:
+        line += f" | {rec.message}"
+    return line
+
+
+def format_state(episode, state):
+    """Estado num passo: contadores, alvo e a KB em texto (mapas até MAX_TEXT_COLS colunas)."""
+    lines = [
+        f"Passo {state.step}/{len(episode)} | {episode.method.upper()} | seed {episode.seed}",
+        f"Posição: {state.pos} | Tem Ouro? {'Sim' if state.has_gold else 'Não'} | "
+        f"Nós: {state.total_nodes} | Passos: {state.total_steps}",
+        f"Status: {state.message}",
+    ]
+    if state.target is not None:
+        lines.append(f"Último alvo: {state.target} | Caminho: {state.path}")
+    if episode.cols <= MAX_TEXT_COLS:
+        lines.append("KB (@ agente, minúscula = visitada; S segura, ? cautela, X perigo, . desconhecida):")
+        for r in range(episode.rows):
+            row = []
+            for c in range(episode.cols):
+                char = KB_CHARS[state.kb.get((r, c))]
+                if (r, c) == state.pos:
+                    char = '@'
+                elif (r, c) in state.visited:
+                    char = char.lower()
+                row.append(char)
+            lines.append("  " + "".join(row))
+    return "\n".join(lines)
+
+
+def play(episode, start, stop, speed, out):
+    """Imprime os ciclos [start, stop) no ritmo da velocidade (None = sem espera)."""
+    state = episode.state_at(start)
+    scheduler = FixedStepScheduler(MOVE_DELAY, speed)
+    while state.step < stop:
+        for _ in scheduler.ticks():
+            out.write(format_tick(episode.advance(state)) + "\n")
+            if state.step >= stop:
+                break
+        out.flush()
+        time.sleep(scheduler.next_tick_in() / 1000)
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay de partidas gravadas (.wtr).")
+    parser.add_argument("rastro", help="Arquivo de rastro")
+    parser.add_argument("--lista", action="store_true", help="Lista as partidas do arquivo")
+    parser.add_argument("-p", "--partida", type=int, help="Índice da partida (padrão: a primeira)")
+    parser.add_argument("--seed", type=int, help="Primeira partida com esta seed")
+    parser.add_argument("-m", "--metodo", help="Primeira partida com este método")
+    parser.add_argument("--passo", type=int, help="Mostra o estado neste passo (sem percorrer os anteriores)")
+    parser.add_argument("--de", type=int, default=0, help="Primeiro passo do replay")
+    parser.add_argument("--ate", type=int, help="Último passo do replay (padrão: o fim)")
+    parser.add_argument("-v", "--velocidade", choices=SPEED_NAMES, help="1, 10, 1000 ou max")
+    parser.add_argument("--gui", action="store_true", help="Reproduz na interface gráfica")
+    args = parser.parse_args(argv)
+
+    with Trace(args.rastro) as trace:
+        if args.lista:
+            for i, episode in enumerate(trace):
+                print(describe(i, episode))
+            return
+
+        try:
+            index, episode = find_episode(trace, args.partida, args.seed, args.metodo)
+        except LookupError as e:
+            parser.error(str(e))
+        for step in (args.passo, args.de):
+            if step is not None and not 0 <= step <= len(episode):
+                parser.error(f"A partida tem {len(episode)} ciclos; passo {step} não existe.")
+
+        if args.gui:
+            from src.gui.replay import ReplayGUI  # só o replay gráfico depende do pygame
+
+            speed = SPEED_NAMES[args.velocidade or "1"]
+            start = args.de if args.passo is None else args.passo
+            ReplayGUI(episode, start, speed).run()
+            return
+
+        print(describe(index, episode))
+        if args.passo is not None:
+            print(format_state(episode, episode.state_at(args.passo)))
+            return
+
+        stop = len(episode) if args.ate is None else min(args.ate, len(episode))
+        state = play(episode, args.de, stop, SPEED_NAMES[args.velocidade or "max"], sys.stdout)
+        print(format_state(episode, state))
+
+
+if __name__ == "__main__":
+    main()
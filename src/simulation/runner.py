@@ -0,0 +1,157 @@
+import argparse
+import csv
+import json
+import sys
+import time
+
+from src.core.environment import WumpusEnvironment
+from src.agent.algorithms import ALGORITHMS, SearchAlgorithms
+from src.agent.player import Agent
+from src.simulation.trace import TraceWriter
+from src.utils.profiler import Profiler, write_profiles
+
+METHODS = tuple(ALGORITHMS)
+FIELDS = ("resultado", "metodo", "nos", "custo", "tempo", "score", "mensagem", "seed")
+
+
+def build_metrics(agent, search_method, duration):
+    """
+    Monta o relatório final de uma partida.
+    Mesmos campos exibidos pela GameOverScreen.
+    """
+    final_score = -agent.total_steps
+    if agent.won:
+        final_score += 1000
+    else:
+        final_score -= 1000
+
+    return {
+        "resultado": "VITÓRIA" if agent.won else "DERROTA",
+        "metodo": search_method.upper(),
+        "nos": agent.total_nodes,
+        "custo": agent.total_steps,
+        "tempo": duration,
+        "score": final_score
+    }
+
+
+def run_episode(search_method="astar", layout=None, seed=None, max_ticks=None, deterministic=False,
+                profile=False, trace=None):
+    """
+    Executa uma partida completa sem interface gráfica.
+    Mesmo ciclo do MundoWumpusGUI (think -> move), sem delay nem renderização.
+    Com seed (ou deterministic=True) a partida é reproduzível bit a bit.
+    Com profile=True o relatório traz, em "perfil", o tempo de cada fase do agente.
+    Com trace (um TraceWriter) a partida é gravada, ciclo a ciclo, no rastro.
+    """
+    SearchAlgorithms.configure(seed, deterministic)
+
+    world = WumpusEnvironment(layout)
+    agent = Agent(world, seed)
+    profiler = None
+    if profile:
+        profiler = Profiler()
+        profiler.instrument_agent(agent)
+
+    if trace:
+        trace.begin(agent, search_method, seed, deterministic)
+
+    if max_ticks is None:
+        max_ticks = 4 * world.rows * world.cols * (world.rows + world.cols)
+
+    start = time.perf_counter()
+    ticks = 0
+    try:
+        while not agent.game_over and ticks < max_ticks:
+            agent.think(search_method)
+            move_action = agent.move()
+            ticks += 1
+            if trace:
+                trace.record()
+
+            # Sem movimento e sem fim de jogo: o estado não muda mais (agente travado)
+            if move_action == (0, 0) and not agent.game_over:
+                break
+    finally:
+        if trace:
+            trace.finish()
+    duration = time.perf_counter() - start
+
+    metrics = build_metrics(agent, search_method, duration)
+    metrics["mensagem"] = agent.message
+    metrics["seed"] = seed
+    metrics["cache"] = agent.path_cache.stats()
+    if profiler:
+        metrics["perfil"] = profiler.to_dict()
+    return metrics
+
+
+def run_batch(episodes, search_method="astar", layout=None, seed=0, deterministic=False, profile=False,
+              trace=None):
+    """Gera os relatórios de várias partidas seguidas (seeds consecutivas)."""
+    for i in range(episodes):
+        yield run_episode(search_method, layout, seed + i, deterministic=deterministic, profile=profile,
+                          trace=trace)
+
+
+def write_records(records, out, fmt="jsonl"):
+    """Escreve os relatórios em JSON Lines ou CSV."""
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+    else:
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação do Mundo de Wumpus sem interface gráfica.")
+    parser.add_argument("-m", "--metodo", choices=METHODS, default="astar", help="Algoritmo de busca")
+    parser.add_argument("-n", "--episodios", type=int, default=1, help="Quantidade de partidas")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Seed da primeira partida")
+    parser.add_argument("-d", "--deterministico", action="store_true",
+                        help="Desempate fixo nas buscas (sem sorteio)")
+    parser.add_argument("--mapa", help="JSON com o mapa (lista de linhas); padrão: mapa embutido")
+    parser.add_argument("-f", "--formato", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("-o", "--saida", help="Arquivo de saída (padrão: stdout)")
+    parser.add_argument("--perfil", help="Grava o tempo por fase de cada partida (.json ou .csv)")
+    parser.add_argument("--rastro", help="Grava todas as partidas, ciclo a ciclo, neste arquivo (.wtr)")
+    args = parser.parse_args(argv)
+
+    layout = None
+    if args.mapa:
+        with open(args.mapa, encoding="utf-8") as f:
+            layout = json.load(f)
+
+    trace = TraceWriter(args.rastro) if args.rastro else None
+    records = run_batch(args.episodios, args.metodo, layout, args.seed, args.deterministico,
+                        profile=bool(args.perfil), trace=trace)
+    profiles = []
+    if args.perfil:
+        records = _collect_profiles(records, profiles)
+
+    try:
+        if args.saida:
+            with open(args.saida, "w", encoding="utf-8", newline="") as out:
+                write_records(records, out, args.formato)
+        else:
+            write_records(records, sys.stdout, args.formato)
+    finally:
+        if trace:
+            trace.close()
+
+    if args.perfil:
+        write_profiles(profiles, args.perfil)
+
+
+def _collect_profiles(records, profiles):
+    """Separa o perfil de cada relatório (que vai para o arquivo próprio)."""
+    for record in records:
+        profiles.append((record["seed"], record.pop("perfil")))
+        yield record
+
+
+if __name__ == "__main__":
+    main()
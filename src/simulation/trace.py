@@ -0,0 +1,499 @@
+"""
+Rastro de partidas (.wtr): gravação só de acréscimo e replay com acesso
+direto a qualquer passo.
+
+O arquivo começa com magic 'WTRC' e versão; depois vêm registros, cada um
+com tipo (u8) e tamanho (u32). Um mesmo arquivo guarda várias partidas
+seguidas (um lote inteiro do runner, ou tudo o que um processo do farm
+rodou), o que evita criar um arquivo por partida:
+  * EPISODE abre uma partida: linhas, colunas, intervalo entre snapshots,
+    método (8 bytes), seed, flags (bit 0 = tem seed, bit 1 =
+    determinístico), a entrada e o mapa em texto comprimido (sem o 'A').
+  * TICK, um por ciclo think -> move: posição antes e depois, percepções
+    (bits PERCEPT_*), flags do agente, alvo e nós expandidos no ciclo; o
+    caminho inteiro só quando o agente planejou um novo; as células da KB
+    que mudaram (índice e estado final) e a mensagem, só quando mudou.
+  * SNAPSHOT, a cada 'intervalo' ciclos (e no passo 0): contadores, o
+    último movimento feito (código em MOVES, para o replay saber para onde
+    o agente olha sem voltar ciclo a ciclo), mensagem e os planos da KB e
+    das células visitadas, comprimidos.
+
+Ir para o passo n = carregar o snapshot anterior e aplicar no máximo
+'intervalo' ciclos: custo constante, independente do tamanho do rastro.
+O intervalo cresce com o mapa para os snapshots custarem, em média, poucos
+bytes por ciclo. Um arquivo cortado no meio (processo morto) continua
+legível até o último registro completo.
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import namedtuple
+
+from src.agent.knowledge_base import STATUSES, KnowledgeBase
+from src.core.map_corpus import plane_size
+
+MAGIC = b"WTRC"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sHxx")
+RECORD = struct.Struct("<BI")
+EPISODE = struct.Struct("<HHH8sqBxHH")
+TICK = struct.Struct("<IIBBiIIIH")
+TICK_RECORD = struct.Struct("<BI" + TICK.format[1:])  # RECORD + TICK num pack só (caminho quente)
+SNAPSHOT = struct.Struct("<IIIIBBH")
+
+KIND_EPISODE = 1
+KIND_TICK = 2
+KIND_SNAPSHOT = 3
+
+FLAG_HAS_SEED = 1
+FLAG_DETERMINISTIC = 2
+
+# Flags do agente em cada registro
+HAS_GOLD = 1
+GAME_OVER = 2
+WON = 4
+NEW_PATH = 8
+MOVED = 16
+
+LITTLE_ENDIAN = sys.byteorder == "little"  # array('I') usa a ordem da máquina; o arquivo é sempre little-endian
+
+# Último movimento no snapshot: 0 = ainda não andou
+MOVES = ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1))
+MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+
+MIN_INTERVAL = 32
+SNAPSHOT_BYTES_PER_TICK = 64  # orçamento médio dos snapshots (antes da compressão)
+
+# zlib com janela de 4 KB e pouca memória: o estado padrão (~256 KB) é alocado e
+# zerado a cada chamada e custava mais que o próprio mapa ou snapshot comprimido.
+# Os planos de bits comprimem praticamente igual; zlib.decompress lê a janela do cabeçalho.
+ZLIB_WBITS = 12
+ZLIB_MEMLEVEL = 4
+
+TickRecord = namedtuple("TickRecord", "step pos new_pos percepts flags target nodes path changes message")
+
+
+def default_interval(rows, cols):
+    """Ciclos entre snapshots: os 4 planos (KB + visitadas) diluídos no orçamento por ciclo."""
+    return max(MIN_INTERVAL, min(0xFFFF, 4 * plane_size(rows, cols) // SNAPSHOT_BYTES_PER_TICK))
+
+
+def agent_flags(agent):
+    return (HAS_GOLD * agent.has_gold) | (GAME_OVER * agent.game_over) | (WON * agent.won)
+
+
+def compress(data):
+    """zlib nível 1 com estado pequeno (ver ZLIB_WBITS)."""
+    z = zlib.compressobj(1, zlib.DEFLATED, ZLIB_WBITS, ZLIB_MEMLEVEL)
+    return z.compress(data) + z.flush()
+
+
+def swapped(values):
+    """Bytes little-endian de um array('I') numa máquina big-endian."""
+    values = array('I', values)
+    values.byteswap()
+    return values.tobytes()
+
+
+def scan_records(buf, off):
+    """Gera (tipo, início do conteúdo, tamanho) até o último registro completo."""
+    end = len(buf)
+    while off + RECORD.size <= end:
+        kind, size = RECORD.unpack_from(buf, off)
+        off += RECORD.size
+        if off + size > end:
+            return  # último registro incompleto: gravação interrompida
+        yield kind, off, size
+        off += size
+
+
+def complete_size(path):
+    """
+    Tamanho do arquivo até o último registro completo. O arquivo é mapeado
+    em memória e só os cabeçalhos dos registros são lidos (o conteúdo nem
+    sai do disco), então retomar um rastro grande custa O(registros).
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < FILE_HEADER.size:
+            raise ValueError(f"Arquivo de rastro inválido: {path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if FILE_HEADER.unpack_from(mm)[0:2] != (MAGIC, VERSION):
+                raise ValueError(f"Arquivo de rastro inválido: {path}")
+            end = FILE_HEADER.size
+            for _, off, size in scan_records(mm, end):
+                end = off + size
+    return end
+
+
+class TraceWriter:
+    """
+    Grava rastros de partidas num arquivo. begin() abre a partida de um
+    agente recém-criado; record() é chamado depois de cada ciclo
+    think -> move; finish() fecha a partida (o arquivo continua aberto para
+    a próxima).
+
+    Tudo o que é gravado é lido do agente depois do ciclo (o plano novo é
+    detectado pela troca da lista do Plan, as mudanças da KB vêm do seu log
+    de versões), então o agente não precisa saber que está sendo gravado.
+    Os registros se acumulam em memória e vão para o arquivo a cada
+    snapshot periódico e no fim da partida (uma escrita só para partidas
+    curtas).
+    """
+
+    def __init__(self, path, append=False):
+        self.path = path
+        self.agent = None
+        self.buffer = bytearray()
+        size = complete_size(path) if append and os.path.exists(path) and os.path.getsize(path) else 0
+        # Sem buffer do Python: o que sai de self.buffer já está com o sistema
+        self.file = open(path, "r+b" if size else "wb", buffering=0)
+        if size:
+            # Retomada: um registro cortado no fim seria lido como lixo depois dos novos
+            self.file.truncate(size)
+            self.file.seek(size)
+        else:
+            self.buffer += FILE_HEADER.pack(MAGIC, VERSION)
+        self.episodes = 0
+
+    def begin(self, agent, method, seed=None, deterministic=False, interval=None):
+        """Abre a partida do agente (ainda no passo 0)."""
+        if self.agent is not None:
+            self.finish()
+        world = agent.world
+        self.agent = agent
+        self.world = world
+        self.cols = agent.cols
+        self.interval = interval or default_interval(agent.rows, agent.cols)
+        self.step = 0
+
+        self.masks = world.percept_masks  # percepções por célula (bits PERCEPT_*)
+
+        # Estado já gravado: o próximo ciclo registra só a diferença
+        self.idx = agent.pos[0] * self.cols + agent.pos[1]
+        self.came_from = None  # célula antes do último movimento
+        self.nodes = agent.total_nodes
+        self.moves = agent.total_steps
+        self.synced = agent.kb.version
+        agent.kb.track(self)
+        self.steps = agent.path_queue.steps
+        self.message = agent.message
+
+        flags = (FLAG_HAS_SEED if seed is not None else 0) | (FLAG_DETERMINISTIC if deterministic else 0)
+        layout = compress("".join(map("".join, world.grid)).encode())
+        header = EPISODE.pack(agent.rows, agent.cols, self.interval, method.encode()[:8], seed or 0, flags,
+                              *world.start_pos)
+        self.buffer += RECORD.pack(KIND_EPISODE, len(header) + len(layout))
+        self.buffer += header + layout
+        self.episodes += 1
+        self.snapshot()
+
+    def record(self):
+        """Grava o ciclo que acabou de acontecer."""
+        agent = self.agent
+        cols = self.cols
+        idx = self.idx
+        r, c = agent.pos
+        new_idx = self.idx = r * cols + c
+        if new_idx != idx:
+            self.came_from = idx
+        flags = agent.has_gold | agent.game_over << 1 | agent.won << 2  # HAS_GOLD, GAME_OVER, WON
+
+        path = None
+        path_len = 0
+        target = -1
+        steps = agent.path_queue.steps
+        if steps is not self.steps:
+            self.steps = steps
+            flags |= NEW_PATH
+            if steps:
+                path = array('I', [r * cols + c for r, c in steps])
+                path_len = len(path)
+                target = path[-1]
+
+        if agent.total_steps != self.moves:
+            self.moves = agent.total_steps
+            flags |= MOVED
+
+        kb = agent.kb
+        count = 0
+        if kb.version != self.synced:
+            cells = kb.changes_since(self.synced)
+            self.synced = kb.version
+            if len(cells) > 1:
+                # Várias mudanças na mesma célula viram uma, com o estado final
+                cells = dict.fromkeys(cells)
+            cells = array('I', cells)
+            count = len(cells)
+            # Código de STATUSES lido direto dos planos: 1 SAFE, 2 CAUTION, 3 UNSAFE
+            # (laço simples: mais rápido que uma compreensão com os três bits de cada plano)
+            safe, caution, unsafe = kb.safe, kb.caution, kb.unsafe
+            codes = bytearray()
+            for i in cells:
+                byte = i >> 3
+                bit = 1 << (i & 7)
+                codes.append(1 if safe[byte] & bit else 2 if caution[byte] & bit else 3 if unsafe[byte] & bit else 0)
+
+        message = b""
+        if agent.message != self.message:
+            self.message = agent.message
+            message = agent.message.encode("utf-8")
+
+        nodes = agent.total_nodes - self.nodes
+        self.nodes = agent.total_nodes
+
+        buffer = self.buffer
+        buffer += TICK_RECORD.pack(KIND_TICK, TICK.size + 4 * path_len + 5 * count + len(message),
+                                   idx, new_idx, self.masks[idx], flags, target, nodes,
+                                   path_len, count, len(message))
+        if path:
+            buffer += path.tobytes() if LITTLE_ENDIAN else swapped(path)
+        if count:
+            buffer += cells.tobytes() if LITTLE_ENDIAN else swapped(cells)
+            buffer += codes
+        if message:
+            buffer += message
+
+        self.step += 1
+        if self.step % self.interval == 0:
+            self.snapshot()
+            self.flush()
+
+    def snapshot(self):
+        """Estado completo do agente no passo atual, para o replay começar dali."""
+        agent = self.agent
+        kb = agent.kb
+        visited = bytearray(len(kb.safe))
+        for r, c in agent.visited:
+            idx = r * self.cols + c
+            visited[idx >> 3] |= 1 << (idx & 7)
+        planes = compress(bytes(kb.safe) + bytes(kb.caution) + bytes(kb.unsafe) + bytes(visited))
+        message = agent.message.encode("utf-8")
+        heading = 0
+        if self.came_from is not None:
+            r, c = divmod(self.came_from, self.cols)
+            heading = MOVE_CODES[(agent.pos[0] - r, agent.pos[1] - c)]
+        payload = SNAPSHOT.pack(self.step, agent.pos[0] * self.cols + agent.pos[1], agent.total_nodes,
+                                agent.total_steps, agent_flags(agent), heading, len(message))
+        self.buffer += RECORD.pack(KIND_SNAPSHOT, len(payload) + len(message) + len(planes))
+        self.buffer += payload + message + planes
+
+    def finish(self):
+        """Fecha a partida em andamento."""
+        self.agent = None
+        self.world = None
+        self.flush()
+
+    def flush(self):
+        """Passa o que está acumulado para o arquivo (sobrevive à morte do processo depois disso)."""
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+
+    def close(self):
+        if not self.file.closed:
+            self.finish()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayState:
+    """Estado do agente reconstruído num passo do rastro (o que a GUI precisa para desenhar)."""
+
+    __slots__ = ('step', 'pos', 'has_gold', 'game_over', 'won', 'message', 'total_nodes',
+                 'total_steps', 'kb', 'visited', 'last_move', 'heading', 'target', 'path')
+
+    def __init__(self, step, pos, flags, message, total_nodes, total_steps, kb, visited, heading=(0, 0)):
+        self.step = step
+        self.pos = pos
+        self.has_gold = bool(flags & HAS_GOLD)
+        self.game_over = bool(flags & GAME_OVER)
+        self.won = bool(flags & WON)
+        self.message = message
+        self.total_nodes = total_nodes
+        self.total_steps = total_steps
+        self.kb = kb
+        self.visited = visited
+        self.last_move = (0, 0)  # movimento do último ciclo
+        self.heading = heading   # último movimento de fato, (0, 0) se ainda não andou
+        self.target = None
+        self.path = []
+
+
+class Episode:
+    """
+    Uma partida dentro do rastro: índice dos seus ciclos e snapshots e o
+    replay (state_at para ir direto a um passo, advance para seguir em frente).
+    """
+
+    def __init__(self, buf, off, size):
+        self.buf = buf
+        (self.rows, self.cols, self.interval, method, seed, flags,
+         start_r, start_c) = EPISODE.unpack_from(buf, off)
+        self.method = method.rstrip(b"\0").decode()
+        self.seed = seed if flags & FLAG_HAS_SEED else None
+        self.deterministic = bool(flags & FLAG_DETERMINISTIC)
+        self.start = (start_r, start_c)
+        self.plane = plane_size(self.rows, self.cols)
+        self.layout_at = (off + EPISODE.size, off + size)
+        self.ticks = array('Q')      # início do conteúdo de cada ciclo
+        self.snapshots = array('Q')  # snapshot k = estado no passo k * intervalo
+        self.sizes = array('I')      # tamanho de cada snapshot
+
+    def __len__(self):
+        """Quantidade de ciclos gravados (passos 0..len são visitáveis)."""
+        return len(self.ticks)
+
+    def layout(self):
+        """Mapa da partida, no formato do WumpusEnvironment."""
+        text = zlib.decompress(self.buf[slice(*self.layout_at)]).decode()
+        rows = [text[r * self.cols:(r + 1) * self.cols] for r in range(self.rows)]
+        r, c = self.start
+        rows[r] = rows[r][:c] + 'A' + rows[r][c + 1:]
+        return rows
+
+    def final_flags(self):
+        if self.ticks:
+            return TICK.unpack_from(self.buf, self.ticks[-1])[3]
+        return SNAPSHOT.unpack_from(self.buf, self.snapshots[0])[4]
+
+    def result(self):
+        """'VITÓRIA', 'DERROTA' ou 'SEM FIM' (travou, bateu no limite ou a gravação parou)."""
+        flags = self.final_flags()
+        if flags & WON:
+            return "VITÓRIA"
+        return "DERROTA" if flags & GAME_OVER else "SEM FIM"
+
+    def tick(self, i):
+        """O ciclo i (do passo i para o i+1), decodificado."""
+        buf = self.buf
+        off = self.ticks[i]
+        pos, new_pos, percepts, flags, target, nodes, path_len, count, msg_len = TICK.unpack_from(buf, off)
+        off += TICK.size
+        path = struct.unpack_from(f"<{path_len}I", buf, off)
+        off += 4 * path_len
+        cells = struct.unpack_from(f"<{count}I", buf, off)
+        off += 4 * count
+        codes = buf[off:off + count]
+        off += count
+        message = buf[off:off + msg_len].decode("utf-8") if msg_len else None
+
+        cols = self.cols
+        return TickRecord(i, divmod(pos, cols), divmod(new_pos, cols), percepts, flags,
+                          divmod(target, cols) if target >= 0 else None, nodes,
+                          [divmod(idx, cols) for idx in path],
+                          list(zip(cells, codes)), message)
+
+    def snapshot(self, k):
+        """Estado completo gravado no snapshot k."""
+        buf = self.buf
+        start = off = self.snapshots[k]
+        step, pos, total_nodes, total_steps, flags, heading, msg_len = SNAPSHOT.unpack_from(buf, off)
+        off += SNAPSHOT.size
+        message = buf[off:off + msg_len].decode("utf-8")
+        off += msg_len
+        planes = zlib.decompress(buf[off:start + self.sizes[k]])
+
+        p = self.plane
+        kb = KnowledgeBase(self.rows, self.cols)
+        kb.safe[:] = planes[:p]
+        kb.caution[:] = planes[p:2 * p]
+        kb.unsafe[:] = planes[2 * p:3 * p]
+        visited = set()
+        for byte_idx, byte in enumerate(planes[3 * p:]):
+            while byte:
+                low = byte & -byte
+                visited.add(divmod((byte_idx << 3) + low.bit_length() - 1, self.cols))
+                byte ^= low
+        return ReplayState(step, divmod(pos, self.cols), flags, message, total_nodes, total_steps, kb, visited,
+                           MOVES[heading])
+
+    def state_at(self, step):
+        """Estado depois de 'step' ciclos: snapshot anterior + no máximo 'intervalo' ciclos."""
+        if not 0 <= step <= len(self):
+            raise IndexError(f"passo fora do rastro: {step} (0..{len(self)})")
+        state = self.snapshot(min(step // self.interval, len(self.snapshots) - 1))
+        while state.step < step:
+            self.advance(state)
+        return state
+
+    def advance(self, state):
+        """Aplica o próximo ciclo ao estado (sem efeito no fim do rastro). Retorna o ciclo aplicado."""
+        if state.step >= len(self):
+            return None
+        rec = self.tick(state.step)
+        state.step += 1
+        state.last_move = (rec.new_pos[0] - rec.pos[0], rec.new_pos[1] - rec.pos[1])
+        if state.last_move != (0, 0):
+            state.heading = state.last_move
+        state.pos = rec.new_pos
+        state.visited.add(rec.new_pos)
+        state.has_gold = bool(rec.flags & HAS_GOLD)
+        state.game_over = bool(rec.flags & GAME_OVER)
+        state.won = bool(rec.flags & WON)
+        state.total_nodes += rec.nodes
+        state.total_steps += bool(rec.flags & MOVED)
+        if rec.message is not None:
+            state.message = rec.message
+        if rec.flags & NEW_PATH:
+            state.target = rec.target
+            state.path = rec.path
+        for idx, code in rec.changes:
+            state.kb.set(divmod(idx, self.cols), STATUSES[code])
+        return rec
+
+
+class Trace:
+    """
+    Leitor de arquivos .wtr via memória mapeada; funciona como lista de Episode.
+    Ao abrir, só os cabeçalhos dos registros são percorridos para montar o
+    índice; o conteúdo de cada ciclo é lido quando o passo é pedido.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mm) < FILE_HEADER.size or FILE_HEADER.unpack_from(self.mm)[0:2] != (MAGIC, VERSION):
+            self.mm.close()
+            raise ValueError(f"Arquivo de rastro inválido: {path}")
+
+        self.episodes = []
+        episode = None
+        for kind, off, size in scan_records(self.mm, FILE_HEADER.size):
+            if kind == KIND_EPISODE:
+                episode = Episode(self.mm, off, size)
+                self.episodes.append(episode)
+            elif kind == KIND_TICK:
+                episode.ticks.append(off)
+            elif kind == KIND_SNAPSHOT:
+                episode.snapshots.append(off)
+                episode.sizes.append(size)
+        # Partida cortada antes do primeiro snapshot: não há de onde começar o replay
+        self.episodes = [e for e in self.episodes if e.snapshots]
+
+    def __len__(self):
+        return len(self.episodes)
+
+    def __getitem__(self, index):
+        return self.episodes[index]
+
+    def __iter__(self):
+        return iter(self.episodes)
+
+    def close(self):
+        self.episodes = []
+        self.mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
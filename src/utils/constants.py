@@ -1,7 +1,9 @@
 # --- CONFIGURAÇÕES DO GRID ---
-CELL_SIZE = 120  # Tamanho de cada célula em pixels
-ROWS = 4
+CELL_SIZE = 120  # Tamanho máximo de cada célula em pixels
+ROWS = 4  # Dimensões do mapa padrão (o grid real vem do mundo carregado)
 COLS = 4
+MAX_BOARD_SIZE = 960  # Lado máximo do tabuleiro em pixels (mapas grandes encolhem as células)
+MIN_LABEL_CELL = 60  # Abaixo disso não há espaço para textos dentro da célula
 
 # --- DIMENSÕES DA TELA ---
 HUD_HEIGHT = 100
@@ -21,4 +23,18 @@ BLUE = (70, 130, 180)
 LIGHT_GRAY = (200, 200, 200)
 
 # --- CONFIGURAÇÕES DE JOGO ---
-MOVE_DELAY = 2000 # Tempo entre movimentos (ms)
\ No newline at end of file
+MOVE_DELAY = 2000 # Tempo entre movimentos (ms)
+FPS = 30  # Limite de quadros desenhados por segundo (a simulação tem passo próprio)
+GAME_OVER_DELAY = 1000  # Tempo (ms, em 1x) com o tabuleiro final na tela antes do relatório
+
+# --- PERCEPÇÕES (bits) ---
+PERCEPT_BRILHO = 1
+PERCEPT_BRISA = 2
+PERCEPT_FEDOR = 4
+PERCEPT_BATIDA = 8
+PERCEPT_NAMES = (
+    (PERCEPT_BATIDA, "Batida"),
+    (PERCEPT_BRILHO, "Brilho"),
+    (PERCEPT_BRISA, "Brisa"),
+    (PERCEPT_FEDOR, "Fedor"),
+)
@@ -0,0 +1,133 @@
+import csv
+import json
+import time
+
+# Histograma em potências de 2 de microssegundos: o balde i conta durações
+# abaixo de 2**i µs (o último acumula o resto, ~8 s ou mais)
+BUCKETS = 24
+BUCKET_LABELS = tuple(f"ate_{1 << i}us" for i in range(BUCKETS - 1)) + ("mais",)
+
+
+class PhaseStats:
+    """Contagem, tempo total, máximo e histograma de uma fase."""
+
+    __slots__ = ('count', 'total_ns', 'max_ns', 'hist')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.hist = [0] * BUCKETS
+
+    def add(self, ns):
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.hist[min(BUCKETS - 1, (ns // 1000).bit_length())] += 1
+
+    def to_dict(self):
+        return {
+            "contagem": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "media_us": self.total_ns / self.count / 1e3 if self.count else 0.0,
+            "max_us": self.max_ns / 1e3,
+            "histograma": {BUCKET_LABELS[i]: n for i, n in enumerate(self.hist) if n},
+        }
+
+
+class Profiler:
+    """
+    Tempo e contagem por fase do ciclo do agente (e da GUI).
+
+    As fases são medidas trocando métodos de instâncias específicas por
+    versões cronometradas (wrap/instrument_*). Sem profiler nada é trocado,
+    então o custo desligado é zero; detach() devolve os métodos originais.
+    Fases podem ser aninhadas (think inclui percepção, inferência e busca).
+    """
+
+    def __init__(self):
+        self.phases = {}   # nome -> PhaseStats
+        self.wrapped = []  # (objeto, atributo) trocados por wrap()
+
+    def add(self, name, ns):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        stats.add(ns)
+
+    def wrap(self, obj, attr, name=None, label=None):
+        """
+        Cronometra obj.attr como a fase 'name' (padrão: o nome do atributo).
+        'label(args)' permite dar o nome pela chamada, ex.: a busca pelo algoritmo.
+        """
+        fn = getattr(obj, attr)
+        name = name or attr
+        add, clock = self.add, time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                add(label(args) if label else name, clock() - start)
+
+        setattr(obj, attr, timed)
+        self.wrapped.append((obj, attr))
+
+    def instrument_agent(self, agent):
+        """Fases do agente: percepção, inferência, escolha do alvo, buscas (por algoritmo) e movimento."""
+        self.wrap(agent, "think")
+        self.wrap(agent.world, "get_percepts", "percepcao")
+        self.wrap(agent, "infer_knowledge")
+        self.wrap(agent, "find_target")
+        self.wrap(agent, "multi_goal", label=lambda args: f"busca_multi:{args[2]}")
+        self.wrap(agent, "plan", label=lambda args: f"busca:{args[2]}")
+        self.wrap(agent, "move")
+
+    def instrument_gui(self, gui):
+        """Fases da interface: desenho e áudio, além das do agente."""
+        self.instrument_agent(gui.agent)
+        self.wrap(gui, "render")
+        self.wrap(gui, "process_audio", "audio")
+
+    def detach(self):
+        """Devolve os métodos originais (os atributos trocados eram da instância)."""
+        for obj, attr in reversed(self.wrapped):
+            delattr(obj, attr)
+        self.wrapped = []
+
+    def to_dict(self):
+        """Fases ordenadas pelo tempo total, da mais cara para a mais barata."""
+        ordered = sorted(self.phases.items(), key=lambda item: -item[1].total_ns)
+        return {name: stats.to_dict() for name, stats in ordered}
+
+    def summary(self, limit=None):
+        """Linhas de texto (fase, contagem, média e total) para o overlay e o terminal."""
+        lines = []
+        for name, stats in list(self.to_dict().items())[:limit]:
+            lines.append(f"{name:<22} {stats['contagem']:>7}x {stats['media_us']:>9.1f}us "
+                         f"{stats['total_ms']:>9.1f}ms")
+        return lines
+
+
+def write_profiles(profiles, path):
+    """
+    Grava os perfis de várias partidas. profiles: lista de (seed, dict de to_dict()).
+    '.csv' gera uma linha por (partida, fase) com uma coluna por balde do
+    histograma; qualquer outra extensão gera JSON.
+    """
+    if path.endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(("seed", "fase", "contagem", "total_ms", "media_us", "max_us") + BUCKET_LABELS)
+            for seed, phases in profiles:
+                for name, stats in phases.items():
+                    hist = stats["histograma"]
+                    writer.writerow((seed, name, stats["contagem"], f"{stats['total_ms']:.4f}",
+                                     f"{stats['media_us']:.2f}", f"{stats['max_us']:.2f}")
+                                    + tuple(hist.get(label, 0) for label in BUCKET_LABELS))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([{"seed": seed, "fases": phases} for seed, phases in profiles],
+                      f, ensure_ascii=False, indent=1)
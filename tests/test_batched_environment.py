@@ -0,0 +1,58 @@
+import random
+
+import numpy as np
+
+from src.core.batched_environment import BatchedWumpusEnvironment, decode_percepts
+from src.core.environment import WumpusEnvironment
+from src.core.map_generator import generate_map
+
+ACTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def layouts(count, rows=6, cols=7):
+    return [generate_map(rows, cols, pit_prob=0.15, wumpus_count=2, seed=s)[0] for s in range(count)]
+
+
+def test_steps_match_the_single_environment():
+    maps = layouts(32)
+    batch = BatchedWumpusEnvironment.from_layouts(maps)
+    worlds = [WumpusEnvironment(layout) for layout in maps]
+    rng = random.Random(7)
+
+    assert [tuple(p) for p in batch.reset()] == [w.reset() for w in worlds]
+    assert list(batch.get_percepts()) == [w.get_percepts(w.agent_pos) for w in worlds]
+
+    for _ in range(40):
+        actions = [rng.choice(ACTIONS) for _ in worlds]
+        positions, percepts, game_over = batch.step(actions)
+        expected = [w.step(a) for w, a in zip(worlds, actions)]
+        assert [tuple(p) for p in positions] == [pos for pos, _, _ in expected]
+        assert list(percepts) == [p for _, p, _ in expected]
+        assert list(game_over) == [over for _, _, over in expected]
+    assert batch.game_over.any()  # o passeio chega a encerrar mundos
+
+
+def test_masks_decode_to_the_same_tuples():
+    maps = layouts(16)
+    batch = BatchedWumpusEnvironment.from_layouts(maps)
+    twin = BatchedWumpusEnvironment.from_layouts(maps)
+    rng = random.Random(3)
+    for _ in range(25):
+        actions = np.array([rng.choice(ACTIONS) for _ in maps])
+        positions, masks, over = batch.step_masks(actions)
+        positions_t, percepts, over_t = twin.step(actions)
+        assert masks.dtype == np.uint8
+        assert (positions == positions_t).all() and (over == over_t).all()
+        assert [decode_percepts(m) for m in masks] == list(percepts)
+        assert [decode_percepts(m) for m in batch.get_percept_masks()] == list(twin.get_percepts())
+
+
+def test_reset_only_masked_worlds():
+    maps = layouts(4)
+    batch = BatchedWumpusEnvironment.from_layouts(maps)
+    batch.step([(-1, 0)] * 4)
+    moved = batch.agent_pos.copy()
+    mask = np.array([True, False, True, False])
+    positions = batch.reset(mask)
+    assert (positions[mask] == batch.start[mask]).all()
+    assert (positions[~mask] == moved[~mask]).all()
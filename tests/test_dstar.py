@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from src.agent.algorithms import SearchAlgorithms
+from src.agent.dstar import CAUTION_COST, DStarLite
+from src.agent.knowledge_base import KnowledgeBase
+
+SIZE = 30
+START, GOAL = (SIZE - 1, 0), (0, SIZE - 1)
+
+
+def random_kb(seed):
+    rng = random.Random(seed)
+    kb = KnowledgeBase(SIZE, SIZE)
+    for idx in range(SIZE * SIZE):
+        x = rng.random()
+        kb.set(divmod(idx, SIZE), 'UNSAFE' if x < 0.15 else 'CAUTION' if x < 0.25 else 'SAFE')
+    kb.set(START, 'SAFE')
+    kb.set(GOAL, 'SAFE')
+    return kb
+
+
+def cost(kb, path):
+    return sum(CAUTION_COST if kb.is_caution(*cell) else 1 for cell in path)
+
+
+def a_star_cost(kb, start, safe_only=False):
+    SearchAlgorithms.configure(0, deterministic=True)
+    path, _ = SearchAlgorithms.a_star_flat(start, GOAL, kb, SIZE, SIZE, safe_only)
+    return cost(kb, path) if path else None
+
+
+def check_path(kb, start, path, safe_only=False):
+    """Caminho contíguo, só por células permitidas, terminando no objetivo."""
+    assert path[-1] == GOAL
+    for a, b in zip([start] + path, path):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+        assert kb.is_walkable(b[0], b[1], safe_only)
+
+
+@pytest.mark.parametrize("seed", [s for s in range(12) if s != 6])  # seed 6: objetivo isolado
+def test_replanning_reuses_the_tree(seed):
+    kb = random_kb(seed)
+    planner = DStarLite(SIZE, SIZE)
+    path, _ = planner.plan(START, GOAL, kb)
+    assert cost(kb, path) == a_star_cost(kb, START)
+
+    rng = random.Random(seed)
+    pos, reused, fresh = START, 0, 0
+    while len(path) > 6:
+        # Anda alguns passos e a KB muda logo à frente (o caminho atual fica bloqueado)
+        pos = path[2]
+        for cell in path[4:6]:
+            kb.set(cell, rng.choice(('UNSAFE', 'CAUTION')))
+        path, nodes = planner.plan(pos, GOAL, kb)
+        expected = a_star_cost(kb, pos)
+        if expected is None:
+            assert path == []
+            break
+        check_path(kb, pos, path)
+        assert cost(kb, path) == expected
+
+        _, from_scratch = SearchAlgorithms.d_star_lite(pos, GOAL, kb, SIZE, SIZE)
+        reused += nodes
+        fresh += from_scratch
+    assert 0 < reused < fresh / 2
+
+
+def test_safe_only_mode_matches_a_star():
+    kb = random_kb(3)
+    planner = DStarLite(SIZE, SIZE, safe_only=True)
+    path, _ = planner.plan(START, GOAL, kb)
+    expected = a_star_cost(kb, START, safe_only=True)
+    if expected is None:
+        assert path == []
+    else:
+        check_path(kb, START, path, safe_only=True)
+        assert len(path) == expected
+
+
+def test_new_goal_or_lost_log_restarts():
+    kb = random_kb(1)
+    planner = DStarLite(SIZE, SIZE)
+    _, first = planner.plan(START, GOAL, kb)
+    _, again = planner.plan(START, GOAL, kb)
+    assert again == 0  # nada mudou: a árvore já responde
+    _, other = planner.plan(START, (SIZE // 2, SIZE // 2), kb)
+    assert other > 0 and planner.goal == (SIZE // 2) * SIZE + SIZE // 2
+
+    planner.synced = -1  # simula um planejador que ficou para trás do log compactado
+    kb.base = 0
+    path, nodes = planner.plan(START, GOAL, kb)
+    assert nodes == first and cost(kb, path) == a_star_cost(kb, START)
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from src.agent.algorithms import SearchAlgorithms
+from src.agent.flat_search import CAUTION_COST, FlatSearch
+from src.agent.knowledge_base import KnowledgeBase
+
+SIZE = 24
+
+
+def random_kb(seed, caution=0.10, unsafe=0.25):
+    rng = random.Random(seed)
+    kb = KnowledgeBase(SIZE, SIZE)
+    for idx in range(SIZE * SIZE):
+        x = rng.random()
+        kb.set(divmod(idx, SIZE), 'UNSAFE' if x < unsafe else 'CAUTION' if x < unsafe + caution else 'SAFE')
+    return kb
+
+
+def queries(kb, seed, count):
+    rng = random.Random(seed)
+    pairs = []
+    while len(pairs) < count:
+        a = (rng.randrange(SIZE), rng.randrange(SIZE))
+        b = (rng.randrange(SIZE), rng.randrange(SIZE))
+        if a != b and not kb.is_unsafe(*a) and not kb.is_unsafe(*b):
+            pairs.append((a, b))
+    return pairs
+
+
+def path_cost(path, kb):
+    return sum(CAUTION_COST if kb.is_caution(r, c) else 1 for r, c in path)
+
+
+@pytest.mark.parametrize("seed", range(16))
+def test_bidirectional_searches_share_the_arena(seed):
+    """
+    bibfs e biastar seguidas na mesma arena: custos iguais aos da busca de
+    referência. Consultas suficientes para a geração passar por todos os
+    índices de célula (um pai deixado por uma busca não pode valer como marca).
+    """
+    kb = random_kb(seed)
+    arena = FlatSearch(SIZE, SIZE)
+    for a, b in queries(kb, seed, SIZE * SIZE // 4):
+        for safe_only in (True, False):
+            SearchAlgorithms.configure(seed, deterministic=True)
+            reference, _ = SearchAlgorithms.a_star(a, b, kb, SIZE, SIZE, safe_only)
+            shortest, _ = SearchAlgorithms.bfs(a, b, kb, SIZE, SIZE, safe_only)
+
+            path, _ = arena.bidirectional_bfs(a, b, kb, safe_only)
+            assert len(path) == len(shortest)
+            path, _ = arena.bidirectional_a_star(a, b, kb, safe_only)
+            assert bool(path) == bool(reference)
+            assert path_cost(path, kb) == path_cost(reference, kb)
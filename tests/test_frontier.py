@@ -0,0 +1,87 @@
+import random
+from collections import deque
+
+import pytest
+
+from src.agent.frontier import INF, DistanceField
+
+ROWS, COLS = 9, 11
+
+
+def recomputed(field):
+    """Distâncias refeitas do zero: BFS a partir de todas as fontes abertas."""
+    dist = [INF] * field.size
+    queue = deque()
+    for s in field.sources:
+        if field.open[s]:
+            dist[s] = 0
+            queue.append(s)
+    while queue:
+        u = queue.popleft()
+        for v in field.neighbors(u):
+            if field.open[v] and dist[v] > dist[u] + 1:
+                dist[v] = dist[u] + 1
+                queue.append(v)
+    return dist
+
+
+def recomputed_from(field, start):
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        u = queue.popleft()
+        for v in field.neighbors(u):
+            if field.open[v] and v not in dist:
+                dist[v] = dist[u] + 1
+                queue.append(v)
+    return dist
+
+
+def random_edits(field, rng, count):
+    for _ in range(count):
+        i = rng.randrange(field.size)
+        is_open, is_source = field._state(i)
+        x = rng.random()
+        if x < 0.45:
+            field.open_cell(i)
+        elif x < 0.6:
+            field.block(i)
+        elif x < 0.8 and is_open:
+            field.add_source(i)
+        elif is_source:
+            field.remove_source(i)
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_incremental_matches_recomputed(seed):
+    rng = random.Random(seed)
+    field = DistanceField(ROWS, COLS)
+    for _ in range(60):
+        random_edits(field, rng, rng.randint(1, 8))
+        field.flush()
+        expected = recomputed(field)
+        for i in range(field.size):
+            if field.open[i]:
+                assert field.dist[i] == expected[i], (i, field.dist[i], expected[i])
+        assert field.goals() == field.sources
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_nearest_is_at_the_recomputed_distance(seed):
+    rng = random.Random(100 + seed)
+    field = DistanceField(ROWS, COLS)
+    for _ in range(40):
+        random_edits(field, rng, rng.randint(1, 8))
+        start = rng.randrange(field.size)
+        if not field._state(start)[0]:
+            continue
+        found = field.nearest(start)
+        field.flush()  # a busca local pode responder sem aplicar as mudanças
+        expected = recomputed(field)
+        if expected[start] >= INF:
+            assert found is None
+        else:
+            assert found in field.sources
+            # A fonte devolvida está à menor distância de 'start' pelas células abertas
+            assert recomputed_from(field, start)[found] == expected[start]
+
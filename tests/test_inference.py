@@ -0,0 +1,114 @@
+import random
+from itertools import product
+
+import pytest
+
+from src.agent import inference
+from src.agent.inference import InferenceEngine
+from src.core.environment import WumpusEnvironment
+from src.core.map_generator import generate_map
+
+ROWS, COLS = 4, 4
+PIT_PRIOR = 0.2
+
+
+def observations(seed, visits):
+    """Percepções de 'visits' células livres escolhidas ao acaso num mapa gerado."""
+    layout, _ = generate_map(ROWS, COLS, pit_prob=PIT_PRIOR, wumpus_count=1, seed=seed)
+    world = WumpusEnvironment(layout)
+    rng = random.Random(seed)
+    free = [(r, c) for r in range(ROWS) for c in range(COLS) if world.grid[r][c] in '.G']
+    cells = rng.sample(free, min(visits, len(free)))
+    return [(pos, "Brisa" in world.get_percepts(pos), "Fedor" in world.get_percepts(pos)) for pos in cells]
+
+
+def neighbors(idx):
+    r, c = divmod(idx, COLS)
+    return {(r + dr) * COLS + c + dc for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if 0 <= r + dr < ROWS and 0 <= c + dc < COLS}
+
+
+def brute_force(obs):
+    """Marginais exatas por enumeração do tabuleiro inteiro: poços independentes, um Wumpus."""
+    size = ROWS * COLS
+    visited = {r * COLS + c for (r, c), _, _ in obs}
+
+    pit = [0.0] * size
+    total = 0.0
+    for bits in product((0, 1), repeat=size):
+        if any(bits[v] for v in visited):
+            continue
+        if any(breeze != any(bits[n] for n in neighbors(r * COLS + c)) for (r, c), breeze, _ in obs):
+            continue
+        k = sum(bits)
+        w = PIT_PRIOR ** k * (1 - PIT_PRIOR) ** (size - k)
+        total += w
+        for i in range(size):
+            if bits[i]:
+                pit[i] += w
+    pit = [p / total for p in pit]
+
+    spots = [i for i in range(size) if i not in visited and all(
+        stench == (i in neighbors(r * COLS + c)) for (r, c), _, stench in obs)]
+    wumpus = [1 / len(spots) if i in spots else 0.0 for i in range(size)]
+    return pit, wumpus
+
+
+def engine_for(obs, seed=0):
+    engine = InferenceEngine(ROWS, COLS, pit_prior=PIT_PRIOR, wumpus_count=1, seed=seed)
+    for pos, breeze, stench in obs:
+        engine.observe(pos, breeze, stench)
+    return engine
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_exact_risk_matches_brute_force(seed):
+    obs = observations(seed, visits=5)
+    pit, wumpus = brute_force(obs)
+    engine = engine_for(obs)
+    for idx in range(ROWS * COLS):
+        assert engine.pits.probability(idx) == pytest.approx(pit[idx], abs=1e-9)
+        assert engine.wumpus.probability(idx) == pytest.approx(wumpus[idx], abs=1e-9)
+        pos = divmod(idx, COLS)
+        assert engine.risk(pos) == pytest.approx(1 - (1 - pit[idx]) * (1 - wumpus[idx]), abs=1e-9)
+        # SAFE/UNSAFE só quando a enumeração também tem certeza
+        status = engine.status(pos)
+        if status == 'SAFE':
+            assert pit[idx] == 0 and wumpus[idx] == 0
+        elif status == 'UNSAFE':
+            assert pit[idx] == 1 or wumpus[idx] == 1
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_gibbs_risk_is_close_to_brute_force(seed, monkeypatch):
+    monkeypatch.setattr(inference, "MAX_EXACT_VARS", 0)  # força a amostragem em toda componente
+    monkeypatch.setattr(inference, "GIBBS_SAMPLES", 4000)
+    obs = observations(seed, visits=5)
+    pit, _ = brute_force(obs)
+    engine = engine_for(obs, seed)
+    for idx in range(ROWS * COLS):
+        assert engine.pits.probability(idx) == pytest.approx(pit[idx], abs=0.05)
+
+
+def test_single_wumpus_is_located_and_clears_the_rest():
+    engine = InferenceEngine(ROWS, COLS, wumpus_count=1)
+    engine.observe((3, 0), breeze=False, stench=True)  # Wumpus em (2, 0) ou (3, 1)
+    assert engine.wumpus.probability(2 * COLS) == pytest.approx(0.5)
+    assert engine.wumpus.probability(0) == 0.0  # longe do Fedor: livre
+    changed = engine.observe((1, 0), breeze=False, stench=False)  # tira (2, 0) dos candidatos
+    assert (3, 1) in changed
+    assert engine.status((3, 1)) == 'UNSAFE'
+    assert engine.wumpus.probability(2 * COLS) == 0.0
+
+
+def test_seed_drives_the_sampler(monkeypatch):
+    monkeypatch.setattr(inference, "MAX_EXACT_VARS", 0)
+
+    def risks(seed):
+        engine = InferenceEngine(ROWS, COLS, seed=seed)
+        engine.observe((3, 0), breeze=True, stench=False)
+        engine.observe((1, 0), breeze=True, stench=False)
+        return [engine.pits.probability(i) for i in range(ROWS * COLS)]
+
+    assert risks(1) == risks(1)
+    assert risks(1) != risks(2)
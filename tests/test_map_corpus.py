@@ -0,0 +1,59 @@
+import pytest
+
+from src.core.map_corpus import HEADER, MapCorpus, record_size, write_corpus
+from src.core.map_generator import generate_maps
+
+ROWS, COLS, COUNT = 5, 6, 12
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    items = list(generate_maps(COUNT, ROWS, COLS, seed=4))
+    path = tmp_path / "mapas.wmc"
+    write_corpus(str(path), items, ROWS, COLS, seed=4)
+    with MapCorpus(str(path)) as reader:
+        yield reader, items
+
+
+def test_header_and_layouts(corpus):
+    reader, items = corpus
+    assert HEADER.size == 28
+    assert (reader.rows, reader.cols, len(reader), reader.seed) == (ROWS, COLS, COUNT, 4)
+    assert reader.mm.size() == HEADER.size + COUNT * record_size(ROWS, COLS)
+    for i, item in enumerate(items):
+        assert reader.layout(i) == item["mapa"]
+        assert reader.get(i).seed == item["seed"]
+    with pytest.raises(IndexError):
+        reader.get(COUNT)
+
+
+@pytest.mark.parametrize("start, stop", [
+    (0, None), (3, 7), (7, 3), (5, 5), (COUNT, None), (COUNT + 4, COUNT + 9), (-3, None), (2, 10 ** 6),
+])
+def test_records_follow_slice_bounds(corpus, start, stop):
+    reader, items = corpus
+    expected = items[start:stop]
+    recs = reader.records(start, stop)
+    assert len(recs) == len(expected)
+    assert [int(seed) for seed in recs["seed"]] == [item["seed"] for item in expected]
+
+
+def test_batch_matches_records(corpus):
+    reader, _ = corpus
+    batch = reader.batch(2, 6)
+    assert batch.n == 4
+    for k in range(4):
+        layout = reader.layout(2 + k)
+        assert [''.join('P' if p else '.' for p in row) for row in batch.pits[k]] == \
+               [''.join('P' if ch == 'P' else '.' for ch in row) for row in layout]
+
+
+def test_close_with_live_views(corpus):
+    reader, _ = corpus
+    rec = reader.get(1)
+    recs = reader.records()
+    pits = bytes(rec.pits)
+    reader.close()
+    reader.close()
+    assert bytes(rec.pits) == pits
+    assert len(recs) == COUNT
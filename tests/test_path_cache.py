@@ -0,0 +1,137 @@
+import gc
+
+import pytest
+
+from src.agent.knowledge_base import COMPACT_MIN, KnowledgeBase
+from src.agent.path_cache import PathCache
+
+ROUTE = [(0, 1), (0, 2), (1, 2), (2, 2), (2, 3)]
+
+
+def open_kb(rows=4, cols=5):
+    kb = KnowledgeBase(rows, cols)
+    for r in range(rows):
+        for c in range(cols):
+            kb.set((r, c), 'SAFE')
+    return kb
+
+
+def test_hit_and_change_on_the_path():
+    kb = open_kb()
+    cache = PathCache(kb)
+    key = ((0, 0), (2, 3), True, "astar")
+    cache.put(key, ROUTE, nodes=9)
+    assert cache.get(key) == tuple(ROUTE)
+
+    kb.set((3, 0), 'CAUTION')  # fora do caminho: a entrada continua valendo
+    assert cache.get(key) == tuple(ROUTE)
+
+    kb.set((1, 2), 'CAUTION')  # no caminho: descartada
+    assert cache.get(key) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidacoes"], stats["entradas"]) == (2, 1, 1, 0)
+    assert stats["nos_economizados"] == 18
+
+
+def test_failures_are_dropped_on_any_change():
+    kb = open_kb()
+    cache = PathCache(kb)
+    key = ((0, 0), (3, 4), True, "bfs")
+    cache.put(key, [], nodes=5)
+    assert cache.get(key) == ()
+    kb.set((3, 0), 'UNKNOWN')
+    assert cache.get(key) is None
+
+
+def test_suffix_of_a_cached_route():
+    kb = open_kb()
+    cache = PathCache(kb)
+    cache.put(((0, 0), (2, 3), False, "astar"), ROUTE, nodes=9)
+    assert cache.get(((0, 2), (2, 3), False, "astar")) == tuple(ROUTE[2:])
+    assert cache.get(((2, 3), (2, 3), False, "astar")) == ()
+    # Outro objetivo, modo ou algoritmo não aproveitam o sufixo
+    assert cache.get(((0, 2), (2, 2), False, "astar")) is None
+    assert cache.get(((0, 2), (2, 3), True, "astar")) is None
+    assert cache.get(((0, 2), (2, 3), False, "bfs")) is None
+    assert cache.get(((3, 3), (2, 3), False, "astar")) is None
+
+    kb.set((2, 2), 'CAUTION')  # o trecho em comum mudou: nem o caminho nem o sufixo servem
+    assert cache.get(((0, 2), (2, 3), False, "astar")) is None
+    assert not cache.by_cell
+
+
+def test_lru_bound():
+    kb = open_kb()
+    cache = PathCache(kb, maxsize=2)
+    keys = [((0, c), (3, 4), True, "astar") for c in range(3)]
+    for key in keys:
+        cache.put(key, [(3, 4)], nodes=1)
+    assert list(cache.entries) == keys[1:]
+    cache.get(keys[1])
+    cache.put(((1, 0), (3, 4), True, "astar"), [(3, 4)], nodes=1)
+    assert keys[1] in cache.entries and keys[2] not in cache.entries
+    assert cache.stats()["invalidacoes"] == 0  # descarte LRU não conta como invalidação
+
+
+class Reader:
+    def __init__(self, kb):
+        self.synced = kb.version
+        kb.track(self)
+
+
+def churn(kb, count):
+    """'count' mudanças na KB (alternando SAFE/CAUTION na primeira linha)."""
+    for i in range(count):
+        pos = (0, i % kb.cols)
+        kb.set(pos, 'CAUTION' if kb.get(pos) == 'SAFE' else 'SAFE')
+
+
+def compact(kb):
+    """Mudanças até o log atingir o limite e ser compactado."""
+    churn(kb, kb._compact_at - len(kb.changes))
+
+
+def test_log_keeps_what_the_slowest_reader_needs():
+    kb = KnowledgeBase(8, 8)
+    fast, slow = Reader(kb), Reader(kb)
+    churn(kb, 10)
+    slow.synced = kb.version
+    expected = kb.changes_since(slow.synced)
+    churn(kb, 3 * COMPACT_MIN)
+    fast.synced = kb.version
+    compact(kb)
+
+    assert kb.base == slow.synced
+    assert kb.changes_since(slow.synced)[:len(expected)] == expected
+    assert len(kb.changes_since(slow.synced)) == kb.version - slow.synced
+    with pytest.raises(ValueError):
+        kb.changes_since(0)
+
+    slow.synced = kb.version
+    compact(kb)
+    assert kb.base == fast.synced  # agora o mais atrasado é o outro
+    fast.synced = kb.version
+    compact(kb)
+    assert kb.base == slow.synced
+    assert len(kb.changes) <= kb._compact_at // 2  # o limite volta a acompanhar o tamanho do log
+
+
+def test_dead_readers_release_the_log():
+    kb = KnowledgeBase(8, 8)
+    reader = Reader(kb)
+    churn(kb, 4 * COMPACT_MIN)
+    assert kb.base == 0  # o leitor nunca leu: tudo fica
+    del reader
+    gc.collect()
+    compact(kb)
+    assert kb.base == kb.version and not kb.changes
+
+
+def test_path_cache_keeps_up_when_synced_every_cycle():
+    kb = open_kb()
+    cache = PathCache(kb)
+    for _ in range(10):
+        churn(kb, COMPACT_MIN // 2)
+        cache.sync()
+    assert len(kb.changes) <= 2 * COMPACT_MIN
+    assert kb.base > 0
@@ -0,0 +1,133 @@
+import pytest
+
+from src.agent.algorithms import ALGORITHMS, SearchAlgorithms
+from src.agent.plan import Plan
+from src.agent.player import Agent
+from src.core.environment import WumpusEnvironment
+from src.simulation.runner import build_metrics
+
+# Rotas no mapa padrão: posições após cada passo
+VIA_31 = [(2, 0), (3, 0), (3, 1), (2, 1), (1, 1), (2, 1), (3, 1), (3, 0)]
+VIA_20 = [(2, 0), (3, 0), (3, 1), (2, 1), (1, 1), (2, 1), (2, 0), (3, 0)]
+
+# (método, seed, determinístico) -> (rota, nós expandidos); todas vencem com 8 passos.
+# Com o path_queue antigo (lista com pop(0)) o resultado é o mesmo: ver test_same_as_a_plain_list
+EXPECTED = {
+    ("bfs", 0, True): (VIA_31, 20), ("bfs", 1, False): (VIA_31, 20), ("bfs", 2, False): (VIA_20, 20),
+    ("dfs", 0, True): (VIA_20, 21), ("dfs", 1, False): (VIA_20, 17), ("dfs", 2, False): (VIA_31, 17),
+    ("astar", 0, True): (VIA_31, 13), ("astar", 1, False): (VIA_20, 13), ("astar", 2, False): (VIA_20, 13),
+    ("dstar", 0, True): (VIA_31, 16), ("dstar", 1, False): (VIA_31, 16), ("dstar", 2, False): (VIA_31, 16),
+    ("jps", 0, True): (VIA_31, 13), ("jps", 1, False): (VIA_31, 13), ("jps", 2, False): (VIA_31, 13),
+    ("bibfs", 0, True): (VIA_20, 8), ("bibfs", 1, False): (VIA_20, 8), ("bibfs", 2, False): (VIA_31, 8),
+    ("biastar", 0, True): (VIA_31, 8), ("biastar", 1, False): (VIA_20, 8), ("biastar", 2, False): (VIA_20, 8),
+}
+
+
+class ListPlan(list):
+    """O path_queue de antes do Plan: lista consumida com pop(0)."""
+
+    def peek(self):
+        return self[0] if self else None
+
+    def advance(self):
+        return self.pop(0)
+
+    def truncate(self, keep=0):
+        del self[keep:]
+
+    def replace(self, steps):
+        self[:] = steps
+
+
+def play(method, seed, deterministic, plan=None):
+    """Partida no mapa padrão com o ciclo do runner; retorna (rota, relatório)."""
+    SearchAlgorithms.configure(seed, deterministic)
+    agent = Agent(WumpusEnvironment())
+    if plan is not None:
+        agent.path_queue = plan
+    route = []
+    while not agent.game_over and len(route) < 100:
+        agent.think(method)
+        if agent.move() == (0, 0):
+            if not agent.game_over:
+                break
+        else:
+            route.append(agent.pos)
+    return route, build_metrics(agent, method, 0.0)
+
+
+def test_every_method_is_covered():
+    assert {method for method, _, _ in EXPECTED} == set(ALGORITHMS)
+
+
+@pytest.mark.parametrize("method, seed, deterministic", sorted(EXPECTED))
+def test_default_map_unchanged(method, seed, deterministic):
+    route, nodes = EXPECTED[method, seed, deterministic]
+    played, metrics = play(method, seed, deterministic)
+    assert played == route
+    assert metrics["resultado"] == "VITÓRIA"
+    assert metrics["custo"] == 8
+    assert metrics["score"] == 992
+    assert metrics["nos"] == nodes
+
+
+@pytest.mark.parametrize("method, seed, deterministic", sorted(EXPECTED))
+def test_same_as_a_plain_list(method, seed, deterministic):
+    route, metrics = play(method, seed, deterministic)
+    old_route, old_metrics = play(method, seed, deterministic, ListPlan())
+    assert route == old_route
+    metrics.pop("tempo"), old_metrics.pop("tempo")
+    assert metrics == old_metrics
+
+
+def test_peek_and_advance():
+    plan = Plan([(0, 1), (0, 2), (0, 3)])
+    assert plan.peek() == (0, 1)
+    assert plan.advance() == (0, 1)
+    assert plan.peek() == (0, 2)
+    assert len(plan) == 2
+    assert plan[0] == (0, 2) and plan[1] == (0, 3)
+    assert list(plan) == plan.remaining() == [(0, 2), (0, 3)]
+    assert plan.advance() == (0, 2)
+    assert plan.advance() == (0, 3)
+    assert not plan
+    assert plan.peek() is None
+    with pytest.raises(IndexError):
+        plan.advance()
+    with pytest.raises(IndexError):
+        plan[0]
+
+
+def test_truncate_keeps_the_next_steps():
+    plan = Plan([(1, 0), (2, 0), (3, 0), (4, 0)])
+    plan.advance()
+    plan.truncate(keep=2)
+    assert plan.remaining() == [(2, 0), (3, 0)]
+    plan.truncate()
+    assert not plan and len(plan) == 0
+    assert plan.peek() is None
+
+
+def test_replace_restarts_the_cursor():
+    plan = Plan([(0, 0), (0, 1)])
+    plan.advance()
+    plan.replace([(5, 5)])
+    assert plan.peek() == (5, 5)
+    assert len(plan) == 1
+
+
+def test_splice_keeps_the_prefix():
+    plan = Plan([(0, 0), (0, 1), (0, 2), (0, 3), (0, 4)])
+    plan.advance()
+    # O trecho depois de (0, 2) foi reparado: (0, 3) ficou perigosa
+    plan.splice(2, [(1, 2), (1, 3), (1, 4), (0, 4)])
+    assert plan.remaining() == [(0, 1), (0, 2), (1, 2), (1, 3), (1, 4), (0, 4)]
+    assert plan.advance() == (0, 1)
+    plan.splice(len(plan), [(9, 9)])  # no fim: só acrescenta
+    assert plan.remaining()[-2:] == [(0, 4), (9, 9)]
+    plan.splice(0, [(5, 5)])  # no começo: o mesmo que replace
+    assert plan.remaining() == [(5, 5)]
+    with pytest.raises(IndexError):
+        plan.splice(2, [])
+    with pytest.raises(IndexError):
+        plan.splice(-1, [])
@@ -0,0 +1,53 @@
+import pytest
+
+from src.agent.algorithms import SearchAlgorithms
+from src.agent.player import Agent
+from src.core.environment import WumpusEnvironment
+from src.core.map_generator import generate_maps
+
+# Mapa 10x10 com várias células SAFE na fronteira ao longo da partida (vencível)
+LAYOUT = list(generate_maps(2, 10, 10, pit_prob=0.1, seed=3, only_solvable=True))[1]["mapa"]
+
+
+def play(method, layout=LAYOUT):
+    """Partida completa com o ciclo do runner; retorna o agente e os nós de cada plan()."""
+    SearchAlgorithms.configure(0, deterministic=True)
+    agent = Agent(WumpusEnvironment(layout))
+    planned = []
+    plan = agent.plan
+
+    def counted(*args):
+        path, nodes = plan(*args)
+        planned.append(nodes)
+        return path, nodes
+    agent.plan = counted
+
+    for _ in range(1000):
+        if agent.game_over:
+            break
+        agent.think(method)
+        if agent.move() == (0, 0) and not agent.game_over:
+            break
+    return agent, planned
+
+
+def test_each_method_plans_with_its_own_search():
+    agents = {method: play(method)[0] for method in ("astar", "jps", "dstar", "biastar")}
+    assert all(agent.won for agent in agents.values())
+    # Mesmos alvos e caminhos de mesmo custo, mas cada algoritmo expande os seus nós
+    assert len({agent.total_steps for agent in agents.values()}) == 1
+    nodes = [agent.total_nodes for agent in agents.values()]
+    assert len(set(nodes)) == len(nodes), nodes
+
+
+@pytest.mark.parametrize("method", ["astar", "jps", "dstar", "biastar", "bibfs"])
+def test_selection_is_kept_out_of_total_nodes(method):
+    agent, planned = play(method)
+    assert agent.total_nodes == sum(planned)
+    assert agent.selection_nodes > 0
+
+
+def test_bfs_gets_target_and_path_in_one_search():
+    agent, planned = play("bfs")
+    assert agent.selection_nodes == 0
+    assert agent.total_nodes > sum(planned)  # as buscas de vários objetivos entram na métrica
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from src.gui import interface  # noqa: E402
+from src.gui.replay import ReplayGUI  # noqa: E402
+from src.simulation.trace import Trace  # noqa: E402
+from tests.test_trace import LAYOUTS, record  # noqa: E402
+
+
+def test_end_of_replay_stays_on_the_board(tmp_path, monkeypatch):
+    path = str(tmp_path / "partida.wtr")
+    record(path, LAYOUTS[0])
+
+    def no_game_over_screen(*args):
+        raise AssertionError("o replay não deve abrir a tela de fim de jogo")
+    monkeypatch.setattr(interface, "GameOverScreen", no_game_over_screen)
+    monkeypatch.setattr(ReplayGUI, "game_over_delay", lambda self: 0)
+
+    with Trace(path) as trace:
+        episode = trace[0]
+        gui = ReplayGUI(episode, speed=None)  # velocidade máxima: chega ao fim em poucos quadros
+        keys = iter([pygame.K_END, None, None, pygame.K_HOME, None, pygame.K_LEFT, None])
+        seen = []
+        ticks = gui.app.ticks
+
+        def frame():
+            # Uma tecla por volta do laço; no fim, fecha a janela
+            seen.append((gui.state.step, gui.agent.game_over))
+            key = next(keys, "fim")
+            if key == "fim":
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+            elif key is not None:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+            return ticks()
+        gui.app.ticks = frame
+
+        with pytest.raises(SystemExit):
+            gui.run()
+
+    assert (len(episode), True) in seen  # chegou ao fim (game_over gravado)...
+    assert seen[-1][0] < len(episode)    # ...e voltou a navegar depois dele
@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from src.agent.player import Agent
+from src.core.environment import WumpusEnvironment
+from src.core.map_generator import generate_maps
+from src.simulation.runner import run_episode
+from src.simulation.trace import Trace, TraceWriter, complete_size
+
+# Uma vitória longa (várias vezes o intervalo entre snapshots), uma derrota e uma vitória curta
+LAYOUTS = [item["mapa"] for item in generate_maps(4, 8, 8, pit_prob=0.15, seed=5, only_solvable=True)][1:]
+
+
+def snapshot_of(agent):
+    return (agent.pos, agent.has_gold, agent.game_over, agent.won, agent.message, agent.total_nodes,
+            agent.total_steps, [list(row) for row in agent.kb], set(agent.visited))
+
+
+def state_of(state):
+    return (state.pos, state.has_gold, state.game_over, state.won, state.message, state.total_nodes,
+            state.total_steps, [list(row) for row in state.kb], set(state.visited))
+
+
+def record(path, layout, seed=0, interval=4, append=False):
+    """Grava uma partida com o ciclo do runner; retorna o estado do agente em cada passo."""
+    agent = Agent(WumpusEnvironment(layout), seed)
+    states = [snapshot_of(agent)]
+    with TraceWriter(path, append=append) as trace:
+        trace.begin(agent, "astar", seed, interval=interval)
+        while not agent.game_over:
+            agent.think("astar")
+            moved = agent.move()
+            trace.record()
+            states.append(snapshot_of(agent))
+            if moved == (0, 0) and not agent.game_over:
+                break
+    return states
+
+
+def test_state_at_matches_the_recorded_agent(tmp_path):
+    path = str(tmp_path / "partida.wtr")
+    states = record(path, LAYOUTS[0])
+    with Trace(path) as trace:
+        episode = trace[0]
+        assert len(episode) == len(states) - 1 > 2 * episode.interval
+        for step in reversed(range(len(states))):  # fora de ordem: cada passo sai do seu snapshot
+            assert state_of(episode.state_at(step)) == states[step]
+        state = episode.state_at(0)
+        while episode.advance(state):
+            assert state_of(state) == states[state.step]
+
+
+def test_heading_is_the_last_real_move(tmp_path):
+    path = str(tmp_path / "partida.wtr")
+    states = record(path, LAYOUTS[0])
+    heading = (0, 0)
+    headings = [heading]
+    for before, after in zip(states, states[1:]):
+        if after[0] != before[0]:
+            heading = (after[0][0] - before[0][0], after[0][1] - before[0][1])
+        headings.append(heading)
+    with Trace(path) as trace:
+        episode = trace[0]
+        assert [episode.state_at(step).heading for step in range(len(states))] == headings
+
+
+def test_append_drops_a_cut_last_record(tmp_path):
+    path = str(tmp_path / "lote.wtr")
+    with TraceWriter(path) as trace:
+        for seed, layout in enumerate(LAYOUTS[:2]):
+            run_episode("astar", layout, seed, trace=trace)
+    with Trace(path) as trace:
+        ticks = len(trace[1])
+    size = os.path.getsize(path)
+    assert complete_size(path) == size
+
+    with open(path, "r+b") as f:  # processo morto no meio do último ciclo
+        f.truncate(size - 3)
+    assert complete_size(path) < size - 3
+
+    with TraceWriter(path, append=True) as trace:
+        last = run_episode("astar", LAYOUTS[2], 2, trace=trace)
+    with Trace(path) as trace:
+        assert [episode.seed for episode in trace] == [0, 1, 2]
+        assert len(trace[1]) == ticks - 1
+        assert len(trace[2]) == last["custo"] + 1  # o último ciclo só declara a vitória
+        assert trace[2].result() == "VITÓRIA"
+
+
+@pytest.mark.parametrize("content", [b"", b"WTRC", b"XXXX\x01\x00\x00\x00"])
+def test_complete_size_rejects_other_files(tmp_path, content):
+    path = tmp_path / "outro.wtr"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        complete_size(str(path))